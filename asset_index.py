@@ -0,0 +1,188 @@
+import os
+
+import directory_scanner
+import shot_inventory
+from helper_functions import unix_format
+
+BACKUP_FOLDER_NAME = '___backup'
+
+
+def asset_folder_name(asset_name):
+    '''
+    - returns the folder name of an asset, which starts with '__', e.g. '__hero' for 'hero' or '__hero'
+    '''
+    return asset_name if asset_name[:2] == '__' else '__' + asset_name
+
+
+def is_asset_folder(entry):
+    '''
+    - tells whether a scanned entry of a department directory is an asset folder, the hidden '___' folders aren't
+    '''
+    return entry.name[:2] == '__' and entry.name[:3] != '___' and entry.is_dir()
+
+
+def list_asset_folder(asset_directory):
+    '''
+    - returns {'active': [<file name>, ...], 'history': <amount of files in ___backup>} of the given asset folder
+    '''
+    active = []
+    has_backup = False
+    for entry in directory_scanner.scan_directory(asset_directory):
+        if entry.is_dir():
+            has_backup = has_backup or entry.name == BACKUP_FOLDER_NAME
+        else:
+            active.append(entry.name)
+    history = 0
+    if has_backup:
+        history = len([entry for entry in directory_scanner.scan_directory(asset_directory + BACKUP_FOLDER_NAME + '/') if not entry.is_dir()])
+    return {'active': sorted(active), 'history': history}
+
+
+
+class Asset_Index(object):
+    """
+    - an inverted index of the assets of a project: every asset name maps to its folders in every department,
+      with the active files and the amount of history files of each
+    - the departments are grouped by the kind of the asset, the kinds look like:
+        {'char': [<rig directory>, <deformed directory>, <hi-geo directory>, ...], 'props': [...], 'com': [...], 'env': [...]}
+    - the assets look like:
+        {'__hero': {<department directory>: {'active': [<file name>, ...], 'history': <amount>}}}
+    - it's built by scan_asset_index() and kept current by refresh_assets() when assets are created,
+      so questions about the whole show, like where an asset exists and where it's missing, never touch the file system
+    """
+    def __init__(self, kinds, assets=None):
+        self.kinds = dict((kind, [unix_format(directory) for directory in directories if directory])
+                          for kind, directories in kinds.iteritems())
+        self.assets = assets if assets != None else {}
+
+
+    def names(self, kind=None):
+        '''
+        - returns the sorted folder names of all the assets, or of the assets that exist in any department of the given kind
+        '''
+        if kind == None:
+            return sorted(self.assets)
+        directories = set(self.kinds.get(kind, ()))
+        return sorted(name for name, folders in self.assets.iteritems() if directories.intersection(folders))
+
+
+    def asset_kinds(self, asset_name):
+        '''
+        - returns the kinds the asset exists in, e.g. ['char']
+        '''
+        folders = self.assets.get(asset_folder_name(asset_name), {})
+        return sorted(kind for kind, directories in self.kinds.iteritems() if set(directories).intersection(folders))
+
+
+    def directories(self, asset_name, kind=None):
+        '''
+        - returns the department directories that hold the asset, in the order of the departments of the kind,
+          or of every kind it exists in without a kind
+        '''
+        folders = self.assets.get(asset_folder_name(asset_name), {})
+        kinds = [kind] if kind != None else self.asset_kinds(asset_name)
+        found = []
+        for each_kind in kinds:
+            for directory in self.kinds.get(each_kind, ()):
+                if directory in folders and directory not in found:
+                    found.append(directory)
+        return found
+
+
+    def missing(self, asset_name, kind=None):
+        '''
+        - returns the department directories of the kind that don't hold the asset, of every kind it exists in without a kind
+        '''
+        folders = self.assets.get(asset_folder_name(asset_name), {})
+        kinds = [kind] if kind != None else self.asset_kinds(asset_name)
+        return [directory for each_kind in kinds for directory in self.kinds.get(each_kind, ()) if directory not in folders]
+
+
+    def where(self, asset_name, kind=None):
+        '''
+        - returns {'present': [<directory>, ...], 'missing': [<directory>, ...]} of the asset, see directories() and missing()
+        '''
+        return {'present': self.directories(asset_name, kind), 'missing': self.missing(asset_name, kind)}
+
+
+    def active_files(self, asset_name, directory):
+        return list(self.assets.get(asset_folder_name(asset_name), {}).get(unix_format(directory), {}).get('active', []))
+
+
+    def history_count(self, asset_name, directory):
+        return self.assets.get(asset_folder_name(asset_name), {}).get(unix_format(directory), {}).get('history', 0)
+
+
+    def has_asset(self, asset_name, directory):
+        return unix_format(directory) in self.assets.get(asset_folder_name(asset_name), {})
+
+
+    def department_assets(self, directory):
+        '''
+        - returns the sorted folder names of the assets in the given department directory, or None if it isn't a department of the index
+        '''
+        directory = unix_format(directory)
+        if not any(directory in directories for directories in self.kinds.itervalues()):
+            return None
+        return sorted(name for name, folders in self.assets.iteritems() if directory in folders)
+
+
+    def refresh_assets(self, kind, asset_names):
+        '''
+        - lists the folders of the given assets again in every department of the kind, e.g. right after they were created
+        - only the folders of those assets are listed, the cost doesn't grow with the size of the show
+        '''
+        for asset_name in asset_names:
+            for directory in self.kinds.get(kind, ()):
+                self.refresh_asset_folder(directory, asset_folder_name(asset_name))
+
+
+    def refresh_asset_folder(self, directory, name):
+        '''
+        - lists one asset folder of a department directory again, the asset is dropped from the department if the folder is gone
+        '''
+        folders = self.assets.setdefault(name, {})
+        asset_directory = directory + name + '/'
+        if os.path.isdir(asset_directory):
+            folders[directory] = list_asset_folder(asset_directory)
+        else:
+            folders.pop(directory, None)
+        if not folders:
+            del self.assets[name]
+
+
+    def refresh_changed_path(self, path):
+        '''
+        - lists the asset folder that holds a changed path again, e.g. a new version in its '___backup' folder,
+          the path looks like 'Z:/proj/SETUP/Characters/Rigged/__hero/___backup/hero_v-3.ma'
+        - returns True if the path was in an asset folder of the index
+        '''
+        path = path.replace('\\', '/')
+        for directories in self.kinds.itervalues():
+            for directory in directories:
+                if path.lower().startswith(directory.lower()):
+                    name = path[len(directory):].split('/')[0]
+                    if name[:2] == '__' and name[:3] != '___':
+                        self.refresh_asset_folder(directory, name)
+                        return True
+        return False
+
+
+
+def scan_asset_index(kinds, threads=8):
+    '''
+    - builds the Asset_Index of the given kinds, see Asset_Index
+    - every department directory is listed once, then every asset folder, by a pool of threads
+    '''
+    index = Asset_Index(kinds)
+    directories = sorted(set(directory for directories in index.kinds.itervalues() for directory in directories))
+    listings = shot_inventory.parallel_map(
+        lambda directory: [entry.name for entry in directory_scanner.scan_directory(directory) if is_asset_folder(entry)],
+        directories, threads)
+
+    asset_folders = [(directory, name) for directory, names in zip(directories, listings) for name in names]
+    contents = shot_inventory.parallel_map(lambda asset_folder: list_asset_folder(asset_folder[0] + asset_folder[1] + '/'),
+                                           asset_folders, threads)
+    for (directory, name), content in zip(asset_folders, contents):
+        index.assets.setdefault(name, {})[directory] = content
+    return index
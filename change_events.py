@@ -0,0 +1,119 @@
+import os
+
+from helper_functions import unix_format
+
+# the actions of a directory watcher, see Track_Directory
+CREATED = 'Created'
+DELETED = 'Deleted'
+UPDATED = 'Updated'
+RENAMED_TO = 'Renamed to something'
+RENAMED_FROM = 'Renamed from something'
+
+# {<FILE_ACTION_* code of ReadDirectoryChangesW>: <action>}, a rename is reported as the old name (4) then the new name (5)
+ACTIONS = {     1 : CREATED,
+                2 : DELETED,
+                3 : UPDATED,
+                4 : RENAMED_FROM,
+                5 : RENAMED_TO }
+
+
+def split_changed_path(path):
+    '''
+    - returns (<directory>, <name>) of a path reported by a directory watcher, e.g. ('p:/proj/shots/', 'shot_v-12.ma')
+    '''
+    path = path.replace('\\', '/').rstrip('/')
+    return unix_format(os.path.dirname(path)), os.path.basename(path)
+
+
+
+class View_Updater(object):
+    """
+    - applies the changes seen by a directory watcher to the file and history views that show the changed directory,
+      as inserted, removed and renamed rows, without listing anything
+    - every view is bound to the directory it shows by its key, e.g. 'Animation_model3', binding it again replaces the directory
+    - a model takes the changes by insert_file(), remove_file() and rename_file(), see file_list_model.File_List_Model
+    - the watcher reports a rename as two changes, 'Renamed from something' with the old path then 'Renamed to something' with the new one,
+      see ACTIONS
+    - it must be called on the gui thread, e.g. from a queued signal of the watcher
+    """
+    def __init__(self):
+        # {<view key>: (<directory>, <model>)}
+        self.views = {}
+        # {<directory>: set([<view key>, ...])}
+        self.directories = {}
+        # (<directory>, <name>) of the last 'Renamed from something', until its 'Renamed to something' comes
+        self.renamed_from = None
+        self.applied = 0
+        self.ignored = 0
+
+
+    def bind(self, view_key, directory, model):
+        self.unbind(view_key)
+        directory = unix_format(directory)
+        self.views[view_key] = (directory, model)
+        self.directories.setdefault(directory, set()).add(view_key)
+
+
+    def unbind(self, view_key):
+        bound = self.views.pop(view_key, None)
+        if bound == None:
+            return
+        view_keys = self.directories.get(bound[0], set())
+        view_keys.discard(view_key)
+        if not view_keys:
+            self.directories.pop(bound[0], None)
+
+
+    def models(self, directory):
+        return [self.views[view_key][1] for view_key in self.directories.get(directory, ())]
+
+
+    def apply(self, file_type, path, action):
+        '''
+        - applies one change of the watcher, file_type is 'file', 'folder' or '<deleted>'
+        - returns the amount of rows that changed, the folders aren't rows of the file views
+        '''
+        directory, name = split_changed_path(path)
+        changed = 0
+        if action == RENAMED_FROM:
+            self.renamed_from = (directory, name)
+            return 0
+
+        if action == RENAMED_TO:
+            old_directory, old_name = self.renamed_from or (None, None)
+            self.renamed_from = None
+            if old_directory == directory:
+                for model in self.models(directory):
+                    if file_type == 'folder':
+                        changed += model.remove_file(old_name)
+                    else:
+                        changed += model.rename_file(old_name, name)
+            else:
+                # the old name is unknown or in another directory, the rename is a delete and a create
+                if old_directory != None:
+                    for model in self.models(old_directory):
+                        changed += model.remove_file(old_name)
+                if file_type == 'file':
+                    for model in self.models(directory):
+                        changed += model.insert_file(name)
+
+        elif action == CREATED and file_type == 'file':
+            for model in self.models(directory):
+                changed += model.insert_file(name)
+
+        elif action == DELETED:
+            for model in self.models(directory):
+                changed += model.remove_file(name)
+
+        if changed:
+            self.applied += changed
+        else:
+            self.ignored += 1
+        return changed
+
+
+    def stats(self):
+        '''
+        - returns the counters, they look like: {'views': <amount>, 'applied': <rows changed>, 'ignored': <changes without a row>}
+        '''
+        return {'views': len(self.views), 'applied': self.applied, 'ignored': self.ignored}
@@ -25,4 +25,43 @@ assets              =   {   'CHARACTER':    [character],
                             'COMPONENT':    [component],
                             'ENVIRONMENT':  [environment],
                             'TEMPLATE':     [template],
-                            '2D_DESIGN':    [design]      }                            
\ No newline at end of file
+                            '2D_DESIGN':    [design]      }                            
+
+# the way of creating folders: 'serial', 'parallel' or 'auto' (parallel on network drives only)
+materializer_mode = 'auto'
+# the maximum amount of threads used by the parallel folder materializer
+materializer_threads = 8
+
+# the way of writing the initial shot files: 'auto' / 'reflink' (copy-on-write clones where supported), 'buffer' (one write each) or 'copy'
+shot_file_materialization = 'auto'
+# makes the initial shot files hard links of each other, every file gets its own data when it's first opened
+hardlink_shot_files = False
+# leaves the initial shot files off disk, they're recorded in the project manifest and created from the template when they're first used
+lazy_shot_files = False
+# prints the stats of the initial shot files written, e.g. the bytes and system calls saved compared with plain copies
+shot_file_report = False
+
+# the way of creating a new project: 'direct' (folder by folder on its drive), 'staged' (built on a local staging drive, then transferred in bulk)
+# or 'auto' (staged on network drives only)
+project_creation_mode = 'direct'
+# the local folder the staged projects are built in, the temporary folder of the system is used when it's empty
+staging_directory = ''
+# prints how long a staged project took to build, transfer and verify, which tells whether project_creation_mode should be 'staged' or 'direct'
+staging_report = False
+
+# every drive answers its probe within this amount of seconds, or it's listed as not responding, e.g. a disconnected network drive
+drive_probe_timeout = 2.0
+# the drives that haven't answered after this amount of seconds aren't waited for any more
+drive_probe_give_up = 60.0
+
+# the amount of threads that list the folders and files shown in the views, so a slow drive never freezes the window
+populate_threads = 4
+
+# the clicks on a folder view within this amount of milliseconds are coalesced into one listing of the last clicked folder
+click_debounce_ms = 150
+
+# the thumbnails of the images in the 2D drawings are this amount of pixels wide and high, made by this amount of threads
+thumbnail_size = 96
+thumbnail_threads = 2
+# the folder the thumbnails are kept in, so an image is only decoded once, the temporary folder of the system is used when it's empty
+thumbnail_cache_directory = ''
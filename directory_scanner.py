@@ -0,0 +1,67 @@
+import os
+
+# os.scandir() is only built into python 3.5+, python 2 can use the 'scandir' package if it's installed
+try:
+    from os import scandir
+except ImportError:
+    try:
+        from scandir import scandir
+    except ImportError:
+        scandir = None
+
+FILE_ATTRIBUTE_HIDDEN = 2
+
+
+class Listed_Entry(object):
+    """
+    - a minimal stand-in for os.DirEntry when scandir is not available
+    - the type of the entry is only looked up the first time is_dir() is called
+    """
+    def __init__(self, directory, name):
+        self.name = name
+        self.path = directory + name
+        self.__is_dir = None
+
+    def is_dir(self):
+        if self.__is_dir == None:
+            self.__is_dir = os.path.isdir(self.path)
+        return self.__is_dir
+
+    def is_file(self):
+        return not self.is_dir()
+
+
+def scan_directory(directory):
+    '''
+    - returns a list of entries in the given directory, each entry has .name, .path, .is_dir() and .is_file()
+    - with scandir, the type of every entry comes along with the listing, so is_dir() costs no extra system call
+    - returns an empty list if the directory doesn't exist or can't be read
+    - directory should be end with '/'
+    '''
+    try:
+        if scandir != None:
+            return list(scandir(directory))
+        return [Listed_Entry(directory, name) for name in os.listdir(directory)]
+    except OSError:
+        return []
+
+
+def list_names(directory):
+    '''
+    - returns a set of the names of all the entries in the given directory, or an empty set if it doesn't exist
+    '''
+    return set([entry.name for entry in scan_directory(directory)])
+
+
+def is_hidden(entry):
+    '''
+    - tells whether a scanned entry is hidden on Windows
+    - the attributes come along with the scandir listing on Windows, so this costs no system call
+    - returns None when it can't be told without an extra system call, e.g. on other platforms or without scandir
+    '''
+    if os.name != 'nt':
+        return None
+    try:
+        return bool(entry.stat().st_file_attributes & FILE_ATTRIBUTE_HIDDEN)
+    except (AttributeError, OSError):
+        return None
@@ -0,0 +1,147 @@
+import os
+import sys
+import time
+import threading
+import Queue
+from string import ascii_uppercase
+
+# win32file tells the type of a drive on Windows, without it every drive letter that exists is taken
+try:
+    import win32api
+    import win32file
+except ImportError:
+    win32api = None
+    win32file = None
+
+MOUNTS_FILE = '/proc/mounts'
+# the file systems of /proc/mounts that never hold projects
+PSEUDO_FILE_SYSTEMS = set(['proc', 'sysfs', 'devtmpfs', 'devpts', 'tmpfs', 'cgroup', 'cgroup2', 'securityfs', 'pstore',
+                           'debugfs', 'tracefs', 'mqueue', 'hugetlbfs', 'configfs', 'fusectl', 'autofs', 'binfmt_misc',
+                           'bpf', 'nsfs', 'rpc_pipefs', 'efivarfs', 'selinuxfs', 'squashfs', 'ramfs'])
+
+
+def parse_mounts(mounts_text):
+    '''
+    - returns the mount points of the real file systems in the text of /proc/mounts, they end with '/'
+    - every line looks like: <device> <mount point> <file system type> <options> <dump> <pass>,
+      the spaces in a mount point are written as '\\040'
+    '''
+    mount_points = []
+    for line in mounts_text.splitlines():
+        fields = line.split()
+        if len(fields) < 3 or fields[2] in PSEUDO_FILE_SYSTEMS:
+            continue
+        mount_point = fields[1].replace('\\040', ' ').replace('\\011', '\t').replace('\\134', '\\')
+        if not mount_point.endswith('/'):
+            mount_point += '/'
+        if mount_point not in mount_points:
+            mount_points.append(mount_point)
+    return mount_points
+
+
+def candidate_drives():
+    '''
+    - returns the drives to probe, without touching any of them:
+      the logical drives on Windows, the mount points of /proc/mounts on Linux, '/' anywhere else
+    '''
+    if sys.platform.startswith('win'):
+        if win32api != None:
+            return [drive.replace('\\', '/') for drive in win32api.GetLogicalDriveStrings().split('\000') if drive]
+        # the letters A and B are floppy drives
+        return [letter + ':/' for letter in ascii_uppercase[2:]]
+    if sys.platform.startswith('linux'):
+        try:
+            mounts_file = open(MOUNTS_FILE, 'r')
+            try:
+                return parse_mounts(mounts_file.read())
+            finally:
+                mounts_file.close()
+        except IOError:
+            pass
+    return ['/']
+
+
+def probe_drive(drive):
+    '''
+    - returns 'online' when the drive can hold projects and answers a listing, 'offline' otherwise,
+      e.g. an optical drive, a card reader without a card or a disconnected network drive
+    - it may block for a long time on a dead network drive, see Drive_Enumerator
+    '''
+    if win32file != None and sys.platform.startswith('win'):
+        drive_type = win32file.GetDriveType(drive[:-1])
+        if drive_type != win32file.DRIVE_FIXED and drive_type != win32file.DRIVE_REMOTE:
+            return 'offline'
+    try:
+        os.listdir(drive)
+    except OSError:
+        return 'offline'
+    return 'online'
+
+
+
+class Drive_Enumerator(object):
+    """
+    - probes every drive at the same time, each by its own thread, so a dead network drive doesn't hold up the others
+    - a drive that didn't answer within timeout seconds is reported as 'slow', it's reported again if it answers later
+    - nothing blocks, the caller asks for the answers by poll(), e.g. from a timer of the gui, and fills the drive list progressively
+    - the probes can't be interrupted, their threads are daemons so a hanging one never keeps the application alive
+    """
+    def __init__(self, drives=None, timeout=2.0):
+        self.drives = candidate_drives() if drives == None else list(drives)
+        self.timeout = timeout
+        # {<drive>: 'online' / 'offline' / 'slow'}, the last status reported of every drive
+        self.status = {}
+        self.__answers = Queue.Queue()
+        self.__started = None
+
+
+    def start(self):
+        self.__started = time.time()
+        for drive in self.drives:
+            thread = threading.Thread(target=self.probe, args=(drive,))
+            thread.daemon = True
+            thread.start()
+
+
+    def probe(self, drive):
+        try:
+            status = probe_drive(drive)
+        except Exception:
+            status = 'offline'
+        self.__answers.put((drive, status))
+
+
+    def poll(self):
+        '''
+        - returns the drives whose status is new since the last poll, like: [(<drive>, 'online' / 'offline' / 'slow'), ...]
+        '''
+        changes = []
+        while True:
+            try:
+                drive, status = self.__answers.get_nowait()
+            except Queue.Empty:
+                break
+            self.status[drive] = status
+            changes.append((drive, status))
+
+        if self.__started != None and time.time() - self.__started >= self.timeout:
+            for drive in self.drives:
+                if drive not in self.status:
+                    self.status[drive] = 'slow'
+                    changes.append((drive, 'slow'))
+        return changes
+
+
+    def is_done(self):
+        '''
+        - tells whether every drive has answered, the slow ones that never answer keep it False
+        '''
+        return all(self.status.get(drive) in ('online', 'offline') for drive in self.drives)
+
+
+    def elapsed(self):
+        return 0.0 if self.__started == None else time.time() - self.__started
+
+
+    def online_drives(self):
+        return sorted(drive for drive, status in self.status.iteritems() if status == 'online')
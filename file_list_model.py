@@ -0,0 +1,226 @@
+import re
+from bisect import bisect_left
+
+from qt_binding import Qt, QAbstractListModel, QFont, QIcon, QModelIndex, QPixmap, QSize, QSortFilterProxyModel
+from helper_functions import unix_format
+
+DIGITS = re.compile(r'(\d+)')
+VIRTUAL_FILE_TOOL_TIP = 'not created yet, it is created from the template when it is first used'
+
+
+def version_sort_key(file_name):
+    '''
+    - returns the key that sorts the file names by their numbers, e.g. 'hero_v-9.ma' before 'hero_v-10.ma'
+    - the text is compared without case, the numbers as numbers
+    '''
+    chunks = DIGITS.split(file_name.lower())
+    chunks[1::2] = map(int, chunks[1::2])
+    return chunks
+
+
+
+class File_List_Model(QAbstractListModel):
+    """
+    - the rows of a file or a history view, kept as one sorted list of names, without an item per file
+    - every row shares the same icon, the virtual files, e.g. the lazy shot files not created yet, are shown in italic
+    - the rows are sorted by version_sort_key() when they're set, a File_Sort_Proxy keeps that order and filters the names
+    - it answers clear(), setHorizontalHeaderLabels() and, through index.data(), the selected names, like the QStandardItemModel it replaces
+    - the changes seen by a directory watcher are applied row by row, see insert_file(), remove_file() and rename_file(),
+      a row is found by a binary search of the sort keys, so a change costs the same however many files are shown
+    - with a thumbnail_loader, the images show their thumbnails instead of the shared icon, a thumbnail is only asked for
+      when its row is painted, so a folder of thousands of images only decodes the rows on screen, see thumbnail_cache
+    """
+    def __init__(self, icon=None, header='', parent=None):
+        QAbstractListModel.__init__(self, parent)
+        self.icon = icon
+        self.header = header
+        self.names = []
+        # the version_sort_key() of every name, in the same order
+        self.keys = []
+        self.virtual_names = frozenset()
+        self.italic_font = QFont()
+        self.italic_font.setItalic(True)
+        # the directory of the files shown, and {<file name>: <QIcon>}, the thumbnails asked for so far
+        self.directory = None
+        self.thumbnail_loader = None
+        self.thumbnails = {}
+
+
+    def set_files(self, names, virtual_names=(), directory=None):
+        '''
+        - shows the given file names, and the virtual ones that aren't among them, in one reset of the model
+        - directory is the folder of the files, the thumbnails are taken from it
+        '''
+        names = set(names)
+        virtual_names = frozenset(name for name in virtual_names if name not in names)
+        rows = sorted((version_sort_key(name), name) for name in names.union(virtual_names))
+        self.beginResetModel()
+        self.keys = [key for key, name in rows]
+        self.names = [name for key, name in rows]
+        self.virtual_names = virtual_names
+        self.directory = unix_format(directory) if directory else None
+        self.thumbnails = {}
+        self.endResetModel()
+
+
+    def row_of(self, name):
+        '''
+        - returns the row of the given file name, or -1 if it isn't shown
+        '''
+        key = version_sort_key(name)
+        row = bisect_left(self.keys, key)
+        while row < len(self.names) and self.keys[row] == key:
+            if self.names[row] == name:
+                return row
+            row += 1
+        return -1
+
+
+    def insert_file(self, name):
+        '''
+        - shows a new file at its sorted row, a virtual file of the same name becomes a real one
+        - returns whether a row changed
+        '''
+        row = self.row_of(name)
+        if row != -1:
+            if name not in self.virtual_names:
+                return False
+            self.virtual_names = self.virtual_names.difference([name])
+            index = self.index(row, 0)
+            self.dataChanged.emit(index, index)
+            return True
+        key = version_sort_key(name)
+        row = bisect_left(self.keys, key)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.keys.insert(row, key)
+        self.names.insert(row, name)
+        self.endInsertRows()
+        return True
+
+
+    def remove_file(self, name):
+        '''
+        - takes the row of a deleted file away, returns whether it was shown
+        '''
+        row = self.row_of(name)
+        if row == -1:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.keys[row]
+        del self.names[row]
+        self.endRemoveRows()
+        self.virtual_names = self.virtual_names.difference([name])
+        self.thumbnails.pop(name, None)
+        return True
+
+
+    def rename_file(self, old_name, new_name):
+        '''
+        - moves the row of a renamed file to the sorted row of its new name, returns whether a row changed
+        '''
+        removed = self.remove_file(old_name)
+        return self.insert_file(new_name) or removed
+
+
+    def clear(self):
+        self.set_files([])
+
+
+    def setHorizontalHeaderLabels(self, labels):
+        self.header = labels[0] if labels else ''
+        self.headerDataChanged.emit(Qt.Horizontal, 0, 0)
+
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.names)
+
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        name = self.names[index.row()]
+        if role == Qt.DisplayRole:
+            return name
+        if role == Qt.DecorationRole:
+            return self.thumbnail(name)
+        if name in self.virtual_names:
+            if role == Qt.FontRole:
+                return self.italic_font
+            if role == Qt.ToolTipRole:
+                return VIRTUAL_FILE_TOOL_TIP
+        return None
+
+
+    def thumbnail(self, name):
+        '''
+        - returns the thumbnail of the file, the shared icon until it's made, the first call asks the thumbnail_loader for it
+        '''
+        if self.thumbnail_loader == None or self.directory == None or name in self.virtual_names or \
+                not self.thumbnail_loader.has_thumbnail(name):
+            return self.icon
+        if name not in self.thumbnails:
+            self.thumbnails[name] = self.icon
+            self.thumbnail_loader.request(self.directory + name, self.thumbnail_loaded)
+        return self.thumbnails[name]
+
+
+    def thumbnail_loaded(self, image_path, image):
+        '''
+        - shows a thumbnail made by the thumbnail_loader, unless the view shows another folder meanwhile
+        '''
+        name = image_path[len(self.directory):] if self.directory != None and image_path.startswith(self.directory) else None
+        if image == None or name not in self.thumbnails:
+            return
+        self.thumbnails[name] = QIcon(QPixmap.fromImage(image))
+        row = self.row_of(name)
+        if row != -1:
+            index = self.index(row, 0)
+            self.dataChanged.emit(index, index)
+
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if section == 0 and orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.header
+        return None
+
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+
+
+class File_Sort_Proxy(QSortFilterProxyModel):
+    """
+    - filters the rows of a File_List_Model by a part of their names, without case
+    - the rows are already sorted by version, so comparing two rows is comparing their positions, a sort of the view costs no key
+    """
+    def __init__(self, parent=None):
+        QSortFilterProxyModel.__init__(self, parent)
+        self.setFilterCaseSensitivity(Qt.CaseInsensitive)
+
+
+    def lessThan(self, left, right):
+        return left.row() < right.row()
+
+
+
+def install_file_list_model(view, header, thumbnail_loader=None):
+    '''
+    - puts a File_List_Model behind a File_Sort_Proxy into the given view, and returns the model
+    - the shared icon is taken from the style of the view once
+    - with a thumbnail_cache.Thumbnail_Loader, the view shows the thumbnails of the images, its rows are all as high
+      as a thumbnail, so scrolling never measures a row
+    '''
+    model = File_List_Model(view.style().standardIcon(view.style().SP_FileIcon), header, view)
+    if thumbnail_loader != None:
+        model.thumbnail_loader = thumbnail_loader
+        view.setIconSize(QSize(thumbnail_loader.cache.size, thumbnail_loader.cache.size))
+        view.setUniformRowHeights(True)
+    proxy = File_Sort_Proxy(view)
+    proxy.setSourceModel(model)
+    view.setModel(proxy)
+    return model
@@ -0,0 +1,501 @@
+import os
+import sys
+import time
+import errno
+import ctypes
+import shutil
+import tempfile
+import threading
+import Queue
+
+import directory_scanner
+from helper_functions import unix_format
+
+# the value of DRIVE_REMOTE returned by GetDriveTypeW
+DRIVE_REMOTE = 4
+
+
+def compile_folder_layout(folder_dict, parent_dir=''):
+    '''
+    - this function flattens a nested folder dictionary into an ordered list of relative directories
+    - folder_dict is dictionary, which the keys are the parent folders and values are the sub folders
+    - folder_dict can be a nested dictionary, however, the type of all the values must be list.
+    - parent_dir is the relative directory that prefixes every entry, leave it empty for the top level
+    - every directory ends with '/', and a parent directory is always listed before its child directories
+    - for example,
+          b3 = {'b3':['b3_1','b3_2']}
+          d = {'a':['a1','a2'],'b':['b1',b3],'c':[]}
+      compile_folder_layout(d) returns something like:
+          ['a/', 'a/a1/', 'a/a2/', 'b/', 'b/b1/', 'b/b3/', 'b/b3/b3_1/', 'b/b3/b3_2/', 'c/']
+    - the layout only has to be compiled once, it can then be created in any project by materialize_layout()
+    '''
+    layout = []
+    seen = set()
+
+    def add(directory):
+        if directory not in seen:
+            seen.add(directory)
+            layout.append(directory)
+
+    def walk(parent, sub_dict):
+        for folder in sub_dict.keys():
+            folder_dir = parent + folder + '/'
+            add(folder_dir)
+            if type(sub_dict[folder]) == dict:
+                walk(folder_dir, sub_dict[folder])
+            else:
+                for sub_folder in sub_dict[folder]:
+                    if type(sub_folder) == dict:
+                        walk(folder_dir, sub_folder)
+                    # an empty list indicates there's no sub folder under current parent folder
+                    elif sub_folder == []:
+                        continue
+                    else:
+                        add(folder_dir + str(sub_folder) + '/')
+
+    walk(parent_dir, folder_dict)
+    return layout
+
+
+def compile_scene_shot_layout(root_directory, shot_directories, dict_amount, scene_name='SCENE_', shot_name='__Shot_'):
+    '''
+    - compiles the scene-shot hierarchical folders of every shot directory into a layout relative to root_directory
+    - shot_directories is a list of directories that hold scene-shot folders, they must be under root_directory
+    - dict_amount is a dictionary type, it looks like: {<scn_num>:<amount_of_shots>}, for example: {1:10,2:7,...}
+    - every "scene" folder is listed before its "shot" folders, a scene with less than 1 shot only gets its "scene" folder
+    - for example: compile_scene_shot_layout('Z:/proj/', ['Z:/proj/VFX/SHOTS/'], {1:2}) returns:
+          ['VFX/SHOTS/SCENE_1/', 'VFX/SHOTS/SCENE_1/__Shot_1/', 'VFX/SHOTS/SCENE_1/__Shot_2/']
+    '''
+    root = unix_format(root_directory) if root_directory else ''
+    layout = []
+    for shot_dir in shot_directories:
+        shot_dir = unix_format(shot_dir)[len(root):]
+        for scene in sorted(dict_amount.keys()):
+            scene_dir = shot_dir + scene_name + str(scene) + '/'
+            layout.append(scene_dir)
+            for shot in range(1, dict_amount[scene] + 1):
+                layout.append(scene_dir + shot_name + str(shot) + '/')
+    return layout
+
+
+def make_layout_folders(root_directory, layout, root_is_new=False, assume_missing=False, on_created=None):
+    '''
+    - creates all the directories of a compiled layout under root_directory in one pass
+    - only the directories that are actually missing are created:
+        * children of a directory created in this pass are known to be missing, so they are created straight away
+        * children of an existing directory are checked against one listing of that directory
+    - root_is_new tells that root_directory has just been created, so nothing under it needs to be listed at all
+    - assume_missing tells that the layout is already known to be missing (e.g. planned by plan_scene_shot_delta()), nothing is listed
+    - on_created is an optional function, which is called with every directory right after it was created
+    - returns a list of the directories that were created
+    '''
+    root = unix_format(root_directory)
+    created = set()
+    listings = {}
+    if root_is_new:
+        created.add('')
+
+    new_directories = []
+    for directory in layout:
+        parent, name = split_layout_entry(directory)
+
+        if parent not in created and not assume_missing:
+            if parent not in listings:
+                try:
+                    listings[parent] = set(os.listdir(root + parent))
+                except OSError:
+                    listings[parent] = set()
+            if name in listings[parent]:
+                continue
+
+        try:
+            os.mkdir(root + directory)
+        except OSError, error:
+            if error.errno != errno.EEXIST:
+                raise
+            continue
+
+        created.add(directory)
+        new_directories.append(root + directory)
+        if on_created != None:
+            on_created(root + directory)
+
+    return new_directories
+
+
+def plan_scene_shot_delta(root_directory, shot_directories, dict_amount, shot_files=None,
+                          hidden_folders=('___backup', '___script'), scene_name='SCENE_', shot_name='__Shot_'):
+    '''
+    - works out exactly what is missing for the given dict_amount, from a single snapshot of the shot directories
+    - shot_directories is a list of directories that hold scene-shot folders, they must be under root_directory
+    - dict_amount is a dictionary type, it looks like: {<scn_num>:<amount_of_shots>}, for example: {40:12}
+    - shot_files is a dictionary that tells which files belong into the shot folders of a shot directory,
+      it looks like: {<shot_directory>: [<file_name_pattern>, ...]}, for example: {'Z:/proj/ANIMATION/Finals/': ['anim_scene_{0}_shot_{1}.ma']}
+    - only the scenes in dict_amount are looked at, so the cost doesn't grow with the amount of existing scenes:
+        * every shot directory is listed once to find its existing "scene" folders
+        * an existing "scene" folder of dict_amount is listed once to find its "shot" folders
+        * an existing "shot" folder of dict_amount is listed once to find its hidden folders and files
+        * nothing under a missing folder is listed, since everything under it is missing too
+    - returns a dictionary like:
+        {'folders':         [<layout entries of the missing scene-shot folders, relative to root_directory>],
+         'hidden_folders':  [<layout entries of the missing hidden folders, relative to root_directory>],
+         'files':           [<complete paths of the missing shot files>]}
+    '''
+    if shot_files == None:
+        shot_files = {}
+    root = unix_format(root_directory)
+    delta = {'folders': [], 'hidden_folders': [], 'files': []}
+
+    for shot_dir in shot_directories:
+        shot_dir = unix_format(shot_dir)[len(root):]
+        existing_scenes = directory_scanner.list_names(root + shot_dir)
+        file_patterns = shot_files.get(root + shot_dir, [])
+
+        for scene in sorted(dict_amount.keys()):
+            scene_folder = scene_name + str(scene)
+            scene_dir = shot_dir + scene_folder + '/'
+            if scene_folder in existing_scenes:
+                existing_shots = directory_scanner.list_names(root + scene_dir)
+            else:
+                existing_shots = set()
+                delta['folders'].append(scene_dir)
+
+            for shot in range(1, dict_amount[scene] + 1):
+                shot_folder = shot_name + str(shot)
+                folder_dir = scene_dir + shot_folder + '/'
+                if shot_folder in existing_shots:
+                    existing_items = directory_scanner.list_names(root + folder_dir)
+                else:
+                    existing_items = set()
+                    delta['folders'].append(folder_dir)
+
+                for hidden_folder in hidden_folders:
+                    if hidden_folder not in existing_items:
+                        delta['hidden_folders'].append(folder_dir + hidden_folder + '/')
+                for pattern in file_patterns:
+                    file_name = pattern.format(str(scene), str(shot))
+                    if file_name not in existing_items:
+                        delta['files'].append(root + folder_dir + file_name)
+
+    return delta
+
+
+def hide_folder(folder_dir):
+    '''
+    - hides the given folder on Windows, does nothing on other platforms
+    '''
+    try:
+        # SetFileAttributesW(unicode(folder_dir), 2) ----> hide the folder
+        # SetFileAttributesW(unicode(folder_dir), 1) ----> unhide the folder
+        ctypes.windll.kernel32.SetFileAttributesW(unicode(folder_dir), 2)
+    except AttributeError:
+        pass
+
+
+def make_hidden_folders(root_directory, hidden_folders=('___backup', '___script'), on_created=None):
+    '''
+    - creates and hides the hidden folders in every asset and shot folder under root_directory, in one pruned traversal
+    - an asset or shot folder is a folder whose name starts with '__', but not with '___'
+    - the traversal never descends into the '___' folders, which hold all the version history
+    - the listing of a folder tells which hidden folders are already there:
+        * a missing one is created and hidden
+        * an existing one is only hidden again when the listing shows it isn't hidden,
+          if that can't be told for free (no scandir or not on Windows), it is left alone
+    - on_created is an optional function, which is called with every hidden folder right after it was created
+    - returns a list of the folders that were created or hidden
+    '''
+    changed = []
+    stack = [unix_format(root_directory)]
+    while stack:
+        directory = stack.pop()
+        folder_name = directory.split('/')[-2]
+        is_owner = folder_name[:2] == '__' and folder_name[:3] != '___'
+
+        existing = {}
+        for entry in directory_scanner.scan_directory(directory):
+            if not entry.is_dir():
+                continue
+            if entry.name[:3] == '___':
+                existing[entry.name] = entry
+            else:
+                stack.append(directory + entry.name + '/')
+
+        if not is_owner:
+            continue
+        for hidden_folder in hidden_folders:
+            folder_dir = directory + hidden_folder
+            if hidden_folder in existing:
+                if directory_scanner.is_hidden(existing[hidden_folder]) != False:
+                    continue
+            else:
+                try:
+                    os.mkdir(folder_dir)
+                except OSError, error:
+                    if error.errno != errno.EEXIST:
+                        raise
+                if on_created != None:
+                    on_created(folder_dir + '/')
+            hide_folder(folder_dir)
+            changed.append(folder_dir + '/')
+
+    return changed
+
+
+def make_layout_folders_parallel(root_directory, layout, root_is_new=False, threads=8, assume_missing=False, on_created=None):
+    '''
+    - does the same job as make_layout_folders(), but creates independent sibling subtrees concurrently by a bounded pool of threads
+    - useful for network drives, where most of the time is spent waiting on the round-trip of every mkdir
+    - parent-before-child ordering is respected: a directory is only queued after its parent exists,
+      so the departments are created first, then their SCENE_n folders, then their __Shot_n folders
+    - an existing parent is listed only once, no matter how many threads are asking for it
+    - threads is the maximum amount of worker threads
+    - on_created is an optional function, which is called with every directory right after it was created, from the worker threads
+    - returns a list of the directories that were created, the first error raised by any worker is re-raised here,
+      which also stops the other workers, so on_created can raise an exception to stop the whole job
+    '''
+    root = unix_format(root_directory)
+    layout_entries = set(layout)
+    children = {}
+    top_entries = []
+    for directory in layout:
+        parent, name = split_layout_entry(directory)
+        if parent in layout_entries:
+            children.setdefault(parent, []).append(directory)
+        else:
+            top_entries.append(directory)
+
+    created = set()
+    if root_is_new:
+        created.add('')
+    listings = {}
+    new_directories = []
+    errors = []
+    lock = threading.Lock()
+    tasks = Queue.Queue()
+
+    def get_listing(parent):
+        # the first thread asking for a parent lists it, the others wait for its result
+        with lock:
+            listing = listings.get(parent)
+            is_owner = listing is None
+            if is_owner:
+                listing = listings[parent] = [threading.Event(), set()]
+        if is_owner:
+            try:
+                listing[1] = set(os.listdir(root + parent))
+            except OSError:
+                pass
+            listing[0].set()
+        else:
+            listing[0].wait()
+        return listing[1]
+
+    def make_folder(directory):
+        parent, name = split_layout_entry(directory)
+        is_missing = assume_missing or parent in created or name not in get_listing(parent)
+        if is_missing:
+            try:
+                os.mkdir(root + directory)
+            except OSError, error:
+                if error.errno != errno.EEXIST:
+                    raise
+                is_missing = False
+        if is_missing:
+            with lock:
+                created.add(directory)
+                new_directories.append(root + directory)
+            if on_created != None:
+                on_created(root + directory)
+        # the children are only queued once their parent exists
+        for child in children.get(directory, []):
+            tasks.put(child)
+
+    def worker():
+        while True:
+            directory = tasks.get()
+            if directory is None:
+                tasks.task_done()
+                return
+            try:
+                if not errors:
+                    make_folder(directory)
+            except Exception, error:
+                # any error, including the ones raised by on_created, is handed over to the calling thread
+                errors.append(error)
+            finally:
+                tasks.task_done()
+
+    for directory in top_entries:
+        tasks.put(directory)
+
+    workers = []
+    for i in range(max(1, min(threads, len(layout)))):
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+        workers.append(thread)
+
+    # children are put into the queue before their parent is marked as done, so join() waits for the whole layout
+    tasks.join()
+    for thread in workers:
+        tasks.put(None)
+    for thread in workers:
+        thread.join()
+
+    if errors:
+        raise errors[0]
+    return new_directories
+
+
+def is_network_directory(directory):
+    '''
+    - returns True when the directory lives on a network drive, a UNC path or a mapped drive letter
+    '''
+    directory = unix_format(directory)
+    if directory.startswith('//'):
+        return True
+    try:
+        return ctypes.windll.kernel32.GetDriveTypeW(unicode(directory[:3])) == DRIVE_REMOTE
+    except AttributeError:
+        # ctypes.windll only exists on Windows
+        return False
+
+
+def materialize_layout(root_directory, layout, root_is_new=False, mode='auto', threads=8, assume_missing=False, on_created=None):
+    '''
+    - creates the missing directories of a layout under root_directory
+    - mode can be:
+        'serial'   ---> make_layout_folders(), one directory after another
+        'parallel' ---> make_layout_folders_parallel(), with the given amount of threads
+        'auto'     ---> parallel on network drives, serial on local drives
+    - returns a list of the directories that were created
+    '''
+    if mode == 'auto':
+        mode = 'parallel' if is_network_directory(root_directory) else 'serial'
+    if mode == 'parallel' and threads > 1:
+        return make_layout_folders_parallel(root_directory, layout, root_is_new, threads, assume_missing, on_created)
+    return make_layout_folders(root_directory, layout, root_is_new, assume_missing, on_created)
+
+
+def benchmark_materializers(parent_directory, layout, threads=8, repeat=3):
+    '''
+    - times the serial and the parallel materializer by creating the layout into fresh temporary folders under parent_directory
+    - point parent_directory to the drive you want to measure, for example a network drive
+    - returns a dictionary like: {'serial': <best seconds>, 'parallel': <best seconds>, 'folders': <amount of folders>}
+    '''
+    timings = {'serial': [], 'parallel': []}
+    for i in range(repeat):
+        for mode in ['serial', 'parallel']:
+            bench_dir = unix_format(tempfile.mkdtemp(prefix='layout_bench_', dir=parent_directory))
+            try:
+                start = time.time()
+                materialize_layout(bench_dir, layout, True, mode, threads)
+                timings[mode].append(time.time() - start)
+            finally:
+                shutil.rmtree(bench_dir, ignore_errors=True)
+
+    return {'serial': min(timings['serial']), 'parallel': min(timings['parallel']), 'folders': len(layout)}
+
+
+def layout_leaves(layout):
+    '''
+    - returns the entries of a layout that have no child directories, in the order of the layout
+    '''
+    parents = set([split_layout_entry(directory)[0] for directory in layout])
+    return [directory for directory in layout if directory not in parents]
+
+
+def layout_shot_directories(layout, no_shot_folders=()):
+    '''
+    - returns the entries of a layout that hold scene-shot hierarchical folders:
+      the leaves, which are neither in no_shot_folders nor placeholder folders starting with '__'
+    '''
+    shot_directories = []
+    for directory in layout_leaves(layout):
+        name = split_layout_entry(directory)[1]
+        if name not in no_shot_folders and name[:2] != '__':
+            shot_directories.append(directory)
+    return shot_directories
+
+
+def discover_project_roots(project_directory, no_shot_folders=(), asset_folders=(), scene_name='SCENE_', shots_parent='SHOTS'):
+    '''
+    - walks the project once and yields ('shot', <directory>) or ('asset', <directory>) as soon as a root is found,
+      so the caller can start working on the first roots before the walk is over
+    - a shot root holds the scene folders, e.g. 'Z:/proj/ANIMATION/Finals/', its name isn't in no_shot_folders and doesn't start with '__'
+    - an asset root holds the asset folders, e.g. 'Z:/proj/MODEL/Characters/High_Resolution/', it lies at least two folders deep
+      in one of the asset_folders departments, and not right under a shots_parent folder
+    - every directory is listed exactly once, by scandir when it's available, and the type of the entries comes with the listing
+    - the walk never descends into the '___' folders, nor below a root, where only the scenes, shots and assets are
+    - the roots are yielded in the same order as a top-down os.walk() would find them
+    '''
+    root = unix_format(project_directory)
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        sub_folders = [entry.name for entry in directory_scanner.scan_directory(directory) if entry.is_dir()]
+
+        relative_folders = directory[len(root):].split('/')[:-1]
+        folder_name = directory.split('/')[-2]
+        if folder_name not in no_shot_folders and folder_name[:2] != '__' and \
+           [name for name in sub_folders if name.startswith(scene_name)]:
+            yield 'shot', directory
+            continue
+        if len(relative_folders) > 1 and relative_folders[0] in asset_folders and relative_folders[-2] != shots_parent and \
+           [name for name in sub_folders if name[:2] == '__']:
+            yield 'asset', directory
+            continue
+
+        for name in reversed(sub_folders):
+            if name[:3] != '___':
+                stack.append(directory + name + '/')
+
+
+def build_role_table(root_directory, directories):
+    '''
+    - classifies the given directories by their role, which is taken from their folders relative to root_directory:
+          'Z:/proj/SETUP/Characters/Rigged/'                         ---> ('SETUP', 'Characters', 'Rigged')
+          'Z:/proj/MODEL/Environments/High_Resolution/Components/'   ---> ('MODEL', 'Environments', 'High_Resolution/Components')
+    - a directory is also filed under every shorter role, e.g. ('MODEL', 'Environments', 'High_Resolution'), ('MODEL', 'Environments', None)
+      and ('MODEL', None, None), so a role can be looked up as precisely as needed
+    - when several directories share a role, the first one keeps it
+    - returns a dictionary of {<role>: <directory>}, every lookup is a single dictionary access
+    '''
+    root = unix_format(root_directory)
+    role_table = {}
+    for directory in directories:
+        folders = directory[len(root):].rstrip('/').split('/')
+        role_table.setdefault((folders[0], None, None), directory)
+        if len(folders) > 1:
+            role_table.setdefault((folders[0], folders[1], None), directory)
+        for depth in range(3, len(folders) + 1):
+            role_table.setdefault((folders[0], folders[1], '/'.join(folders[2:depth])), directory)
+    return role_table
+
+
+def split_layout_entry(directory):
+    '''
+    - splits a layout entry like 'MODEL/Characters/High_Resolution/' into ('MODEL/Characters/', 'High_Resolution')
+    - the parent of a top level entry is ''
+    '''
+    parent, _, name = directory[:-1].rpartition('/')
+    if parent:
+        parent += '/'
+    return parent, name
+
+
+if __name__ == '__main__':
+    # usage: python folder_layout.py <directory_on_the_drive_to_measure> [threads]
+    # benchmarks a project with the default departments and 10 scenes of 20 shots
+    import configuration
+    bench_parent = sys.argv[1] if len(sys.argv) > 1 else tempfile.gettempdir()
+    bench_threads = int(sys.argv[2]) if len(sys.argv) > 2 else configuration.materializer_threads
+
+    department_layout = compile_folder_layout(configuration.Departments)
+    shot_directories = layout_shot_directories(department_layout, configuration.no_shot_folders)
+    scene_shot_layout = compile_scene_shot_layout('', shot_directories, dict((scn, 20) for scn in range(1, 11)))
+
+    result = benchmark_materializers(bench_parent, department_layout + scene_shot_layout, bench_threads)
+    print 'folders:  %d' % result['folders']
+    print 'serial:   %.3f s' % result['serial']
+    print 'parallel: %.3f s (%d threads)' % (result['parallel'], bench_threads)
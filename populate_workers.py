@@ -0,0 +1,224 @@
+import os
+import threading
+
+from qt_binding import QObject, QRunnable, QThreadPool, Signal
+
+import directory_scanner
+from helper_functions import unix_format
+
+BACKUP_FOLDER_NAME = '___backup'
+
+
+# ===================================================================
+# ======= the scans, they return plain rows and touch no widget =====
+# ===================================================================
+
+class Listing_Cache(object):
+    """
+    - keeps the listing of every directory scanned for the views along with the modification time of the directory
+    - a directory is only listed again when its modification time changed, so switching back to a tab whose folders didn't change
+      costs one stat per directory, and only the directories that changed are listed again
+    - a listing looks like: [(<name>, <is a folder>, <is hidden>), ...]
+    """
+    def __init__(self):
+        # {<directory>: (<modification time>, <listing>)}
+        self.listings = {}
+        self.hits = 0
+        self.rescans = 0
+        self.lock = threading.Lock()
+
+
+    def list_directory(self, directory):
+        '''
+        - returns the listing of the directory, or None if it doesn't exist
+        '''
+        directory = unix_format(directory)
+        try:
+            modified_time = os.stat(directory).st_mtime
+        except OSError:
+            with self.lock:
+                self.listings.pop(directory, None)
+            return None
+
+        with self.lock:
+            cached = self.listings.get(directory)
+            if cached != None and cached[0] == modified_time:
+                self.hits += 1
+                return cached[1]
+
+        # the modification time is taken before the listing, a change during the listing makes the next call list it again
+        listing = [(entry.name, entry.is_dir(), directory_scanner.is_hidden(entry) == True)
+                   for entry in directory_scanner.scan_directory(directory)]
+        with self.lock:
+            self.listings[directory] = (modified_time, listing)
+            self.rescans += 1
+        return listing
+
+
+    def forget(self, directory=None):
+        with self.lock:
+            if directory == None:
+                self.listings.clear()
+            else:
+                self.listings.pop(unix_format(directory), None)
+
+
+    def stats(self):
+        with self.lock:
+            return {'directories': len(self.listings), 'hits': self.hits, 'rescans': self.rescans}
+
+
+# the listings of all the views of the session
+listing_cache = Listing_Cache()
+
+
+def list_folders(directory):
+    '''
+    - returns the names of the folders in the given directory, or an empty list if it doesn't exist
+    '''
+    if not directory:
+        return []
+    return [name for name, is_dir, is_hidden in listing_cache.list_directory(directory) or [] if is_dir]
+
+
+def list_hierarchical_folders(directory):
+    '''
+    - returns the folders of the given directory with their shown sub-folders, it looks like: [(<folder>, [<sub-folder>, ...]), ...]
+    - the hidden '___' folders aren't shown, nor the folders hidden on Windows when scandir tells it for free
+    '''
+    if not directory:
+        return []
+    directory = unix_format(directory)
+    rows = []
+    for name, is_dir, is_hidden in listing_cache.list_directory(directory) or []:
+        sub_folders = []
+        if is_dir:
+            sub_folders = [sub_name for sub_name, sub_is_dir, sub_is_hidden in listing_cache.list_directory(directory + name + '/') or []
+                           if sub_is_dir and sub_name[:3] != '___' and not sub_is_hidden]
+        rows.append((name, sub_folders))
+    return rows
+
+
+def list_files(directory):
+    '''
+    - returns the names of the files in the given directory, or None if the directory doesn't exist
+    '''
+    listing = listing_cache.list_directory(directory)
+    if listing == None:
+        return None
+    return [name for name, is_dir, is_hidden in listing if not is_dir]
+
+
+def list_active_and_history_files(folder_directory):
+    '''
+    - returns the files of an asset or shot folder and of its '___backup' folder, it looks like:
+        {'files': [<file name>, ...] or None, 'history': [<file name>, ...] or None}, None when the folder doesn't exist
+    '''
+    folder_directory = unix_format(folder_directory)
+    return {'files':   list_files(folder_directory),
+            'history': list_files(folder_directory + BACKUP_FOLDER_NAME + '/')}
+
+
+
+# =====================================================================
+# ======= the pool, it runs the scans and hands the rows back ========
+# =====================================================================
+
+class Populate_Task(QRunnable):
+    """
+    - runs one scan on a thread of the pool, its rows are handed back to the gui thread by Populate_Pool.delivered
+    - a task that was superseded before it started skips the scan
+    """
+    def __init__(self, pool, target, generation, scan, snapshot_key=None):
+        QRunnable.__init__(self)
+        # the task is emitted by delivered after run(), so the pool mustn't delete it, Populate_Pool.tasks keeps it until then
+        self.setAutoDelete(False)
+        self.pool = pool
+        self.target = target
+        self.generation = generation
+        self.scan = scan
+        self.snapshot_key = snapshot_key
+
+    def run(self):
+        rows = None
+        if self.pool.is_current(self.target, self.generation):
+            try:
+                rows = self.scan()
+            except Exception:
+                # the task is delivered whatever goes wrong, so it never stays in Populate_Pool.tasks
+                rows = None
+        self.pool.delivered.emit(self, rows)
+
+
+
+class Populate_Pool(QObject):
+    """
+    - runs the directory scans of the gui on a QThreadPool, so a slow drive never freezes the window
+    - every request has a target, e.g. the name of the model it fills, a new request of the same target supersedes the older one:
+      a superseded scan that hasn't started is skipped, the rows of one that already ran are dropped, so stale rows never
+      overwrite newer ones
+    - the rows are plain python data, the widgets are only touched by on_rows, which is called on the gui thread
+    - the last rows of every snapshot key, e.g. (<folder type>, <directory>), are kept: a request shows them right away,
+      and its scan, which only lists the directories whose modification time changed, see Listing_Cache,
+      shows the new rows only if they differ
+    """
+    # the signal is emitted by the threads of the pool, so it's delivered to the gui thread by the event loop
+    delivered = Signal(object, object)
+
+    def __init__(self, max_threads=4, parent=None):
+        QObject.__init__(self, parent)
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(max_threads)
+        # {<target>: <generation of the latest request>}
+        self.generations = {}
+        # {<target>: <on_rows of the latest request>}
+        self.callbacks = {}
+        # the tasks are kept alive here until their rows are delivered
+        self.tasks = set()
+        # {<snapshot key>: <rows>}, the rows shown last
+        self.snapshots = {}
+        self.delivered.connect(self.deliver)
+
+
+    def request(self, target, scan, on_rows, snapshot_key=None):
+        '''
+        - runs scan() on the pool, then calls on_rows(<rows>) on the gui thread, unless a newer request of the target came meanwhile
+        - a scan that failed on the drive delivers nothing
+        - with a snapshot_key, the rows shown last for it are shown right away, and the rows of the scan only if they differ
+        '''
+        generation = self.generations.get(target, 0) + 1
+        self.generations[target] = generation
+        self.callbacks[target] = on_rows
+        if snapshot_key in self.snapshots:
+            on_rows(self.snapshots[snapshot_key])
+        task = Populate_Task(self, target, generation, scan, snapshot_key)
+        self.tasks.add(task)
+        self.thread_pool.start(task)
+
+
+    def is_current(self, target, generation):
+        return self.generations.get(target) == generation
+
+
+    def cancel(self, target=None):
+        '''
+        - supersedes the pending request of the given target, or of every target without a target, e.g. when the user switches tabs
+        '''
+        targets = [target] if target != None else self.generations.keys()
+        for each_target in targets:
+            self.generations[each_target] = self.generations.get(each_target, 0) + 1
+            self.callbacks.pop(each_target, None)
+
+
+    def deliver(self, task, rows):
+        self.tasks.discard(task)
+        if rows == None or not self.is_current(task.target, task.generation):
+            return
+        on_rows = self.callbacks.pop(task.target, None)
+        if task.snapshot_key != None:
+            if self.snapshots.get(task.snapshot_key) == rows:
+                # nothing changed on the drive, the snapshot shown already is current
+                return
+            self.snapshots[task.snapshot_key] = rows
+        if on_rows != None:
+            on_rows(rows)
@@ -0,0 +1,193 @@
+import os
+import time
+import threading
+from functools import wraps
+
+from helper_functions import unix_format
+
+
+class Project_Cache(object):
+    """
+    - an in-memory cache of the discovery results of one project, e.g. its shot roots, asset roots, role tables and scene-shot table
+    - it's shared by all the project objects of the same project directory, see get_project_cache(),
+      so opening the same project again, or switching tabs, doesn't walk anything
+    - every entry records the modification times of the directories it depends on, an entry is dropped when:
+        * one of those directories was modified, which is checked at most once per revalidate_interval seconds
+        * a watcher reports a change right inside one of those directories, see invalidate_path()
+    - hits, misses and invalidations are counted, see stats()
+    """
+    def __init__(self, project_directory, revalidate_interval=2.0):
+        self.project_directory = unix_format(project_directory)
+        self.revalidate_interval = revalidate_interval
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        # {<key>: [<value>, {<directory>: <modification time>}, <time of the last check>]}
+        self.__entries = {}
+        self.__lock = threading.Lock()
+
+
+    def get(self, key, compute, depends_on=None):
+        '''
+        - returns the cached value of the key, compute() is only called when there's no valid one
+        - depends_on is an optional function, which takes the computed value and returns the directories it depends on,
+          without it the value is kept until it's invalidated explicitly
+        '''
+        with self.__lock:
+            entry = self.__entries.get(key)
+        if entry != None and self.is_valid(entry):
+            with self.__lock:
+                self.hits += 1
+            return entry[0]
+
+        value = compute()
+        stamps = {}
+        if depends_on != None:
+            for directory in depends_on(value):
+                stamps[unix_format(directory)] = modification_time(directory)
+        with self.__lock:
+            self.misses += 1
+            if entry != None:
+                # the entry was outdated by the modification of a directory
+                self.invalidations += 1
+            self.__entries[key] = [value, stamps, time.time()]
+        return value
+
+
+    def put(self, key, value, depends_on=None):
+        '''
+        - stores a value that was updated in place, e.g. incrementally after the project was changed by this session,
+          the modification times of its directories are taken again, so the change doesn't outdate it
+        '''
+        stamps = {}
+        if depends_on != None:
+            for directory in depends_on(value):
+                stamps[unix_format(directory)] = modification_time(directory)
+        with self.__lock:
+            self.__entries[key] = [value, stamps, time.time()]
+
+
+    def is_valid(self, entry):
+        now = time.time()
+        if now - entry[2] < self.revalidate_interval:
+            return True
+        for directory, modified_time in entry[1].iteritems():
+            if modification_time(directory) != modified_time:
+                return False
+        entry[2] = now
+        return True
+
+
+    def cached(self, key):
+        '''
+        - returns the value kept for the key, or None, without computing or revalidating it
+        '''
+        with self.__lock:
+            entry = self.__entries.get(key)
+        return entry[0] if entry != None else None
+
+
+    def invalidate(self, key=None):
+        '''
+        - drops the entry of the given key, or every entry without a key
+        '''
+        with self.__lock:
+            if key == None:
+                dropped = len(self.__entries)
+                self.__entries.clear()
+            else:
+                dropped = 1 if self.__entries.pop(key, None) != None else 0
+            self.invalidations += dropped
+
+
+    def invalidate_path(self, path):
+        '''
+        - drops the entries that depend on the directory which holds the given path, e.g. when a watcher reports a change of the path
+        - a change deeper in the tree, like a new version of a shot file, doesn't drop anything
+        '''
+        parent_directory = os.path.dirname(path.replace('\\', '/').rstrip('/')) + '/'
+        with self.__lock:
+            for key, entry in self.__entries.items():
+                if parent_directory in entry[1]:
+                    del self.__entries[key]
+                    self.invalidations += 1
+
+
+    def stats(self):
+        '''
+        - returns the counters, which look like: {'entries': <amount>, 'hits': <amount>, 'misses': <amount>, 'invalidations': <amount>}
+        '''
+        with self.__lock:
+            return {'entries': len(self.__entries), 'hits': self.hits, 'misses': self.misses, 'invalidations': self.invalidations}
+
+
+
+# the caches of all the projects opened in this session, keyed by the project directory
+project_caches = {}
+project_caches_lock = threading.Lock()
+
+
+def get_project_cache(project_directory, revalidate_interval=2.0):
+    '''
+    - returns the cache of the given project, it's created the first time it's asked for
+    '''
+    project_directory = unix_format(project_directory)
+    with project_caches_lock:
+        cache = project_caches.get(project_directory)
+        if cache == None:
+            cache = project_caches[project_directory] = Project_Cache(project_directory, revalidate_interval)
+        return cache
+
+
+def forget_project(project_directory):
+    '''
+    - drops the whole cache of the given project, e.g. when the project folder was only a staging folder
+    '''
+    with project_caches_lock:
+        project_caches.pop(unix_format(project_directory), None)
+
+
+def invalidate_path(path):
+    '''
+    - passes a changed path, e.g. from a directory watcher, to the cache of the project that holds it
+    '''
+    path = path.replace('\\', '/')
+    with project_caches_lock:
+        caches = [cache for project_directory, cache in project_caches.iteritems() if path.startswith(project_directory)]
+    for cache in caches:
+        cache.invalidate_path(path)
+
+
+def cache_stats():
+    '''
+    - returns the counters of every project cache, keyed by the project directory, see Project_Cache.stats()
+    '''
+    with project_caches_lock:
+        caches = project_caches.items()
+    return dict((project_directory, cache.stats()) for project_directory, cache in caches)
+
+
+def project_cached(key, depends_on=None, revalidate_interval=2.0):
+    '''
+    - decorates a method of a project class, its result is kept in the Project_Cache of the project_directory of the instance,
+      so every instance of the same project shares it
+    - the arguments of the method are part of the key, so they must be hashable
+    - depends_on is the name of a method of the instance, which takes the result and returns the directories it depends on
+    '''
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args):
+            cache = get_project_cache(self.project_directory, revalidate_interval)
+            dependencies = None
+            if depends_on != None:
+                dependencies = getattr(self, depends_on)
+            return cache.get((key,) + args, lambda: method(self, *args), dependencies)
+        return wrapper
+    return decorator
+
+
+def modification_time(directory):
+    try:
+        return os.stat(directory).st_mtime
+    except OSError:
+        return None
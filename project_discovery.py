@@ -0,0 +1,132 @@
+import os
+import json
+import time
+import tempfile
+
+import directory_scanner
+import project_manifest
+import shot_inventory
+from helper_functions import unix_format
+
+PROJECT_LIST_CACHE_NAME = 'project_file_manager_projects.json'
+
+
+def is_project_directory(directory, department_names):
+    '''
+    - tells whether the given directory is a project
+    - a project manifest is a marker, it's told by one stat, see project_manifest.Project_Manifest
+    - the projects without a manifest are told by their top-level folders, which are the departments, e.g. configuration.Departments.keys()
+    '''
+    directory = unix_format(directory)
+    if os.path.isfile(directory + project_manifest.MANIFEST_FILE_NAME):
+        return True
+    names = sorted(directory_scanner.list_names(directory))
+    return names == sorted(department_names)
+
+
+def discover_projects(drive, department_names, threads=8):
+    '''
+    - returns the sorted names of the projects right under the given drive, e.g. 'P:/'
+    - the drive root is listed once, then the candidate folders are probed by a pool of threads,
+      so the round-trips to a network drive overlap instead of adding up
+    - a drive that can't be listed has no projects
+    '''
+    drive = unix_format(drive)
+    candidates = []
+    for entry in directory_scanner.scan_directory(drive):
+        try:
+            if entry.is_dir():
+                candidates.append(entry.name)
+        except (OSError, UnicodeError):
+            pass
+
+    def probe(folder_name):
+        try:
+            return is_project_directory(drive + folder_name, department_names)
+        except (OSError, UnicodeError):
+            return False
+
+    found = shot_inventory.parallel_map(probe, candidates, threads)
+    return sorted(folder_name for folder_name, is_project in zip(candidates, found) if is_project)
+
+
+
+class Project_List_Cache(object):
+    """
+    - keeps the project list of every drive, so the project combo box doesn't probe the drive every time it's filled
+    - a list is probed again once it's older than ttl seconds, or when a refresh is asked for
+    - the lists are kept in a file between sessions, so the combo box can be filled right at startup, see cached()
+    """
+    def __init__(self, ttl=300.0, cache_file=''):
+        self.ttl = ttl
+        self.cache_file = cache_file or os.path.join(tempfile.gettempdir(), PROJECT_LIST_CACHE_NAME)
+        # {<drive>: [<time of the probe>, [<project name>, ...]]}
+        self.drives = {}
+        self.load()
+
+
+    def load(self):
+        try:
+            cache_file = open(self.cache_file, 'r')
+            try:
+                self.drives = json.load(cache_file)
+            finally:
+                cache_file.close()
+        except (IOError, ValueError):
+            self.drives = {}
+
+
+    def save(self):
+        '''
+        - writes the lists to a temporary file first, then replaces the cache file, a failure only costs the next startup a probe
+        '''
+        temporary_file = self.cache_file + '.tmp'
+        try:
+            cache_file = open(temporary_file, 'w')
+            try:
+                json.dump(self.drives, cache_file)
+            finally:
+                cache_file.close()
+            if os.path.exists(self.cache_file):
+                os.remove(self.cache_file)
+            os.rename(temporary_file, self.cache_file)
+        except (IOError, OSError):
+            pass
+
+
+    def cached(self, drive):
+        '''
+        - returns the last known project list of the drive however old it is, or None if the drive was never probed
+        '''
+        entry = self.drives.get(unix_format(drive))
+        if entry == None:
+            return None
+        return list(entry[1])
+
+
+    def is_stale(self, drive):
+        entry = self.drives.get(unix_format(drive))
+        return entry == None or time.time() - entry[0] >= self.ttl
+
+
+    def projects(self, drive, department_names, threads=8, refresh=False):
+        '''
+        - returns the project names of the drive, the drive is only probed when its list is stale or refresh is given
+        '''
+        drive = unix_format(drive)
+        if not refresh and not self.is_stale(drive):
+            return self.cached(drive)
+        projects = discover_projects(drive, department_names, threads)
+        self.drives[drive] = [time.time(), projects]
+        self.save()
+        return list(projects)
+
+
+    def forget(self, drive=None):
+        '''
+        - drops the list of the given drive, or every list without a drive, the next projects() probes again
+        '''
+        if drive == None:
+            self.drives.clear()
+        else:
+            self.drives.pop(unix_format(drive), None)
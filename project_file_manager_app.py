@@ -8,8 +8,9 @@ import win32api, win32con
 import win32file
 import shutil
 import Queue
+import threading
 from pprint import pprint
-from functools import partial, wraps
+from functools import partial
 from PySide.QtCore import *
 from PySide.QtGui import * 
 
@@ -25,6 +26,45 @@ if current_python_file_directory not in sys.path:
     
 import configuration
 reload(configuration)
+import folder_layout
+reload(folder_layout)
+import template_files
+reload(template_files)
+import project_manifest
+reload(project_manifest)
+import project_staging
+reload(project_staging)
+import project_cache
+reload(project_cache)
+import shot_inventory
+reload(shot_inventory)
+import project_discovery
+reload(project_discovery)
+import drive_enumeration
+reload(drive_enumeration)
+import asset_index
+reload(asset_index)
+import directory_scanner
+reload(directory_scanner)
+import qt_binding
+reload(qt_binding)
+import populate_workers
+reload(populate_workers)
+import view_events
+reload(view_events)
+import file_list_model
+reload(file_list_model)
+import startup_timing
+reload(startup_timing)
+import change_events
+reload(change_events)
+import quick_open
+reload(quick_open)
+import thumbnail_cache
+reload(thumbnail_cache)
+
+# the startup of the app is timed from here, see main_gui.finish_startup()
+startup_timer = startup_timing.Startup_Timer()
 
 VLC_PLAYER = r'C:/Applications/vlc-2.2.4-win64/vlc.exe'
 img_exts = ['png', 'jpg', 'jpeg', 'tif', 'tiff', 'bmp']
@@ -32,6 +72,27 @@ vid_exts = ['mov', 'mpeg', 'avi', 'mp4', 'wmv']
 
 desktop_scaled = 1.5
 
+# the department folders are compiled into a flat, ordered list of relative directories only once
+department_layout = folder_layout.compile_folder_layout(configuration.Departments)
+
+
+def estimate_scene_shot_amount(dict_amount, shot_file_types=8):
+    '''
+    - returns an estimated amount of the directories and files created for the given scene-shots, which is used for the ETA of a job
+    - the shot directories are taken from the compiled department layout, so nothing on disk is looked at
+    '''
+    shot_directories = folder_layout.layout_shot_directories(department_layout, configuration.no_shot_folders)
+    scenes = len(dict_amount)
+    shots = sum(dict_amount.values())
+    # every shot folder holds the '___backup' and '___script' folders
+    directories = len(shot_directories) * (scenes + shots * 3)
+    files = 0 if configuration.lazy_shot_files else shots * shot_file_types
+    return directories + files
+
+# every shot file starts as a copy of 'empty.ma', the template is only read once and written by the cheapest method available
+empty_maya_template = template_files.Template_File(current_python_file_directory + '/empty.ma',
+                                                   configuration.shot_file_materialization, configuration.hardlink_shot_files)
+
 # =======================================================
 # ========= Set some MAYA Environment Variables =========
 # =======================================================
@@ -66,130 +127,321 @@ class CG_Project(object):
     - create structural folders for the project
     - can dynamtically add new scene-shot folders for all the shot-based directories
     """
-    def __init__(self, project_name, dict_amount):
-
+    def __init__(self, project_name, dict_amount, root_directory=None, job=None, open_existing=False):
+        '''
+        - root_directory is the drive or folder that holds the project, it's the selected drive of the gui by default
+        - job is an optional Project_Job, which the progress is reported to, and which can cancel the creation between any two folders or files
+        - with open_existing, a project that has its structure recorded in the manifest is opened from it, nothing is walked or created
+        '''
+        # the maya file types and the roles of their directories: (department, category, variant), see role_directory()
         self.maya_asset_directories_dict = {    #geo assets:
-                                                'geo_hi_char':      'self.get_char_hiGeo_dir()',
-                                                'geo_low_char':     'self.get_char_lowGeo_dir()',                                    
-                                                'geo_hi_props':     'self.get_props_hiGeo_dir()',
-                                                'geo_low_props':    'self.get_props_lowGeo_dir()',
-                                                'geo_hi_com':       'self.get_com_hiGeo_dir()',
-                                                'geo_low_com':      'self.get_com_lowGeo_dir()',
-                                                'geo_hi_env':       'self.get_env_hiGeo_dir()',
-                                                'geo_low_env':      'self.get_env_lowGeo_dir()',
+                                                'geo_hi_char':      ('MODEL', 'Characters', 'High_Resolution'),
+                                                'geo_low_char':     ('MODEL', 'Characters', 'Low_Resolution'),                                    
+                                                'geo_hi_props':     ('MODEL', 'Props', 'High_Resolution'),
+                                                'geo_low_props':    ('MODEL', 'Props', 'Low_Resolution'),
+                                                'geo_hi_com':       ('MODEL', 'Environments', 'High_Resolution/Components'),
+                                                'geo_low_com':      ('MODEL', 'Environments', 'Low_Resolution/Components'),
+                                                'geo_hi_env':       ('MODEL', 'Environments', 'High_Resolution/Assembled_Scenes'),
+                                                'geo_low_env':      ('MODEL', 'Environments', 'Low_Resolution/Assembled_Scenes'),
 
                                                 # rig assets:
-                                                'rig_char':         'self.get_char_rig_dir()',
-                                                'def_char':         'self.get_char_def_dir()',
-                                                'rig_props':        'self.get_props_rig_dir()',
-                                                'def_props':        'self.get_props_def_dir()',
+                                                'rig_char':         ('SETUP', 'Characters', 'Rigged'),
+                                                'def_char':         ('SETUP', 'Characters', 'Deformed'),
+                                                'rig_props':        ('SETUP', 'Props', 'Rigged'),
+                                                'def_props':        ('SETUP', 'Props', 'Deformed'),
 
                                                 # surfacing assets:
-                                                'surf_char':        'self.get_char_shader_dir()',    
-                                                'surf_props':       'self.get_props_shader_dir()',
-                                                'surf_com':         'self.get_env_shader_dir()',
+                                                'surf_char':        ('SURFACING', 'Shaders', 'Characters'),    
+                                                'surf_props':       ('SURFACING', 'Shaders', 'Props'),
+                                                'surf_com':         ('SURFACING', 'Shaders', 'Components'),
 
                                                 # templates assets:
-                                                'ligtemp_char':     'self.get_char_light_template_dir()',
-                                                'ligtemp_env':      'self.get_env_light_template_dir()',
-                                                'render_template':  'self.get_render_template_dir()'}       
-
-        self.maya_shot_directories_dict = {     'anim_':        'self.get_anim_shot_dir()',
-                                                'layout_':      'self.get_layout_shot_dir()',                                    
-                                                'vfx_':         'self.get_vfx_shot_dir()',
-                                                'light_':       'self.get_lighting_shot_dir()',
-                                                'render_':      'self.get_rendering_shot_dir()',
-                                                'geo_':         'self.get_geo_shot_dir()',
-                                                'anim_cache_':  'self.get_anim_cache_shot_dir()',
-                                                'vfx_cache_':   'self.get_vfx_cache_shot_dir()' }   
+                                                'ligtemp_char':     ('LIGHTING', 'Templates', 'Characters'),
+                                                'ligtemp_env':      ('LIGHTING', 'Templates', 'Environments'),
+                                                'render_template':  ('LIGHTING', 'Templates', 'Rendering')}       
+
+        self.maya_shot_directories_dict = {     'anim_':        ('ANIMATION', 'Finals', None),
+                                                'layout_':      ('ANIMATION', 'Layouts', None),                                    
+                                                'vfx_':         ('VFX', 'SHOTS', None),
+                                                'light_':       ('LIGHTING', None, None),
+                                                'render_':      ('RENDERING', None, None),
+                                                'geo_':         ('MODEL', None, None),
+                                                'anim_cache_':  ('ANIMATION', 'Cached', None),
+                                                'vfx_cache_':   ('VFX', 'Cached', None) }   
+
+        # the role tables of the shot roots and asset roots, they're built on demand by role_directory()
+        self.__role_tables = {}
+
+        if root_directory == None:
+            root_directory = project_manager_gui.select_drive_combo_box.currentText()
+        self.root_directory = root_directory
+        self.job = job
 
         self.project_name = project_name
-        self.project_directory = project_manager_gui.select_drive_combo_box.currentText() + self.project_name + '/'
+        self.project_directory = self.root_directory + self.project_name + '/'
         self.dict_amount = dict_amount
+        # the manifest records the structure of the project and the lazy shot files, see configuration.lazy_shot_files
+        self.manifest = project_manifest.Project_Manifest(self.project_directory)
+        self.manifest.load()
+        if not (open_existing and self.open_from_manifest()):
+            if not os.path.isdir(self.project_directory) and project_staging.use_staging(configuration.project_creation_mode, self.root_directory):
+                # a new project can be built on a local staging drive, then transferred to its drive in bulk
+                self.make_project_staged()
+            else:
+                self.make_project()
+            self.save_structure(self.scan_shot_inventory())
+        # the job is only used during the creation
+        self.job = None
+
+
+    def make_project(self):
+        '''
+        - creates the folder structure, the hidden folders and the initial maya shot files right on the project drive
+        - only the missing folders and files are created, so it's used for the existing projects too
+        '''
         self.make_folder_structure()
-        self.make_hidden_folders('backup') 
-        self.make_hidden_folders('script')        
-        self.get_directories_for_shots_attr = self.get_directories_for_shots()
-        self.get_directories_for_assets_attr = self.get_directories_for_assets()
+        self.check_cancelled()
+        self.make_hidden_folders()
+        self.check_cancelled()
+        self.get_directories_for_shots_attr, self.get_directories_for_assets_attr = self.discover_roots()
+        self.check_cancelled()
         # generates initial maya shot files
         self.make_init_maya_shot_files(self.dict_amount)  
 
 
-    def directories_for_shots(self):
+    def make_project_staged(self):
         '''
-        - this function returns a list of directories that hold scene-shot hierarchical folders
-        - it only works for the first time when the whole project structure is created and there's no scene-shot folders 
+        - builds the whole new project, folders, hidden folders and initial maya shot files, in a local staging folder,
+          then transfers it to the project drive in one pass and verifies it, see project_staging.stage_and_transfer()
+        - the staging, transfer and verification are timed separately and printed when configuration.staging_report is on,
+          which tells whether configuration.project_creation_mode should be 'staged' or 'direct' for the drive
+        - returns the timings
         '''
-        no_shot_dirs = configuration.no_shot_folders
-        directories = []
-        for paths, dirs, files in os.walk(self.project_directory):
-            paths = unix_format(paths)
-            if paths.split('/')[-2] not in no_shot_dirs and paths.split('/')[-2][:2] != '__' and os.listdir(paths) == [] :
-                directories.append(paths)
-        return directories    
+        target_directory = self.project_directory
 
+        def build(staging_root):
+            staged_directory = staging_root + self.project_name + '/'
+            self.root_directory, self.project_directory = staging_root, staged_directory
+            try:
+                self.make_folder_structure()
+                self.check_cancelled()
+                self.make_hidden_folders()
+                self.check_cancelled()
+                staged_shot_dirs, staged_asset_dirs = self.discover_roots()
+            finally:
+                self.root_directory, self.project_directory = target_root, target_directory
+                project_cache.forget_project(staged_directory)
+            # the directories are kept as they'll be on the project drive, the getters rely on their depth
+            self.get_directories_for_shots_attr = project_staging.rebase_paths(staged_shot_dirs, staged_directory, target_directory)
+            self.get_directories_for_assets_attr = project_staging.rebase_paths(staged_asset_dirs, staged_directory, target_directory)
+            self.check_cancelled()
+            if not configuration.lazy_shot_files:
+                shot_files = project_staging.rebase_paths(self.shot_file_paths(self.dict_amount), target_directory, staged_directory)
+                empty_maya_template.materialize_files(shot_files, self.on_file_written())
+            # from now on, a cancelled job removes the project from its drive
+            if self.job != None:
+                self.job.root_created(target_directory)
+
+        target_root = self.root_directory
+        on_transferred = None
+        if self.job != None:
+            on_transferred = lambda path: self.check_cancelled()
+        timings = project_staging.stage_and_transfer(build, target_directory, configuration.staging_directory,
+                                                     configuration.materializer_threads, ('___backup', '___script'), on_transferred)
+        if configuration.staging_report:
+            print project_staging.format_timings(timings)
+
+        if configuration.lazy_shot_files:
+            # the manifest is written straight into the transferred project
+            self.make_init_maya_shot_files(self.dict_amount)
+        return timings
+
+
+    def open_from_manifest(self):
+        '''
+        - takes the shot roots, asset roots and scene-shot table from the manifest, returns False if no structure is recorded
+        - the manifest isn't checked against the disk here, that's done lazily by revalidate_structure()
+        '''
+        structure = self.manifest.structure()
+        if structure == None:
+            return False
+        self.get_directories_for_shots_attr = structure['shot_roots']
+        self.get_directories_for_assets_attr = structure['asset_roots']
+        self.shot_inventory_attr = shot_inventory.Shot_Inventory.from_record(
+                                        structure['shot_roots'], {'scenes': structure['scenes'], 'missing': structure['missing_shots']})
+        self.dict_amount = structure['scenes']
+        return True
 
-    def __make_hierarchical_folders(self, parent_dir, parent_name, child_name):
+
+    def watched_directories(self):
         '''
-        - this function generates folders based on given amount of parent folders and their amount of sub-folders
-        - the amount of sub-folders might be vary 
-        - parent_name is the base name of all the parent folders, it refers to "scene" folders in most of cases
-        - child_name is the base name of all the child folders, it refers to "shot" folders in most of cases
-        - parent_dir is a string type, make sure to be end with '/'
-        - dict_amount is a dictionary type, it looks like: {<scn_num>:<amount_of_shots>}, for example: {1:10,2:7,...}
-        - can pass a new dict, which adds new "scene" folders and their "shot" folders
-        - for example: dir = r'Z:\CG_Production_File_Structure\ANIMATION\Finals'
-        the first time you use make_hierarchical_folders(dir,'scn','__shot',{1:10,2:17,3:37})
-        it generates:  "scn1" with 10 "__shot" sub folders 
-                       "scn2" with 17 "__shot" sub folders 
-                       "scn1" with 37 "__shot" sub folders 
-        the second time you use make_hierarchical_folders(dir,'scn','__shot',{1:14,4:31})
-        it updates: "scn1" with 14 "__shot" sub folders 
-        and adds:   "scn4" with 31 "__shot" sub folders 
-        '''
-        dir = unix_format(parent_dir)
-    
-        #list all the folders in parent_dir
-        current_folders = os.listdir(dir)
+        - returns the directories whose modification times tell whether the recorded structure is still current:
+          every shot root and all their scene folders for the shot inventory, the asset folders of the layout for the asset roots
+        '''
+        watched = list(self.get_directories_for_shots_attr) + self.shot_inventory_attr.scene_directories()
+        for directory in folder_layout.layout_leaves(department_layout):
+            if directory.split('/')[0] in configuration.asset_folders:
+                watched.append(self.project_directory + directory)
+        return watched
 
-        parent_folder_surffix_digits = self.dict_amount.keys()
 
-        #create parent folders
-        for i in parent_folder_surffix_digits:
-            #check whether the parent_folder is alread existed in current_folders or not
-            parent_folder_name = parent_name + str(i)
-            if parent_folder_name not in current_folders:
-                make_folders(dir,parent_folder_name)
-    
-        #iterate all the parent folders and create their sub folders based on the given numbers
-        for k, v in self.dict_amount.iteritems():
-            # k is the scene number, and v is the amount of shots for certain scene
-            # sub_dir is one of the parent_folders under the parent_dir, which should be the "scene" folders               
-            sub_dir = dir + parent_name + str(k) + '/'
-            #list all the sub folders under current "scene" folder
-            current_sub_folders = os.listdir(sub_dir)
-            amount_of_sub_folders = v
-            sub_folder_surffix_digits = []
-            if v < 1:
-                break
-            if v == 1: 
-                sub_folder_name = child_name + str(v)
-                if sub_folder_name not in current_sub_folders:
-                    make_folders(sub_dir,sub_folder_name)
-            if v > 1:
-                sub_folder_surffix_digits = range(v)
-                # range(v) --> [0,1,...,(v-1)]
-                # we desire the surffix begins from 1 rather than 0
-                if sub_folder_surffix_digits[0] == 0:          
-                    start_num = 1              
-                # sub_folder_surffix_digits[-1] = (v-1)
-                # (v-1) + 2 = (v + 1)
-                # range(1, (v+1)) --> [1,2,...,v]
-                end_num = sub_folder_surffix_digits[-1] + 2
-                for i in range(start_num, end_num):     
-                    sub_folder_name = child_name + str(i)
-                    if sub_folder_name not in current_sub_folders:
-                        make_folders(sub_dir,sub_folder_name)
+    def save_structure(self, inventory):
+        '''
+        - records the shot roots, the asset roots and the given Shot_Inventory in the manifest and saves it
+        - only the highest shot of every scene and the shots missing from a department are recorded, see Shot_Inventory.to_record()
+        '''
+        self.shot_inventory_attr = inventory
+        self.dict_amount = inventory.scene_shot_dict()
+        missing_shots = inventory.to_record(self.manifest.relative)['missing']
+        self.manifest.record_structure(self.get_directories_for_shots_attr, self.get_directories_for_assets_attr,
+                                       self.dict_amount, self.watched_directories(), missing_shots)
+        self.manifest.save()
+
+
+    def shot_inventory(self):
+        '''
+        - returns the Shot_Inventory of the project, the complete scene x shot x department matrix,
+          which tells the existing shots, the gaps and the shots that are missing from some departments
+        - it comes from the manifest as long as the recorded structure is current, otherwise from one parallel scan,
+          see revalidate_structure(), so it's answered in milliseconds however many shots there are
+        '''
+        self.revalidate_structure()
+        return self.shot_inventory_attr
+
+
+    def revalidate_structure(self):
+        '''
+        - lazily checks the structure taken from the manifest against the disk, by one stat call per watched directory
+        - only when any of them changed, the shot roots, the asset roots and the scene-shot table are scanned again and recorded
+        - returns True if the structure was scanned again
+        '''
+        if not self.manifest.changed_directories():
+            return False
+        # the in-memory cache may not have checked the same directories yet
+        self.cache().invalidate()
+        self.get_directories_for_shots_attr, self.get_directories_for_assets_attr = self.discover_roots()
+        self.save_structure(self.scan_shot_inventory())
+        return True
+
+
+    def scan_scene_shot_dict(self):
+        '''
+        - returns the scene-shot table on disk, it looks like: {<scn_num>:<amount_of_shots>}, or None if there're no shot folders
+        '''
+        if self.get_directories_for_shots_attr == []: 
+            return None
+        return self.scan_shot_inventory().scene_shot_dict()
+
+
+    @project_cache.project_cached('shot_inventory', 'shot_inventory_dependencies', configuration.cache_revalidate_interval)
+    def scan_shot_inventory(self):
+        '''
+        - builds the Shot_Inventory of the project by one parallel scandir pass over the scene folders of every shot root
+        - the result is cached for the project until a shot root or one of its scene folders is modified
+        '''
+        return shot_inventory.scan_shot_inventory(self.get_directories_for_shots_attr, configuration.materializer_threads)
+
+
+    def shot_inventory_dependencies(self, inventory):
+        '''
+        - returns the directories whose listings make up the shot inventory: every shot root and all their scene folders,
+          so a shot added to or deleted from any department outdates it
+        '''
+        if not self.get_directories_for_shots_attr:
+            return [self.project_directory]
+        return self.get_directories_for_shots_attr + inventory.scene_directories()
+
+
+    def list_folder_tree(self, directory):
+        '''
+        - returns the sorted names of the sub-folders of the given directory for a folder tree, the hidden '___' folders are left out
+        - the scenes of a shot root and the shots of a scene come from the shot inventory, the assets of a department from the asset index,
+          only the other folders, e.g. the variations inside an asset folder, are listed when they're asked for
+        '''
+        directory = unix_format(directory)
+        matrix = self.shot_inventory_attr.matrix
+        if directory in matrix:
+            return ['SCENE_{0}'.format(scn_number) for scn_number in sorted(matrix[directory])]
+
+        parent_directory, folder_name = directory.rstrip('/').rsplit('/', 1)
+        scenes = matrix.get(parent_directory + '/')
+        if scenes != None and folder_name.startswith('SCENE_'):
+            return ['__Shot_{0}'.format(shot_number) for shot_number in sorted(scenes.get(shot_inventory.folder_number(folder_name), ()))]
+
+        assets = self.get_asset_index().department_assets(directory)
+        if assets != None:
+            return assets
+
+        return sorted(entry.name for entry in directory_scanner.scan_directory(directory)
+                      if entry.is_dir() and entry.name[:3] != '___' and directory_scanner.is_hidden(entry) != True)
+
+
+    def role_directory(self, kind, department, category=None, variant=None):
+        '''
+        - returns the shot root ('shot' kind) or the asset root ('asset' kind) of the given role in constant time, or None if there's none
+        - a role is (department, category, variant), e.g. ('SETUP', 'Characters', 'Rigged'), see folder_layout.build_role_table()
+        - the table of a kind is built by one pass over get_directories_for_shots_attr or get_directories_for_assets_attr,
+          and looked up again whenever that attribute is replaced, e.g. after the structure was revalidated
+        - the tables are kept in the project cache, so every instance of the same project shares them
+        '''
+        directories = self.get_directories_for_shots_attr if kind == 'shot' else self.get_directories_for_assets_attr
+        role_table = self.__role_tables.get(kind)
+        if role_table == None or role_table[0] is not directories:
+            # a role table only depends on the directories it's built from, they're part of the key
+            table = self.cache().get(('role_table', tuple(directories)),
+                                     lambda: folder_layout.build_role_table(self.project_directory, directories))
+            role_table = self.__role_tables[kind] = (directories, table)
+        return role_table[1].get((department, category, variant))
+
+
+    def maya_directory(self, file_type):
+        '''
+        - returns the directory of the maya files of the given type, a key of maya_asset_directories_dict or maya_shot_directories_dict
+        - a shot type without a directory returns ''
+        '''
+        if file_type in self.maya_shot_directories_dict:
+            return self.role_directory('shot', *self.maya_shot_directories_dict[file_type]) or ''
+        return self.role_directory('asset', *self.maya_asset_directories_dict[file_type])
+
+
+    def check_cancelled(self):
+        '''
+        - raises Job_Cancelled if the job of this project was cancelled
+        '''
+        if self.job != None:
+            self.job.check_cancelled()
+
+
+    def on_directory_created(self):
+        '''
+        - returns the function that reports a newly created directory to the job, or None without a job
+        '''
+        if self.job != None:
+            return self.job.directory_created
+
+
+    def on_file_written(self):
+        '''
+        - returns the function that reports a newly written file to the job, or None without a job
+        '''
+        if self.job != None:
+            return self.job.file_written
+
+
+    def estimate_creation_amount(self, dict_amount):
+        '''
+        - returns an estimated amount of the directories and files created for the given scene-shots, which is used for the ETA of a job
+        '''
+        return estimate_scene_shot_amount(dict_amount, len(self.maya_shot_directories_dict))
+
+
+    def directories_for_shots(self):
+        '''
+        - this function returns a list of directories that hold scene-shot hierarchical folders
+        - they're the leaves of the department layout, so they're known without looking at the disk
+        '''
+        shot_directories = folder_layout.layout_shot_directories(department_layout, configuration.no_shot_folders)
+        return [self.project_directory + directory for directory in shot_directories]
 
 
     def generate_scene_shot_folders(self):
@@ -199,94 +451,36 @@ class CG_Project(object):
         - dict_amount is a dictionary type, it looks like: {<scn_num>:<amount_of_shots>}, for example: {1:10,2:7,...}
         '''
         dirs_for_shots = self.directories_for_shots()
-        for dir in dirs_for_shots:
-            self.__make_hierarchical_folders(dir,'SCENE_','__Shot_')              
-
-
-    def __make_dict_folders(self, parent_dir, folder_dict):
-        '''
-        - parent_dir is string type, which indicates the directory
-        - folder_dict is dictionary, which the keys are the parent folders and values are the sub folders
-        - folder_dict can be a nested dictionary, however, the type of all the values must be list.
-        - for example,
-              dir = r'Z:\zzz\2D' 
-              d = {'a':['a1','a2','a3'],'b':['b1','b2',b3],'c':c,'z':v}     
-              b3 = {'b3':['b3_1','b3_2'],'b4':['b4_1','b4_2'],'b5':b5}
-              b5 = {'b5_5':['b5_1','b5_2']}
-              v = {'av':['az']}
-              c = {'cc':['c1','c2','c3']}
-          make_dict_folders(dir,d) this will generate a folder structure like:
-          a
-          |----a1
-          |----a2
-          |----a3
-          
-          b
-          |----b1
-          |----b2
-          |----b3
-                |----b3_1
-                |----b3_2
-          |----b4
-                |----b4_1
-                |----b4_2
-          |----b5
-                |----b5_5
-                        |----b5_1
-                        |----b5_2
-          
-          c
-          |----cc
-                |----c1
-                |----c2
-                |----c3
-          
-          z
-          |----av
-                |----az
-        '''
-        dir = unix_format(parent_dir) 
-        # list all the folders in current parent_dir
-        current_parent_folders = os.listdir(dir)
-        # iterate all keys in folder_dict, which are folders that contain child folders
-        for folder in folder_dict.keys():
-            folder_dir = dir + folder + '/'
-            # creates parnet folders under the parent_dir
-            if folder not in current_parent_folders:        
-                os.mkdir(folder_dir)
-            # list all the sub folders under current parent folder
-            current_sub_folders = os.listdir(folder_dir)
-            # use recursion to handle those "nested dict" in dict-values, 
-            # it recursively iterates all the elements until there're no more dict, then execute codes from line 163
-            if type(folder_dict[folder]) == dict:
-                self.__make_dict_folders(folder_dir,folder_dict[folder])        
-            else: 
-                # if current dict-value is not dictionary, then we iterates elements of the list
-                for sub_folder in folder_dict[folder]:
-                    sub_folder_dir = folder_dir + str(sub_folder) + '/'  
-                    # use recursion to handle those "nested dict" in list-elements
-                    # it recursively iterates all the elements until there're no more dict, then execute codes from line 163
-                    if type(sub_folder) == dict:
-                        self.__make_dict_folders(folder_dir,sub_folder)
-                    #can also pass an empty list, which indicates there's no sub folder under current parent folder
-                    elif sub_folder == []:
-                        os.mkdir(folder_dir)
-                    else:
-                    # finally, there're no more nested dict, can create folders one by one based on the elements from the list
-                        if sub_folder not in current_sub_folders:                  
-                            os.mkdir(sub_folder_dir)                 
+        scene_shot_layout = folder_layout.compile_scene_shot_layout(self.project_directory, dirs_for_shots, self.dict_amount)
+        self.materialize_layout(scene_shot_layout)
+
+
+    def materialize_layout(self, layout, root_is_new=False, assume_missing=False):
+        '''
+        - creates the missing directories of a compiled layout under the project directory
+        - configuration.materializer_mode picks the serial or the parallel materializer
+        - returns a list of the directories that were created
+        '''
+        return folder_layout.materialize_layout(self.project_directory, layout, root_is_new,
+                                                configuration.materializer_mode, configuration.materializer_threads, assume_missing,
+                                                self.on_directory_created())
 
 
     def make_folder_structure(self):
         #root_directory = configuration.network_drive
-        root_directory = project_manager_gui.select_drive_combo_box.currentText()
+        root_directory = self.root_directory
         project_directory = self.project_directory
         # create the project root folder
+        root_is_new = False
         if self.project_name not in os.listdir(root_directory) and self.project_name != '':
             os.mkdir(self.project_directory)
+            root_is_new = True
+            # a cancelled job removes the whole new project
+            if self.job != None:
+                self.job.root_created(self.project_directory)
         try:
-            # create department folders        
-            self.__make_dict_folders(self.project_directory,configuration.Departments)
+            # create department folders, only the missing ones are created
+            self.materialize_layout(department_layout, root_is_new)
             # creates scene-shots hierarchical folders
             self.generate_scene_shot_folders()
 
@@ -304,271 +498,239 @@ class CG_Project(object):
             for k, v in new_dict_amount.iteritems():
                 update_shot_dict(self.dict_amount, k, v)
             dirs_for_shots = self.get_directories_for_shots_attr
-            for dir in dirs_for_shots:
-                self.__make_hierarchical_folders(dir,'SCENE_','__Shot_')
-
-            self.make_hidden_folders('backup') 
-            self.make_hidden_folders('script')  
-
-            self.make_init_maya_shot_files(new_dict_amount)  
+            # only the scenes of the new dict are looked at, the cost doesn't grow with the amount of existing scenes
+            shot_files = {} if configuration.lazy_shot_files else self.shot_file_patterns()
+            delta = folder_layout.plan_scene_shot_delta(self.project_directory, dirs_for_shots, new_dict_amount, shot_files)
+            self.apply_scene_shot_delta(delta)
+            if configuration.lazy_shot_files:
+                self.make_init_maya_shot_files(new_dict_amount)
+            # the new scenes and shots are recorded, the next open doesn't have to scan for them
+            self.cache().invalidate(('shot_inventory',))
+            self.shot_inventory_attr.add_shots(new_dict_amount)
+            self.save_structure(self.shot_inventory_attr)
         except AttributeError:
             pass            
 
 
-    def exec_once_when_init(in_class_method):
-        @wraps(in_class_method)
-        def wrapper( *args, **kwargs):
-            if not wrapper.called:
-                return in_class_method(*args, **kwargs)
-        wrapper.called = False
-        return wrapper
+    def shot_file_patterns(self):
+        '''
+        - returns a dictionary which tells the maya files that belong into the shot folders of every shot directory
+        - it looks like: {<shot_directory>: [<file_name_pattern>, ...]}, for example: {'Z:/proj/ANIMATION/Finals/': ['anim_scene_{0}_shot_{1}.ma']}
+        '''
+        patterns = {}
+        for type in self.maya_shot_directories_dict.keys():
+            shot_dir = self.maya_directory(type)
+            if shot_dir:
+                patterns.setdefault(unix_format(shot_dir), []).append(type + 'scene_{0}_shot_{1}.ma')
+        return patterns
+
+
+    def apply_scene_shot_delta(self, delta):
+        '''
+        - creates the scene-shot folders, the hidden folders and the shot files planned by folder_layout.plan_scene_shot_delta()
+        - everything in the delta is known to be missing, so nothing is listed or walked again
+        '''
+        self.materialize_layout(delta['folders'] + delta['hidden_folders'], assume_missing=True)
+        for hidden_folder in delta['hidden_folders']:
+            folder_layout.hide_folder(self.project_directory + hidden_folder)
+
+        empty_maya_template.materialize_files(delta['files'], self.on_file_written())
+
+
+    def cache(self):
+        '''
+        - returns the in-memory cache of this project, which is shared by every instance of the same project, see project_cache
+        '''
+        return project_cache.get_project_cache(self.project_directory, configuration.cache_revalidate_interval)
+
+
+    @project_cache.project_cached('roots', 'roots_dependencies', configuration.cache_revalidate_interval)
+    def discover_roots(self):
+        '''
+        - returns the directories that hold scene-shot hierarchical folders and the directories that hold project assets,
+          both found by one pruned traversal of the project, see folder_layout.discover_project_roots()
+        - the result is cached for the project until one of the directories of roots_dependencies() is modified
+        '''
+        shot_directories = []
+        asset_directories = []
+        for kind, directory in folder_layout.discover_project_roots(self.project_directory, configuration.no_shot_folders,
+                                                                    configuration.asset_folders):
+            if kind == 'shot':
+                shot_directories.append(directory)
+            else:
+                asset_directories.append(directory)
+        return shot_directories, asset_directories
+
+
+    def roots_dependencies(self, roots):
+        '''
+        - returns the directories whose listings decide the shot roots and asset roots: the project folder,
+          where the departments are, and the leaves of the department layout, which become roots once they hold scenes or assets
+        '''
+        leaves = [self.project_directory + directory for directory in folder_layout.layout_leaves(department_layout)]
+        return [self.project_directory] + leaves + roots[0] + roots[1]
 
 
-    @exec_once_when_init 
     def get_directories_for_shots(self):
         '''
         - this function returns a list of directories that hold scene-shot hierarchical folders
         - it works for the project that parts of the scene-shot folders have been created
         '''
-        no_shot_dirs = configuration.no_shot_folders
-        directories = []
-
-        for paths, dirs, files in os.walk(self.project_directory):
-            paths = unix_format(paths)
-            
-            if paths.split('/')[-2] not in no_shot_dirs and paths.split('/')[-2][:2] != '__' :
-                
-                if os.listdir(paths) != [] and os.listdir(paths)[0][:6] == 'SCENE_' :
-                    
-                    directories.append(paths)
-        
-        return directories
+        return self.discover_roots()[0]
 
 
-    @exec_once_when_init 
     def get_directories_for_assets(self):
         '''
         - this function returns a list of directories that hold project assets
         '''
-        asset_parent_folders = configuration.asset_folders
-        asset_directories = []
-        for paths, dirs, files in os.walk(self.project_directory):
-            paths = unix_format(paths)
-            if len(paths.split('/')) > 4 and paths.split('/')[2] in configuration.asset_folders:
-                if os.listdir(paths) != [] and paths.split('/')[-3] != 'SHOTS':
-                    if os.listdir(paths)[0][:2] == '__':
-                        asset_directories.append(paths)
-        return asset_directories
+        return self.discover_roots()[1]
 
 
     def get_char_rig_dir(self):
         '''
         - this function returns a list of directories for rigged chars.
         '''
-        all_asset_dirs = self.get_directories_for_assets_attr
-        for dir in all_asset_dirs:
-            if dir.split('/')[2] == 'SETUP' and dir.split('/')[3] == 'Characters' and dir.split('/')[4] == 'Rigged':
-                return dir
+        return self.role_directory('asset', 'SETUP', 'Characters', 'Rigged')
 
 
     def get_char_def_dir(self):
         '''
         - this function returns a list of directories for deformed chars.
         '''
-        all_asset_dirs = self.get_directories_for_assets_attr
-        for dir in all_asset_dirs:
-            if dir.split('/')[2] == 'SETUP' and dir.split('/')[3] == 'Characters' and dir.split('/')[4] == 'Deformed':
-                return dir
+        return self.role_directory('asset', 'SETUP', 'Characters', 'Deformed')
 
 
     def get_props_rig_dir(self):
         '''
         - this function returns a list of directories for rigged chars.
         '''
-        all_asset_dirs = self.get_directories_for_assets_attr
-        for dir in all_asset_dirs:
-            if dir.split('/')[2] == 'SETUP' and dir.split('/')[3] == 'Props' and dir.split('/')[4] == 'Rigged':
-                return dir
+        return self.role_directory('asset', 'SETUP', 'Props', 'Rigged')
 
 
     def get_props_def_dir(self):
         '''
         - this function returns a list of directories for deformed props.
         '''
-        all_asset_dirs = self.get_directories_for_assets_attr
-        for dir in all_asset_dirs:
-            if dir.split('/')[2] == 'SETUP' and dir.split('/')[3] == 'Props' and dir.split('/')[4] == 'Deformed':
-                return dir                
+        return self.role_directory('asset', 'SETUP', 'Props', 'Deformed')
 
 
     def get_props_hiGeo_dir(self):
         '''
         - this function returns a list of directories for hi-geo props.
         '''
-        all_asset_dirs = self.get_directories_for_assets_attr
-        for dir in all_asset_dirs:
-            if dir.split('/')[2] == 'MODEL' and dir.split('/')[3] == 'Props' and dir.split('/')[4] == 'High_Resolution':
-                return dir
+        return self.role_directory('asset', 'MODEL', 'Props', 'High_Resolution')
 
 
     def get_props_lowGeo_dir(self):
         '''
         - this function returns a list of directories for low-geo props.
         '''
-        all_asset_dirs = self.get_directories_for_assets_attr
-        for dir in all_asset_dirs:
-            if dir.split('/')[2] == 'MODEL' and dir.split('/')[3] == 'Props' and dir.split('/')[4] == 'Low_Resolution':
-                return dir 
+        return self.role_directory('asset', 'MODEL', 'Props', 'Low_Resolution')
 
 
     def get_char_hiGeo_dir(self):
         '''
         - this function returns a list of directories for hi-geo chars.
         '''
-        all_asset_dirs = self.get_directories_for_assets_attr
-        for dir in all_asset_dirs:
-            if dir.split('/')[2] == 'MODEL' and dir.split('/')[3] == 'Characters' and dir.split('/')[4] == 'High_Resolution':
-                return dir
+        return self.role_directory('asset', 'MODEL', 'Characters', 'High_Resolution')
 
 
     def get_char_lowGeo_dir(self):
         '''
         - this function returns a list of directories for low-geo chars.
         '''
-        all_asset_dirs = self.get_directories_for_assets_attr
-        for dir in all_asset_dirs:
-            if dir.split('/')[2] == 'MODEL' and dir.split('/')[3] == 'Characters' and dir.split('/')[4] == 'Low_Resolution':
-                return dir 
+        return self.role_directory('asset', 'MODEL', 'Characters', 'Low_Resolution')
 
 
     def get_env_hiGeo_dir(self):
         '''
         - this function returns a list of directories for hi-geo assembled-scenes.
         '''
-        all_asset_dirs = self.get_directories_for_assets_attr
-        for dir in all_asset_dirs:
-            if dir.split('/')[2] == 'MODEL' and dir.split('/')[3] == 'Environments' and dir.split('/')[4] == 'High_Resolution' and dir.split('/')[5] == 'Assembled_Scenes':
-                return dir
+        return self.role_directory('asset', 'MODEL', 'Environments', 'High_Resolution/Assembled_Scenes')
 
 
     def get_env_lowGeo_dir(self):
         '''
         - this function returns a list of directories for low-geo assembled-scenes.
         '''
-        all_asset_dirs = self.get_directories_for_assets_attr
-        for dir in all_asset_dirs:
-            if dir.split('/')[2] == 'MODEL' and dir.split('/')[3] == 'Environments' and dir.split('/')[4] == 'Low_Resolution' and dir.split('/')[5] == 'Assembled_Scenes':
-                return dir 
+        return self.role_directory('asset', 'MODEL', 'Environments', 'Low_Resolution/Assembled_Scenes')
 
 
     def get_com_hiGeo_dir(self):
         '''
         - this function returns a list of directories for hi-geo components.
         '''
-        all_asset_dirs = self.get_directories_for_assets_attr
-        for dir in all_asset_dirs:
-            if dir.split('/')[2] == 'MODEL' and dir.split('/')[3] == 'Environments' and dir.split('/')[4] == 'High_Resolution' and dir.split('/')[5] == 'Components':
-                return dir
+        return self.role_directory('asset', 'MODEL', 'Environments', 'High_Resolution/Components')
 
 
     def get_com_lowGeo_dir(self):
         '''
         - this function returns a list of directories for low-geo components.
         '''
-        all_asset_dirs = self.get_directories_for_assets_attr
-        for dir in all_asset_dirs:
-            if dir.split('/')[2] == 'MODEL' and dir.split('/')[3] == 'Environments' and dir.split('/')[4] == 'Low_Resolution' and dir.split('/')[5] == 'Components':
-                return dir 
+        return self.role_directory('asset', 'MODEL', 'Environments', 'Low_Resolution/Components')
 
 
     def get_char_shader_dir(self):
         '''
         - this function returns a list of directories for shaders of chars.
         '''
-        all_asset_dirs = self.get_directories_for_assets_attr
-        for dir in all_asset_dirs:
-            if dir.split('/')[2] == 'SURFACING' and dir.split('/')[3] == 'Shaders' and dir.split('/')[4] == 'Characters':
-                return dir 
+        return self.role_directory('asset', 'SURFACING', 'Shaders', 'Characters')
 
 
     def get_env_shader_dir(self):
         '''
         - this function returns a list of directories for shaders of environment components.
         '''
-        all_asset_dirs = self.get_directories_for_assets_attr
-        for dir in all_asset_dirs:
-            if dir.split('/')[2] == 'SURFACING' and dir.split('/')[3] == 'Shaders' and dir.split('/')[4] == 'Components':
-                return dir     
+        return self.role_directory('asset', 'SURFACING', 'Shaders', 'Components')
 
 
     def get_props_shader_dir(self):
         '''
         - this function returns a list of directories for shaders of props.
         '''
-        all_asset_dirs = self.get_directories_for_assets_attr
-        for dir in all_asset_dirs:
-            if dir.split('/')[2] == 'SURFACING' and dir.split('/')[3] == 'Shaders' and dir.split('/')[4] == 'Props':
-                return dir   
+        return self.role_directory('asset', 'SURFACING', 'Shaders', 'Props')
 
 
     def get_char_texture_dir(self):
         '''
         - this function returns a list of directories for texture of chars.
         '''
-        all_asset_dirs = self.get_directories_for_assets_attr
-        for dir in all_asset_dirs:
-            if dir.split('/')[2] == 'SURFACING' and dir.split('/')[3] == 'Textures' and dir.split('/')[4] == 'Characters':
-                return dir 
+        return self.role_directory('asset', 'SURFACING', 'Textures', 'Characters')
 
 
     def get_env_texture_dir(self):
         '''
         - this function returns a list of directories for texture of environment components.
         '''
-        all_asset_dirs = self.get_directories_for_assets_attr
-        for dir in all_asset_dirs:
-            if dir.split('/')[2] == 'SURFACING' and dir.split('/')[3] == 'Textures' and dir.split('/')[4] == 'Components':
-                return dir     
+        return self.role_directory('asset', 'SURFACING', 'Textures', 'Components')
 
 
     def get_props_texture_dir(self):
         '''
         - this function returns a list of directories for texture of props.
         '''
-        all_asset_dirs = self.get_directories_for_assets_attr
-        for dir in all_asset_dirs:
-            if dir.split('/')[2] == 'SURFACING' and dir.split('/')[3] == 'Textures' and dir.split('/')[4] == 'Props':
-                return dir                   
+        return self.role_directory('asset', 'SURFACING', 'Textures', 'Props')
 
 
     def get_char_light_template_dir(self):
         '''
         - this function returns a list of directories for Templates of characters lighting.
         '''
-        all_asset_dirs = self.get_directories_for_assets_attr
-        for dir in all_asset_dirs:
-            if dir.split('/')[2] == 'LIGHTING' and dir.split('/')[3] == 'Templates' and dir.split('/')[4] == 'Characters':
-                return dir 
+        return self.role_directory('asset', 'LIGHTING', 'Templates', 'Characters')
 
 
     def get_env_light_template_dir(self):
         '''
         - this function returns a list of directories for Templates of environment lighting.
         '''
-        all_asset_dirs = self.get_directories_for_assets_attr
-        for dir in all_asset_dirs:
-            if dir.split('/')[2] == 'LIGHTING' and dir.split('/')[3] == 'Templates' and dir.split('/')[4] == 'Environments':
-                return dir 
+        return self.role_directory('asset', 'LIGHTING', 'Templates', 'Environments')
 
 
     def get_render_template_dir(self):
         '''
         - this function returns a list of directories for Templates of render settings.
         '''
-        all_asset_dirs = self.get_directories_for_assets_attr
-        for dir in all_asset_dirs:
-            if dir.split('/')[2] == 'LIGHTING' and dir.split('/')[3] == 'Templates' and dir.split('/')[4] == 'Rendering':
-                return dir 
+        return self.role_directory('asset', 'LIGHTING', 'Templates', 'Rendering')
 
 
     def make_render_template_dirs(self, template_name):
@@ -622,6 +784,49 @@ class CG_Project(object):
             self.add_hidden_folders(template_dir)                        
 
 
+    def asset_kind_directories(self):
+        '''
+        - returns the department directories of every kind of asset, they look like: {'char': [...], 'props': [...], 'com': [...], 'env': [...]}
+        '''
+        return {'char': self.get_char_dirs(), 'props': self.get_props_dirs(), 'com': self.get_com_dirs(), 'env': self.get_env_dirs()}
+
+
+    @project_cache.project_cached('asset_index', 'asset_index_dependencies', configuration.cache_revalidate_interval)
+    def get_asset_index(self):
+        '''
+        - returns the Asset_Index of the project, which maps every asset to its folders, active files and history counts in every department
+        - it's built by one parallel scan, then kept in the project cache and updated in place when assets are created, see index_new_assets()
+        '''
+        return asset_index.scan_asset_index(self.asset_kind_directories(), configuration.materializer_threads)
+
+
+    def asset_index_dependencies(self, index):
+        '''
+        - returns the directories whose modification times tell whether the asset index is still current: the departments only,
+          so checking it costs a stat per department, the changes inside an asset folder are applied by asset_path_changed()
+        '''
+        return sorted(set(directory for directories in index.kinds.itervalues() for directory in directories))
+
+
+    def asset_path_changed(self, path):
+        '''
+        - lists the asset folder of a path reported by a directory watcher again, e.g. a new version by create_new_variation(),
+          so the history counts stay current, an asset index that wasn't built yet is left alone
+        '''
+        index = self.cache().cached(('asset_index',))
+        if index != None:
+            index.refresh_changed_path(path)
+
+
+    def index_new_assets(self, kind, asset_names):
+        '''
+        - lists the folders of the given assets into the asset index, right after they were created
+        '''
+        index = self.get_asset_index()
+        index.refresh_assets(kind, asset_names)
+        self.cache().put(('asset_index',), index, self.asset_index_dependencies)
+
+
     def get_char_dirs(self, *char_name):
         '''
         - this function returns a list of associated dirs for all characters.
@@ -636,18 +841,10 @@ class CG_Project(object):
         all_char_dirs.append(self.get_char_shader_dir())
         all_char_dirs.append(self.get_char_light_template_dir())
         
-        char_dir = []
         if list(char_name) != []:
-            for dir in all_char_dirs:
-                char_folders = os.listdir(dir)        
-                char_folder = '__' + char_name[0]
-                if char_folders != [] and char_folder in char_folders: 
-                    dir += char_folder + '/'
-                    char_dir.append(dir)
-                else:
-                    #print dir + char_folder + '/ is not existed' 
-                    pass
-            return char_dir
+            # answered by the asset index, nothing is listed
+            char_folder = asset_index.asset_folder_name(char_name[0])
+            return [dir + char_folder + '/' for dir in self.get_asset_index().directories(char_folder, 'char')]
         else:
             return all_char_dirs 
 
@@ -657,6 +854,7 @@ class CG_Project(object):
         - this function creates character folders in all the associated directories
         - can pass multiple names of characters
         '''
+        asset_index_of_project = self.get_asset_index()
         all_char_dirs = self.get_char_dirs()
         if list(chars_name) != []:
             for dir in all_char_dirs:
@@ -664,8 +862,9 @@ class CG_Project(object):
                     if char[:2] != '__':
                         add_double_under_scores(char)
                     char_dir = dir + char
-                    if not os.path.exists(char_dir) :
-                        os.mkdir(char_dir)
+                    # the asset index tells which folders exist already, nothing is checked on the drive
+                    if not asset_index_of_project.has_asset(char, dir):
+                        make_asset_folder(char_dir)
                         self.add_hidden_folders(char_dir)
 
             for char in chars_name:
@@ -679,6 +878,8 @@ class CG_Project(object):
                 self.make_init_maya_file_with_references(char, 'geo_hi_char', 'surf_char')
                 #create initial lighting template files
                 self.make_init_maya_file_with_references(char, 'geo_hi_char', 'ligtemp_char')
+
+            self.index_new_assets('char', chars_name)
            
            
     def get_props_dirs(self, *props_name):
@@ -694,18 +895,10 @@ class CG_Project(object):
         all_props_dirs.append(self.get_props_texture_dir())
         all_props_dirs.append(self.get_props_shader_dir())
          
-        props_dir = []
         if list(props_name) != []:
-            for dir in all_props_dirs:
-                props_folders = os.listdir(dir)        
-                props_folder = '__' + props_name[0]
-                if props_folders != [] and props_folder in props_folders: 
-                    dir += props_folder + '/'
-                    props_dir.append(dir)
-                else:
-                    #print dir + props_folder + '/ is not existed' 
-                    pass
-            return props_dir
+            # answered by the asset index, nothing is listed
+            props_folder = asset_index.asset_folder_name(props_name[0])
+            return [dir + props_folder + '/' for dir in self.get_asset_index().directories(props_folder, 'props')]
         else:
             return all_props_dirs 
 
@@ -715,6 +908,7 @@ class CG_Project(object):
         - this function creates props folders in all the associated directories
         - can pass multiple names of props
         '''
+        asset_index_of_project = self.get_asset_index()
         all_props_dirs = self.get_props_dirs()
         if list(props_name) != []:
             for dir in all_props_dirs:
@@ -722,8 +916,9 @@ class CG_Project(object):
                     if props[:2] != '__':
                         add_double_under_scores(props)                    
                     props_dir = dir + props
-                    if not os.path.exists(props_dir) :
-                        os.mkdir(props_dir)
+                    # the asset index tells which folders exist already, nothing is checked on the drive
+                    if not asset_index_of_project.has_asset(props, dir):
+                        make_asset_folder(props_dir)
                         self.add_hidden_folders(props_dir)
 
             for props in props_name:
@@ -734,7 +929,9 @@ class CG_Project(object):
                 self.make_init_maya_file_with_references(props, 'geo_hi_props', 'def_props')
                 self.make_init_maya_file_with_references(props, 'geo_low_props', 'rig_props')
                 #create initial surfacing files
-                self.make_init_maya_file_with_references(props, 'geo_hi_props', 'surf_props')        
+                self.make_init_maya_file_with_references(props, 'geo_hi_props', 'surf_props')
+
+            self.index_new_assets('props', props_name)
 
 
     def get_com_dirs(self, *com_name):
@@ -750,18 +947,10 @@ class CG_Project(object):
         all_com_dirs.append(self.get_env_shader_dir())
         all_com_dirs.append(self.get_env_texture_dir())
         
-        com_dir = []
         if list(com_name) != []:
-            for dir in all_com_dirs:
-                com_folders = os.listdir(dir)        
-                com_folder = '__' + com_name[0]
-                if com_folders != [] and com_folder in com_folders: 
-                    dir += com_folder + '/'
-                    com_dir.append(dir)
-                else:
-                    #print dir + com_folder + '/ is not existed' 
-                    pass
-            return com_dir
+            # answered by the asset index, nothing is listed
+            com_folder = asset_index.asset_folder_name(com_name[0])
+            return [dir + com_folder + '/' for dir in self.get_asset_index().directories(com_folder, 'com')]
         else:
             return all_com_dirs 
 
@@ -771,6 +960,7 @@ class CG_Project(object):
         - this function creates components folders in all the associated directories
         - can pass multiple names of components
         '''
+        asset_index_of_project = self.get_asset_index()
         all_com_dirs = self.get_com_dirs()
         if list(com_name) != []:
             for dir in all_com_dirs:
@@ -778,8 +968,9 @@ class CG_Project(object):
                     if com[:2] != '__':
                         add_double_under_scores(com)                       
                     com_dir = dir + com
-                    if not os.path.exists(com_dir) :
-                        os.mkdir(com_dir)
+                    # the asset index tells which folders exist already, nothing is checked on the drive
+                    if not asset_index_of_project.has_asset(com, dir):
+                        make_asset_folder(com_dir)
                         self.add_hidden_folders(com_dir)
 
             for com in com_name:
@@ -787,7 +978,9 @@ class CG_Project(object):
                 self.make_init_maya_file('geo_hi_com', com)
                 self.make_init_maya_file('geo_low_com', com)
                 #create initial surfacing files
-                self.make_init_maya_file_with_references(com, 'geo_hi_com', 'surf_com')     
+                self.make_init_maya_file_with_references(com, 'geo_hi_com', 'surf_com')
+
+            self.index_new_assets('com', com_name)
 
 
     def get_env_dirs(self, *env_name):
@@ -805,18 +998,10 @@ class CG_Project(object):
         #all_com_dirs.append(self.get_env_shader_dir())
         #all_com_dirs.append(self.get_env_texture_dir())
         
-        env_dir = []
         if list(env_name) != []:
-            for dir in all_env_dirs:
-                env_folders = os.listdir(dir)        
-                env_folder = '__' + env_name[0]
-                if env_folders != [] and env_folder in env_folders: 
-                    dir += env_folder + '/'
-                    env_dir.append(dir)
-                else:
-                    #print dir + env_folder + '/ is not existed' 
-                    pass
-            return env_dir
+            # answered by the asset index, nothing is listed
+            env_folder = asset_index.asset_folder_name(env_name[0])
+            return [dir + env_folder + '/' for dir in self.get_asset_index().directories(env_folder, 'env')]
         else:
             return all_env_dirs 
 
@@ -826,6 +1011,7 @@ class CG_Project(object):
         - this function creates environment folders in all the associated directories
         - can pass multiple names of environment
         '''
+        asset_index_of_project = self.get_asset_index()
         all_env_dirs = self.get_env_dirs()
         if list(envs_name) != []:
             for dir in all_env_dirs:
@@ -833,15 +1019,18 @@ class CG_Project(object):
                     if env[:2] != '__':
                         add_double_under_scores(env)                            
                     env_dir = dir + env
-                    if not os.path.exists(env_dir):
-                        os.mkdir(env_dir)
+                    # the asset index tells which folders exist already, nothing is checked on the drive
+                    if not asset_index_of_project.has_asset(env, dir):
+                        make_asset_folder(env_dir)
                         self.add_hidden_folders(env_dir)
 
             for env in envs_name:
                 self.make_init_maya_file('geo_hi_env', env)
                 self.make_init_maya_file('geo_low_env', env)
                 #create initial lighting template files
-                self.make_init_maya_file_with_references(env, 'geo_hi_env', 'ligtemp_env')    
+                self.make_init_maya_file_with_references(env, 'geo_hi_env', 'ligtemp_env')
+
+            self.index_new_assets('env', envs_name)
 
 
     def make_file_version(self,dir,file_name):
@@ -899,160 +1088,70 @@ class CG_Project(object):
         '''
         - returns a directory for the Maya animation files
         '''
-        all_shots_dirs = self.get_directories_for_shots_attr
-        
-        shot_dir = ''
-        
-        for dir in all_shots_dirs:
-            if dir.split('/')[2] == 'ANIMATION' and dir.split('/')[3] == 'Finals':
-                shot_dir = dir
-                break
-        
-        return unix_format(shot_dir)
-             
+        return self.role_directory('shot', 'ANIMATION', 'Finals') or ''
+
 
     def get_anim_playblast_dir(self):
         '''
         - returns a directory for the Animation Playblasts movie file
         '''
-        all_shots_dirs = self.get_directories_for_shots_attr
-        
-        shot_dir = ''
-        
-        for dir in all_shots_dirs:
-            if dir.split('/')[2] == 'ANIMATION' and dir.split('/')[3] == 'Playblasts'and dir.split('/')[4] == 'Finals_MOV':
-                shot_dir = dir
-                break
-        
-        return shot_dir
+        return self.role_directory('shot', 'ANIMATION', 'Playblasts', 'Finals_MOV') or ''
 
 
     def get_layout_playblast_dir(self):
         '''
         - returns a directory for the Animation Playblasts movie file
         '''
-        all_shots_dirs = self.get_directories_for_shots_attr
-        
-        shot_dir = ''
-        
-        for dir in all_shots_dirs:
-            if dir.split('/')[2] == 'ANIMATION' and dir.split('/')[3] == 'Playblasts'and dir.split('/')[4] == 'Layouts_MOV':
-                shot_dir = dir
-                break
-
-        return shot_dir
+        return self.role_directory('shot', 'ANIMATION', 'Playblasts', 'Layouts_MOV') or ''
 
 
     def get_layout_shot_dir(self): 
         '''
         - returns a directory for the Maya layout file
         '''
-        all_shots_dirs = self.get_directories_for_shots_attr
-        
-        shot_dir = ''
-        
-        for dir in all_shots_dirs:
-            if dir.split('/')[2] == 'ANIMATION' and dir.split('/')[3] == 'Layouts':
-                shot_dir += dir 
-                break
-         
-        return shot_dir         
-         
+        return self.role_directory('shot', 'ANIMATION', 'Layouts') or ''
+
 
     def get_anim_cache_shot_dir(self): 
         '''
         - returns a directory for the Maya animation file
         '''
-        all_shots_dirs = self.get_directories_for_shots_attr
-        
-        shot_dir = ''
-        
-        for dir in all_shots_dirs:
-            if dir.split('/')[2] == 'ANIMATION' and dir.split('/')[3] == 'Cached':
-                shot_dir = dir
-                break
-        
-        return shot_dir
+        return self.role_directory('shot', 'ANIMATION', 'Cached') or ''
 
 
     def get_lighting_shot_dir(self): 
         '''
         - returns a directory for the Maya lighting file
         '''
-        all_shots_dirs = self.get_directories_for_shots_attr
-        
-        shot_dir = ''
-        
-        for dir in all_shots_dirs:
-            if dir.split('/')[2] == 'LIGHTING' :
-                shot_dir += dir 
-                break
-         
-        return shot_dir         
-         
+        return self.role_directory('shot', 'LIGHTING') or ''
+
 
     def get_rendering_shot_dir(self): 
         '''
         - returns a directory for the Maya rendering file
         '''
-        all_shots_dirs = self.get_directories_for_shots_attr
-        
-        shot_dir = ''
-        
-        for dir in all_shots_dirs:
-            if dir.split('/')[2] == 'RENDERING' :
-                shot_dir += dir
-                break
-         
-        return shot_dir 
+        return self.role_directory('shot', 'RENDERING') or ''
 
 
     def get_geo_shot_dir(self): 
         '''
         - returns a directory for the shot-based Maya model file
         '''
-        all_shots_dirs = self.get_directories_for_shots_attr
-        
-        shot_dir = ''
-        
-        for dir in all_shots_dirs:
-            if dir.split('/')[2] == 'MODEL' :
-                shot_dir += dir 
-                break
-         
-        return shot_dir            
+        return self.role_directory('shot', 'MODEL') or ''
 
 
     def get_vfx_shot_dir(self): 
         '''
         - returns a directory for the Maya vfx file
         '''
-        all_shots_dirs = self.get_directories_for_shots_attr
-        
-        shot_dir = ''
-        
-        for dir in all_shots_dirs:
-            if dir.split('/')[2] == 'VFX' and dir.split('/')[3] == 'SHOTS': 
-                shot_dir += dir 
-                break
-         
-        return shot_dir         
+        return self.role_directory('shot', 'VFX', 'SHOTS') or ''
 
 
     def get_vfx_cache_shot_dir(self): 
         '''
         - returns a directory for the Maya vfx file
         '''
-        all_shots_dirs = self.get_directories_for_shots_attr
-        
-        shot_dir = ''
-        
-        for dir in all_shots_dirs:
-            if dir.split('/')[2] == 'VFX' and dir.split('/')[3] == 'Cached': 
-                shot_dir += dir 
-                break
-         
-        return shot_dir   
+        return self.role_directory('shot', 'VFX', 'Cached') or ''
 
 
     def get_shot_file_dir(self, type, scn_number, shot_number): 
@@ -1060,7 +1159,7 @@ class CG_Project(object):
         - returns a directory for the given scene-shot Maya animation file
         - 'type' should be the keys of the self.maya_shot_directories_dict
         '''
-        parent_directory = eval(self.maya_shot_directories_dict.get(type))
+        parent_directory = self.maya_directory(type)
       
         shot_dir = parent_directory + 'SCENE_{0}/__Shot_{1}/'.format(str(scn_number), str(shot_number))        
   
@@ -1088,61 +1187,56 @@ class CG_Project(object):
         '''
         - this function generates empty maya files for all the shots based on the given dictionary of scene-shots
         - 'dict_scene_shot' is an argument of dict type
+        - the files are written by empty_maya_template, configuration.shot_file_materialization picks the method
+        - an existing file is left untouched
+        - returns the stats of the written files, which include the bytes and system calls saved compared with plain copies,
+          they're printed when configuration.shot_file_report is on
+        - with configuration.lazy_shot_files, the files are only recorded in the project manifest,
+          each of them is created from the template when it's first opened, referenced or versioned
         '''
-        empty_maya_file = windows_format(current_python_file_directory + '/empty.ma')
+        if configuration.lazy_shot_files:
+            if self.manifest.add_lazy_shot_files(self.shot_file_patterns(), dict_scene_shot):
+                self.manifest.save()
+            return template_files.new_stats()
 
-        for scn_number, shot_amount in dict_scene_shot.iteritems():          
-            
-            for shot_number in range(shot_amount):
-
-                anim_shot_file          =   self.make_maya_shot_file_strings('anim_',       scn_number, (shot_number+1))
-                layout_shot_file        =   self.make_maya_shot_file_strings('layout_',     scn_number, (shot_number+1))
-                vfx_shot_file           =   self.make_maya_shot_file_strings('vfx_',        scn_number, (shot_number+1))
-                render_shot_file        =   self.make_maya_shot_file_strings('render_',     scn_number, (shot_number+1))
-                light_shot_file         =   self.make_maya_shot_file_strings('light_',      scn_number, (shot_number+1))
-                geo_shot_file           =   self.make_maya_shot_file_strings('geo_',        scn_number, (shot_number+1))
-                anim_cache_shot_file    =   self.make_maya_shot_file_strings('anim_cache_', scn_number, (shot_number+1))
-                vfx_cache_shot_file     =   self.make_maya_shot_file_strings('vfx_cache_',  scn_number, (shot_number+1))
-
-                if not os.path.isfile(anim_shot_file):
-                    shutil.copyfile(empty_maya_file, anim_shot_file)
-                else:
-                    pass
+        stats = empty_maya_template.materialize_files(self.shot_file_paths(dict_scene_shot), self.on_file_written())
+        if configuration.shot_file_report:
+            print template_files.format_stats(stats)
+        return stats
 
-                if not os.path.isfile(layout_shot_file):
-                    shutil.copyfile(empty_maya_file, layout_shot_file)
-                else:
-                    pass                    
 
-                if not os.path.isfile(vfx_shot_file):
-                    shutil.copyfile(empty_maya_file, vfx_shot_file)
-                else:
-                    pass                    
+    def shot_file_paths(self, dict_scene_shot):
+        '''
+        - returns the paths of all the maya shot files of the given dictionary of scene-shots, whether they're on disk or not
+        '''
+        shot_files = []
+        for shot_dir, patterns in self.shot_file_patterns().iteritems():
+            for scn_number, shot_amount in dict_scene_shot.iteritems():
+                for shot_number in range(1, shot_amount + 1):
+                    folder_dir = shot_dir + 'SCENE_{0}/__Shot_{1}/'.format(str(scn_number), str(shot_number))
+                    for pattern in patterns:
+                        shot_files.append(folder_dir + pattern.format(str(scn_number), str(shot_number)))
+        return shot_files
 
-                if not os.path.isfile(render_shot_file):
-                    shutil.copyfile(empty_maya_file, render_shot_file)      
-                else:
-                    pass                    
-                    
-                if not os.path.isfile(geo_shot_file):
-                    shutil.copyfile(empty_maya_file, geo_shot_file)
-                else:
-                    pass                    
 
-                if not os.path.isfile(anim_shot_file):
-                    shutil.copyfile(empty_maya_file, anim_shot_file)
-                else:
-                    pass                    
+    def lazy_shot_files(self, folder_directory):
+        '''
+        - returns the names of the lazy shot files intended for the given shot folder, whether they're on disk or not
+        '''
+        return self.manifest.lazy_shot_files(folder_directory)
 
-                if not os.path.isfile(anim_cache_shot_file):
-                    shutil.copyfile(empty_maya_file, anim_cache_shot_file)
-                else:
-                    pass                    
 
-                if not os.path.isfile(vfx_cache_shot_file):
-                    shutil.copyfile(empty_maya_file, vfx_cache_shot_file)                                                         
-                else:
-                    pass
+    def materialize_lazy_shot_file(self, file_path):
+        '''
+        - creates an intended lazy shot file from the template, the first time it's used
+        - returns True if the file exists afterwards
+        '''
+        if os.path.isfile(file_path):
+            return True
+        if not self.manifest.is_lazy_shot_file(file_path):
+            return False
+        empty_maya_template.materialize(file_path)
+        return os.path.isfile(file_path)
 
 
     def get_maya_file_dirs(self):
@@ -1240,34 +1334,16 @@ class CG_Project(object):
         self.add_hidden_folders(unix_format(parent_dir) + folder_name)
 
 
-    def make_hidden_folders(self, folder_name):
+    def make_hidden_folders(self, *folder_names):
         '''
         - create a hidden folders for all the 3d assets and shot files
-        - useful for making '___backup' folder and '___script' folder 
-        - can pass 'backup' or 'script' for the 'folder_name'
+        - useful for making '___backup' folder and '___script' folder, both of them are made in one pass when no 'folder_names' is given
+        - can pass 'backup' and/or 'script' for the 'folder_names'
+        - the traversal never descends into the '___' folders and skips the folders that are already hidden
         '''
-        # collect the proper dirs for the 'backup' folder
-        dirs_for_hidden_folders = []
-
-        for path, dirs, files in os.walk(self.project_directory):
-            path = unix_format(path)
-            if path.split('/')[-2][:2] == '__' and path.split('/')[-2][:3] != '___':
-                dirs_for_hidden_folders.append(path) 
-        
-        # create the 'backup' folders in collected dirs above
-
-        for dir in dirs_for_hidden_folders:
-            folder_dir = unix_format(dir) + '___' + folder_name
-            try:
-                
-                os.mkdir(folder_dir)
-            except WindowsError:
-                pass 
-            # hide the folder 
-            if os.path.isdir(folder_dir):               
-                # SetFileAttributesW(unicode(folder_dir), 2) ----> hide the folder
-                # SetFileAttributesW(unicode(folder_dir), 1) ----> unhide the folder
-                ctypes.windll.kernel32.SetFileAttributesW(unicode(folder_dir), 2)
+        if not folder_names:
+            folder_names = ('backup', 'script')
+        return folder_layout.make_hidden_folders(self.project_directory, ['___' + name for name in folder_names], self.on_directory_created())
 
 
     def add_hidden_folders(self, parent_directory):
@@ -1296,7 +1372,7 @@ class CG_Project(object):
         src_dir_filename = current_python_file_directory + '/empty.ma'                    
 
         # the initial geo file name would be something like: geo_hi_char_charname.ma
-        dst_dir_filename = eval(self.maya_asset_directories_dict.get(file_type)) + object_name + '/{}_{}.ma'.format(file_type, str(remove_double_under_scores(object_name)))
+        dst_dir_filename = self.maya_directory(file_type) + object_name + '/{}_{}.ma'.format(file_type, str(remove_double_under_scores(object_name)))
         
         shutil.copyfile(src_dir_filename, dst_dir_filename)
 
@@ -1309,7 +1385,7 @@ class CG_Project(object):
         - it then reference the corresponding maya file into the newly created maya file
         - object_name could refer to the actual name of the asset, such as character name, props name... etc. 
         '''
-        src_file = eval(self.maya_asset_directories_dict.get(src_file_type)) + object_name + '/{}_{}.ma'.format(src_file_type, str(remove_double_under_scores(object_name)))
+        src_file = self.maya_directory(src_file_type) + object_name + '/{}_{}.ma'.format(src_file_type, str(remove_double_under_scores(object_name)))
         dst_file = self.make_init_maya_file(dst_file_type, object_name)
         
         add_maya_reference_file_mel(src_file, dst_file)
@@ -1329,48 +1405,22 @@ class CG_Project_Edit(CG_Project):
         # override the original 'self.dict_amount'    
         self.dict_amount = self.get_current_scene_shot_dict()
         # pass the newly overrided 'self.dict_amount' attribute to the parent class's '__init__'
-        CG_Project.__init__(self, project_name, self.dict_amount)
+        # the project is opened from its manifest if there's one, otherwise it's walked once and the manifest is recorded
+        CG_Project.__init__(self, project_name, self.dict_amount, drive, open_existing=True)
         #self.get_directories_for_shots_attr = self.get_directories_for_shots()
         #self.get_directories_for_assets_attr = self.get_directories_for_assets()
                
 
     def get_current_scene_shot_dict(self, *get_dict): 
+        '''
+        - returns the current scene-shot table when get_dict is given, otherwise an empty dictionary
+        - the table comes from the shot inventory, which is only checked against the disk at this point, see shot_inventory()
+        '''
         if get_dict:
-            self.shot_dirs = self.get_directories_for_shots()
-            if self.shot_dirs == []: 
+            inventory = self.shot_inventory()
+            if self.get_directories_for_shots_attr == []: 
                 return None
-            else:
-                # any path that inside the shot_dirs should help the calculation of scene-shots 
-                # so just use the first path for calculation 
-                dir = self.shot_dirs[0] 
-                # collect the scene numbers 
-                self.scenes = os.listdir(dir)   
-                self.scene_shot_dict = {}
-                
-                try: 
-                    for current_scene in self.scenes:
-                        num = current_scene.split('_')[-1]
-                        
-                        # collect shot amounts from current scene                    
-                        try:      
-                            amounts = []
-                            for current_shot in os.listdir(dir + current_scene):     
-                                # current_shot is the exact shot folder "__Shot_#"
-                                # extract the end digits from the folder name 
-
-                                shot = current_shot.split('_')[-1]        
-
-                                # collect above digitl into a list 
-                                amounts.append(int(shot))
-                            # sort the elements inside the "amount" list 
-                            amounts.sort() 
-                            # the last element of the list should be the exact number of amount 
-                            self.scene_shot_dict[int(num)] = int(amounts[-1])
-                        except IndexError:
-                            pass 
-                    return self.scene_shot_dict         
-                except IndexError:
-                    pass 
+            return inventory.scene_shot_dict()
         else:
             return {}
 
@@ -1384,6 +1434,8 @@ class main_gui(QWidget):
     
     def __init__(self, parent = None):
         super(main_gui, self).__init__(parent)
+        # the stages of the startup are marked on the timer of the app, see finish_startup()
+        self.startup_timer = startup_timer
 
         self.main_layout = QVBoxLayout()
         
@@ -1471,13 +1523,20 @@ class main_gui(QWidget):
         self.select_drive_combo_box = QComboBox()
         self.select_drive_combo_box.setFixedWidth(47*desktop_scaled)       
 
-        # clear and populate drive letters into the combox
+        # the drives are probed in background and added as they answer, see start_drive_enumeration()
         self.select_drive_combo_box.clear()
-        self.drive_list = get_drives_letters()
-        self.select_drive_combo_box.addItems(self.drive_list)
+        self.drive_list = []
         
+        # the project lists of the drives, kept between sessions
+        self.project_list_cache = project_discovery.Project_List_Cache(configuration.project_list_ttl, configuration.project_list_cache_file)
+        # the drive and the projects the project combo box was last filled with
+        self.listed_projects = None
+        # the drives are probed for their projects on a pool of their own, so a slow drive never freezes the window,
+        # and switching tabs, which cancels the scans of the views, never cancels a probe
+        self.project_list_pool = populate_workers.Populate_Pool(1, self)
+
         # emit a signal when switching drives
-        self.select_drive_combo_box.currentIndexChanged.connect(lambda:self.update_combo_box_list())
+        self.select_drive_combo_box.currentIndexChanged.connect(lambda:self.show_drive_projects())
         
         self.project_name_line_edit = QLineEdit()
         self.project_name_line_edit.setFixedWidth(170*desktop_scaled) 
@@ -1488,8 +1547,8 @@ class main_gui(QWidget):
         self.create_project_button = QPushButton('Create Project')
         self.create_project_button.setFixedWidth(171*desktop_scaled)  
         self.create_project_button.setFixedHeight(24*desktop_scaled) 
+        # the project is created in background, set_to_newly_created_project() is called when the job succeeded
         self.create_project_button.clicked.connect(lambda: self.create_project())
-        self.create_project_button.clicked.connect(lambda: self.set_to_newly_created_project())
         self.create_project_button.clicked.connect(lambda: self.project_name_line_edit.clear())
         self.create_project_button.clicked.connect(lambda: self.scene_line_edit.clear())
         self.create_project_button.clicked.connect(lambda: self.shot_line_edit.clear())        
@@ -1514,6 +1573,7 @@ class main_gui(QWidget):
         self.refresh_button.setFixedHeight(24*desktop_scaled)
 
         #self.refresh_button.clicked.connect(lambda: self.get_current_project())  
+        self.refresh_button.clicked.connect(lambda: self.probe_drive_projects(True))
         self.refresh_button.clicked.connect(lambda: self.eval_get_current_project())
         self.refresh_button.clicked.connect(lambda: self.refresh_current_ui())
 
@@ -1552,6 +1612,7 @@ class main_gui(QWidget):
         self.init_scene_layout.addWidget(self.scene_line_edit)        
         self.init_scene_layout.addWidget(self.shot_line_edit) 
         self.init_scene_layout.addWidget(self.record_button) 
+        self.startup_timer.mark('project bar built')
  
         # container that holds the UI widgets in "create_shot_tab"
         self.create_shot_tab_widgets = {}
@@ -1563,64 +1624,250 @@ class main_gui(QWidget):
         self.create_asset_tab_widgets = {}        
  
         
-        self.folder_type_directories_dict = {   'Character_Design':             'self.current_project.get_char_design_dir()',
-                                                'Props_Design':                 'self.current_project.get_props_design_dir()',
-                                                'Environment_Design':           'self.current_project.get_env_design_dir()',
-                                                '2D_Continuities':              'self.current_project.get_2d_continuities_dir()',
-
-                                                'Model':                        'self.current_project.get_geo_shot_dir()',
-                                                'Layout':                       'self.current_project.get_layout_shot_dir()',
-                                                'Layout_MOV':                   'self.current_project.get_layout_playblast_dir()',
-                                                'Animation':                    'self.current_project.get_anim_shot_dir()',
-                                                'Animation_MOV':                'self.current_project.get_anim_playblast_dir()',
-                                                'Anim_Cache':                   'self.current_project.get_anim_cache_shot_dir()',
-                                                'Lighting':                     'self.current_project.get_lighting_shot_dir()',
-                                                'VFX':                          'self.current_project.get_vfx_shot_dir()',
-                                                'VFX_Cache':                    'self.current_project.get_vfx_cache_shot_dir()',
-                                                'Rendering':                    'self.current_project.get_rendering_shot_dir()',
-
-                                                'CHARACTER_SHADER':             'self.current_project.get_char_shader_dir()', 
-                                                'COMPONENT_SHADER':             'self.current_project.get_env_shader_dir()', 
-                                                'PROPS_SHADER':                 'self.current_project.get_props_shader_dir()', 
-                                                'PROPS_TEXTURE':                'self.current_project.get_props_texture_dir()', 
-                                                'COMPONENT_TEXTURE':            'self.current_project.get_env_texture_dir()', 
-                                                'CHARACTER_TEXTURE':            'self.current_project.get_char_texture_dir()',
-                                                'HIGH-RESOLUTION_CHARACTER':    'self.current_project.get_char_hiGeo_dir()', 
-                                                'HIGH-RESOLUTION_COMPONENT':    'self.current_project.get_com_hiGeo_dir()', 
-                                                'HIGH-RESOLUTION_ENVIRONMENT':  'self.current_project.get_env_hiGeo_dir()', 
-                                                'HIGH-RESOLUTION_PROPS':        'self.current_project.get_props_hiGeo_dir()', 
-                                                'LOW-RESOLUTION_CHARACTER':     'self.current_project.get_char_lowGeo_dir()', 
-                                                'LOW-RESOLUTION_COMPONENT':     'self.current_project.get_com_lowGeo_dir()', 
-                                                'LOW-RESOLUTION_ENVIRONMENT':   'self.current_project.get_env_lowGeo_dir()', 
-                                                'LOW-RESOLUTION_PROPS':         'self.current_project.get_props_lowGeo_dir()',             
-                                                'RIGGED_CHARACTER':             'self.current_project.get_char_rig_dir()', 
-                                                'RIGGED_PROPS':                 'self.current_project.get_props_rig_dir()', 
-                                                'DEFORMED_CHARACTER':           'self.current_project.get_char_def_dir()', 
-                                                'DEFORMED_PROPS':               'self.current_project.get_props_def_dir()',  
-                                                'TEMPLATE_CHARACTER':           'self.current_project.get_char_light_template_dir()', 
-                                                'TEMPLATE_ENVIRONMENT':         'self.current_project.get_env_light_template_dir()',
-                                                'TEMPLATE_RENDERING':           'self.current_project.get_render_template_dir()'     } 
-
-        # create elements for DESIGN section 
+        # the folder types and the getters of their directories in the current project, see folder_type_directory()
+        self.folder_type_directories_dict = {   'Character_Design':             'get_char_design_dir',
+                                                'Props_Design':                 'get_props_design_dir',
+                                                'Environment_Design':           'get_env_design_dir',
+                                                '2D_Continuities':              'get_2d_continuities_dir',
+
+                                                'Model':                        'get_geo_shot_dir',
+                                                'Layout':                       'get_layout_shot_dir',
+                                                'Layout_MOV':                   'get_layout_playblast_dir',
+                                                'Animation':                    'get_anim_shot_dir',
+                                                'Animation_MOV':                'get_anim_playblast_dir',
+                                                'Anim_Cache':                   'get_anim_cache_shot_dir',
+                                                'Lighting':                     'get_lighting_shot_dir',
+                                                'VFX':                          'get_vfx_shot_dir',
+                                                'VFX_Cache':                    'get_vfx_cache_shot_dir',
+                                                'Rendering':                    'get_rendering_shot_dir',
+
+                                                'CHARACTER_SHADER':             'get_char_shader_dir', 
+                                                'COMPONENT_SHADER':             'get_env_shader_dir', 
+                                                'PROPS_SHADER':                 'get_props_shader_dir', 
+                                                'PROPS_TEXTURE':                'get_props_texture_dir', 
+                                                'COMPONENT_TEXTURE':            'get_env_texture_dir', 
+                                                'CHARACTER_TEXTURE':            'get_char_texture_dir',
+                                                'HIGH-RESOLUTION_CHARACTER':    'get_char_hiGeo_dir', 
+                                                'HIGH-RESOLUTION_COMPONENT':    'get_com_hiGeo_dir', 
+                                                'HIGH-RESOLUTION_ENVIRONMENT':  'get_env_hiGeo_dir', 
+                                                'HIGH-RESOLUTION_PROPS':        'get_props_hiGeo_dir', 
+                                                'LOW-RESOLUTION_CHARACTER':     'get_char_lowGeo_dir', 
+                                                'LOW-RESOLUTION_COMPONENT':     'get_com_lowGeo_dir', 
+                                                'LOW-RESOLUTION_ENVIRONMENT':   'get_env_lowGeo_dir', 
+                                                'LOW-RESOLUTION_PROPS':         'get_props_lowGeo_dir',             
+                                                'RIGGED_CHARACTER':             'get_char_rig_dir', 
+                                                'RIGGED_PROPS':                 'get_props_rig_dir', 
+                                                'DEFORMED_CHARACTER':           'get_char_def_dir', 
+                                                'DEFORMED_PROPS':               'get_props_def_dir',  
+                                                'TEMPLATE_CHARACTER':           'get_char_light_template_dir', 
+                                                'TEMPLATE_ENVIRONMENT':         'get_env_light_template_dir',
+                                                'TEMPLATE_RENDERING':           'get_render_template_dir'     } 
+
+        # the sections are built the first time they're shown, see build_section()
         self.design_categories = ['Character_Design', 'Props_Design', 'Environment_Design', '2D_Continuities']
-        
-        for single_design_tab in self.design_categories:
-            design_type = single_design_tab
-            treeView1 = single_design_tab + '_treeView1'
-            model1 = single_design_tab + '_model1'
-            treeView2 = single_design_tab + '_treeView2'
-            model2 = single_design_tab + '_model2'
-            lineEdit = single_design_tab + '_line_edit'            
-            button1 = single_design_tab + '_button1'
-            button2 = single_design_tab + '_button2'            
-            self.create_design_tab(design_type, self.design_widget, treeView1, model1, treeView2, model2, lineEdit, button1, button2)            
-
-        self.create_design_tab_widgets['Character_Design_treeView2']    .doubleClicked.connect  (lambda: self.open_file_in_design_tabs('Character_Design'))
-        self.create_design_tab_widgets['Props_Design_treeView2']        .doubleClicked.connect  (lambda: self.open_file_in_design_tabs('Props_Design'))
-        self.create_design_tab_widgets['Environment_Design_treeView2']  .doubleClicked.connect  (lambda: self.open_file_in_design_tabs('Environment_Design'))
-        self.create_design_tab_widgets['2D_Continuities_treeView2']     .doubleClicked.connect  (lambda: self.open_file_in_design_tabs('2D_Continuities'))
+        self.shot_categories = ['Model', 'Layout', 'Layout_MOV', 'Animation', 'Animation_MOV', 'Anim_Cache', 'Lighting', 'VFX', 'VFX_Cache', 'Rendering']
+        self.section_builders = { 0: ('design', self.build_design_section),
+                                  1: ('asset', self.build_asset_section),
+                                  2: ('shot', self.build_shot_section) }
+        self.built_sections = set()
 
-        self.create_design_tab_widgets['Character_Design_button1']      .clicked.connect        (lambda: self.create_folder_button('Character_Design',       self.create_design_tab_widgets))
+        # show the version information 
+        self.about_app_widget = QWidget()
+        self.about_app_widget.setFixedHeight(30*desktop_scaled)
+        self.about_app_widget.setFixedWidth(1077*desktop_scaled)
+
+        self.about_app_layout = QHBoxLayout(self.about_app_widget)
+        self.about_app_layout.setAlignment(Qt.AlignCenter)
+    
+        self.ver_info_label = QLabel(ver_info)
+        self.ver_info_label.setAlignment(Qt.AlignCenter)
+        self.author_info_label = QLabel(author_info)
+        self.author_info_label.setAlignment(Qt.AlignCenter)
+        
+        self.about_app_layout.addWidget(self.author_info_label)
+        self.about_app_layout.addWidget(self.ver_info_label)        
+        
+        self.main_layout.addWidget(self.about_app_widget)
+        
+        # set the miscellaneous attributes
+        self.setFixedHeight(1007*desktop_scaled)
+        self.setFixedWidth(1077*desktop_scaled)
+
+        self.setLayout(self.main_layout)
+
+        self.setWindowFlags(Qt.Window)
+        self.setWindowTitle('PROJECT FILE MANAGER')
+        
+        # the tabs are populated by these callables, looked up by the indexes of the current tabs, see refresh_current_ui()
+        self.refresh_design_tabs_dict = { 0:        partial(self.populate_items_in_design_tab, "Character_Design"), 
+                                          1:        partial(self.populate_items_in_design_tab, "Props_Design"),
+                                          2:        partial(self.populate_items_in_design_tab, "Environment_Design"),
+                                          3:        partial(self.populate_items_in_design_tab, "2D_Continuities") }        
+
+        self.refresh_shot_tabs_dict = {   0:        partial(self.populate_items_in_shot_tab, "Model"),
+                                          1:        partial(self.populate_items_in_shot_tab, "Layout"),
+                                          2:        partial(self.populate_items_in_shot_tab, "Layout_MOV"),
+                                          3:        partial(self.populate_items_in_shot_tab, "Animation"),
+                                          4:        partial(self.populate_items_in_shot_tab, "Animation_MOV"),
+                                          5:        partial(self.populate_items_in_shot_tab, "Anim_Cache"),    
+                                          6:        partial(self.populate_items_in_shot_tab, "Lighting"),
+                                          7:        partial(self.populate_items_in_shot_tab, "VFX"),
+                                          8:        partial(self.populate_items_in_shot_tab, "VFX_Cache"),
+                                          9:        partial(self.populate_items_in_shot_tab, "Rendering") }
+        
+        self.refresh_asset_tabs_dict = {  (0,0):    self.populate_asset_model_char_tab,
+                                          (0,1):    self.populate_asset_model_component_tab,
+                                          (0,2):    self.populate_asset_model_environment_tab,
+                                          (0,3):    self.populate_asset_model_props_tab,
+                                          (1,0):    self.populate_asset_rig_char_tab,
+                                          (1,1):    self.populate_asset_rig_props_tab,
+                                          (2,0):    self.populate_asset_shader_tab,
+                                          (2,1):    self.populate_asset_texture_tab,
+                                          (3,0):    partial(self.populate_items_in_asset_tab, "TEMPLATE_CHARACTER"),
+                                          (3,1):    partial(self.populate_items_in_asset_tab, "TEMPLATE_ENVIRONMENT"),
+                                          (3,2):    partial(self.populate_items_in_asset_tab, "TEMPLATE_RENDERING") }
+
+        self.refresh_ui_dict = { 0: lambda: self.refresh_design_tabs_dict.get(self.get_design_tabs_current_index()),
+                                 1: lambda: self.refresh_asset_tabs_dict.get(self.get_asset_stacked_layout_current_index()),
+                                 2: lambda: self.refresh_shot_tabs_dict.get(self.get_shots_tabs_current_index()) }
+
+
+        self.current_project = None
+        # the Project_Job currently creating a project or adding scene-shot folders, only one runs at a time
+        self.project_job = None
+        # the directory scans of the views run on a thread pool, see populate_workers.Populate_Pool
+        self.populate_pool = populate_workers.Populate_Pool(configuration.populate_threads, self)
+        # the clicks of the views are routed to their current folder type and directory, see view_events.Click_Router
+        self.click_router = view_events.Click_Router(configuration.click_debounce_ms, self)
+        # the changes seen by the directory watchers are applied to the file and history views row by row, see change_events.View_Updater
+        self.view_updater = change_events.View_Updater()
+        # {<watched directory>: Track_Directory}, see watch_directory(), the stopped ones are kept until their thread finishes
+        self.directory_watchers = {}
+        self.stopped_watchers = set()
+        # the index of the files of the current project searched by the quick-open palette, see show_quick_open(),
+        # it's built on a pool of its own, so the walk of the whole project never holds up the scans of the views
+        self.quick_open_index = None
+        self.quick_open_dialog = None
+        self.quick_open_pool = populate_workers.Populate_Pool(1, self)
+        # the folder trees are revalidated and listed on a pool of their own, see populate_hierarchical_folders_into_qtreeview(),
+        # its single thread runs them in order, so a tree is never listed from a structure that's still being revalidated
+        self.folder_tree_pool = populate_workers.Populate_Pool(1, self)
+        self.quick_open_shortcut = QShortcut(QKeySequence(configuration.quick_open_shortcut), self)
+        self.quick_open_shortcut.activated.connect(self.show_quick_open)
+        # the thumbnails of the images of the 2D drawings are made on a pool of their own and kept on disk, see thumbnail_cache
+        self.thumbnail_loader = thumbnail_cache.Thumbnail_Loader(thumbnail_cache.Thumbnail_Cache(configuration.thumbnail_cache_directory,
+                                                                                                 configuration.thumbnail_size),
+                                                                 configuration.thumbnail_threads, img_exts, self)
+
+        # the section shown first, the directory watcher and the drive probes wait until the window is on screen, see finish_startup()
+        self.startup_timer.mark('window built')
+        self.startup_finished = False
+
+
+    def paintEvent(self, event):
+        QWidget.paintEvent(self, event)
+        if not self.startup_finished:
+            self.startup_finished = True
+            self.startup_timer.mark('first paint')
+            QTimer.singleShot(0, self.finish_startup)
+
+
+    def finish_startup(self):
+        '''
+        - runs once, right after the first paint of the window: builds the section shown, then starts the directory watcher
+          and the drive probes
+        - prints the startup timing report when configuration.startup_report is on, see startup_timing.Startup_Timer
+        '''
+        self.build_section(self.get_main_stacked_layout_current_index())
+        self.startup_timer.mark('interactive')
+
+        self.watch_directory(configuration.watch_directory)
+
+        self.start_drive_enumeration()
+        self.startup_timer.mark('watcher and drive probes started')
+        if configuration.startup_report:
+            print self.startup_timer.format_report()
+
+
+    def watch_directory(self, directory):
+        '''
+        - starts a Track_Directory on the given directory, unless it's inside a directory watched already
+        - every change it sees drops the cached discovery results that depend on it, then it's applied to the views that show it
+        '''
+        directory = unix_format(directory)
+        if any(directory.startswith(watched_directory) for watched_directory in self.directory_watchers):
+            return
+        watcher = Track_Directory(directory)
+        watcher.changed.connect(lambda file_type, path, action: project_cache.invalidate_path(path))
+        # the models of the views are changed on the gui thread, the slots of the window are queued to it
+        watcher.changed.connect(self.update_views)
+        watcher.changed.connect(self.update_asset_index)
+        watcher.changed.connect(self.update_quick_open_index)
+        self.directory_watchers[directory] = watcher
+        watcher.start()
+
+
+    def watch_project_directory(self, directory):
+        '''
+        - watches the directory of the current project, the watcher of the project shown before is stopped,
+          the one of configuration.watch_directory is kept
+        '''
+        directory = unix_format(directory)
+        for watched_directory in list(self.directory_watchers):
+            if watched_directory not in (directory, unix_format(configuration.watch_directory)):
+                watcher = self.directory_watchers.pop(watched_directory)
+                self.stopped_watchers.add(watcher)
+                watcher.finished.connect(partial(self.stopped_watchers.discard, watcher))
+                watcher.stop()
+        self.watch_directory(directory)
+
+
+    def update_views(self, file_type, path, action):
+        '''
+        - applies a change seen by a directory watcher to the file and history views that show its directory
+        '''
+        self.view_updater.apply(file_type, path, action)
+
+
+    def update_asset_index(self, file_type, path, action):
+        '''
+        - applies a change seen by a directory watcher to the asset index of the current project, see CG_Project.asset_path_changed()
+        '''
+        if self.current_project != None:
+            self.current_project.asset_path_changed(path)
+
+
+    def build_section(self, index):
+        '''
+        - builds the widgets of the section at the given index of the main stacked layout, unless they're built already
+        - 0 is the design section, 1 the asset section, 2 the shot section, see section_builders
+        '''
+        if index in self.built_sections or index not in self.section_builders:
+            return
+        self.built_sections.add(index)
+        section_name, build = self.section_builders[index]
+        build()
+        self.startup_timer.mark(section_name + ' section built')
+
+
+    def build_design_section(self):
+        for single_design_tab in self.design_categories:
+            design_type = single_design_tab
+            treeView1 = single_design_tab + '_treeView1'
+            model1 = single_design_tab + '_model1'
+            treeView2 = single_design_tab + '_treeView2'
+            model2 = single_design_tab + '_model2'
+            lineEdit = single_design_tab + '_line_edit'            
+            button1 = single_design_tab + '_button1'
+            button2 = single_design_tab + '_button2'            
+            self.create_design_tab(design_type, self.design_widget, treeView1, model1, treeView2, model2, lineEdit, button1, button2)            
+
+        self.create_design_tab_widgets['Character_Design_treeView2']    .doubleClicked.connect  (lambda: self.open_file_in_design_tabs('Character_Design'))
+        self.create_design_tab_widgets['Props_Design_treeView2']        .doubleClicked.connect  (lambda: self.open_file_in_design_tabs('Props_Design'))
+        self.create_design_tab_widgets['Environment_Design_treeView2']  .doubleClicked.connect  (lambda: self.open_file_in_design_tabs('Environment_Design'))
+        self.create_design_tab_widgets['2D_Continuities_treeView2']     .doubleClicked.connect  (lambda: self.open_file_in_design_tabs('2D_Continuities'))
+
+        self.create_design_tab_widgets['Character_Design_button1']      .clicked.connect        (lambda: self.create_folder_button('Character_Design',       self.create_design_tab_widgets))
         self.create_design_tab_widgets['Props_Design_button1']          .clicked.connect        (lambda: self.create_folder_button('Props_Design',           self.create_design_tab_widgets))
         self.create_design_tab_widgets['Environment_Design_button1']    .clicked.connect        (lambda: self.create_folder_button('Environment_Design',     self.create_design_tab_widgets))
         self.create_design_tab_widgets['2D_Continuities_button1']       .clicked.connect        (lambda: self.create_folder_button('2D_Continuities',        self.create_design_tab_widgets))                        
@@ -1632,19 +1879,20 @@ class main_gui(QWidget):
 
         self.refresh_tabwidget(self.design_widget)
 
-        # create elements for ASSET section
+
+    def build_asset_section(self):
         self.dict_asset = {'1_MODEL':       ['CHARACTER', 'PROPS', 'COMPONENT', 'ENVIRONMENT'],
                            '2_RIG':         ['CHARACTER', 'PROPS'],
                            '3_SURFACING':   ['SHADER', 'TEXTURE'],
                            '4_TEMPLATES':   ['CHARACTER', 'ENVIRONMENT','RENDERING']}     
-                                  
+
         self.dict_asset_file_utility_widgets = self.create_asset_buttons_widgets(self.asset_widget, self.dict_asset )
 
         for asset_type in self.dict_asset_file_utility_widgets.keys():
             if asset_type == '1_MODEL':
                 # self.dict_asset_file_utility_widgets[asset_type] is a sub-level dictionary
                 for sub_type in self.dict_asset_file_utility_widgets[asset_type].keys():
-                    
+
                     # self.dict_asset_file_utility_widgets[asset_type][sub_type] should return a desired parent layout
                     parent_layout = self.dict_asset_file_utility_widgets[asset_type][sub_type] 
 
@@ -1706,7 +1954,7 @@ class main_gui(QWidget):
                     treeView3   = sub_type + '_treeView3'
                     model3      = sub_type + '_model3'                                        
                     self.asset_file_section(treeView1, model1, treeView2, model2, treeView3, model3, parent_layout, section_names, 670)
-                    
+
                     lineEdit1   = '3_SURFACING_' + sub_type + '_lineEdit1'
                     button1     = '3_SURFACING_' + sub_type + '_button1' 
                     button2     = '3_SURFACING_' + sub_type + '_button2' 
@@ -1774,7 +2022,7 @@ class main_gui(QWidget):
         self.create_asset_tab_widgets['3_SURFACING_SHADER_button4']                 .clicked.connect    ( lambda: self.set_active(self.create_asset_tab_widgets, 'CHARACTER_SHADER',                  'COMPONENT_SHADER',     'PROPS_SHADER'))
         self.create_asset_tab_widgets['4_TEMPLATES_CHARACTER_button4']              .clicked.connect    ( lambda: self.set_active(self.create_asset_tab_widgets, 'TEMPLATE_CHARACTER'))        
         self.create_asset_tab_widgets['4_TEMPLATES_ENVIRONMENT_button4']            .clicked.connect    ( lambda: self.set_active(self.create_asset_tab_widgets, 'TEMPLATE_ENVIRONMENT'))
-        
+
         self.create_asset_tab_widgets['1_MODEL_CHARACTER_button5']                  .clicked.connect    ( lambda: self.reference_maya_file_button(self.create_asset_tab_widgets, 'HIGH-RESOLUTION_CHARACTER',         'LOW-RESOLUTION_CHARACTER'))
         self.create_asset_tab_widgets['1_MODEL_PROPS_button5']                      .clicked.connect    ( lambda: self.reference_maya_file_button(self.create_asset_tab_widgets, 'HIGH-RESOLUTION_PROPS',             'LOW-RESOLUTION_PROPS'))
         self.create_asset_tab_widgets['1_MODEL_COMPONENT_button5']                  .clicked.connect    ( lambda: self.reference_maya_file_button(self.create_asset_tab_widgets, 'HIGH-RESOLUTION_COMPONENT',         'LOW-RESOLUTION_COMPONENT'))
@@ -1856,9 +2104,7 @@ class main_gui(QWidget):
         self.create_asset_tab_widgets['TEMPLATE_ENVIRONMENT_treeView3']             .clicked.connect    ( lambda: self.create_asset_tab_widgets['4_TEMPLATES_ENVIRONMENT_button5'].setEnabled(False))
 
 
-        # create elements for SHOT section
-        self.shot_categories = ['Model', 'Layout', 'Layout_MOV', 'Animation', 'Animation_MOV', 'Anim_Cache', 'Lighting', 'VFX', 'VFX_Cache', 'Rendering']
-        
+    def build_shot_section(self):
         for single_shot_tab in self.shot_categories:            
             treeView1   = single_shot_tab + '_treeView1'
             model1      = single_shot_tab + '_model1'
@@ -1874,7 +2120,7 @@ class main_gui(QWidget):
             button4     = single_shot_tab + '_button4'
             button5     = single_shot_tab + '_button5'            
             self.create_shot_tab(single_shot_tab, self.shot_widget, treeView1, model1, treeView2, model2, treeView3, model3, line_edit1, line_edit2, button1, button2, button3, button4, button5)            
-        
+
         self.refresh_tabwidget(self.shot_widget)
 
         self.create_shot_tab_widgets['Animation_button2']           .clicked.connect    ( lambda: self.open_maya_file_button(self.create_shot_tab_widgets, 'Animation'))
@@ -1934,7 +2180,7 @@ class main_gui(QWidget):
         self.create_shot_tab_widgets['Rendering_treeView3']         .clicked.connect    ( lambda: self.create_shot_tab_widgets['Rendering_button3'].setEnabled(False) )
         self.create_shot_tab_widgets['VFX_treeView2']               .clicked.connect    ( lambda: self.create_shot_tab_widgets['VFX_button3'].setEnabled(True) )
         self.create_shot_tab_widgets['VFX_treeView3']               .clicked.connect    ( lambda: self.create_shot_tab_widgets['VFX_button3'].setEnabled(False) )
-        
+
         self.create_shot_tab_widgets['Anim_Cache_treeView2']        .clicked.connect    ( lambda: self.sel_file_activate_button_fx(self.create_shot_tab_widgets['Anim_Cache_button4'],        False,  self.create_shot_tab_widgets['Anim_Cache_button5'],     False))
         self.create_shot_tab_widgets['Anim_Cache_treeView3']        .clicked.connect    ( lambda: self.sel_file_activate_button_fx(self.create_shot_tab_widgets['Anim_Cache_button4'],        False,  self.create_shot_tab_widgets['Anim_Cache_button5'],     False))
         self.create_shot_tab_widgets['VFX_Cache_treeView2']         .clicked.connect    ( lambda: self.sel_file_activate_button_fx(self.create_shot_tab_widgets['VFX_Cache_button4'],         False,  self.create_shot_tab_widgets['VFX_Cache_button5'],      False))
@@ -1947,74 +2193,62 @@ class main_gui(QWidget):
 
         #pprint(self.create_shot_tab_widgets)
 
-        # show the version information 
-        self.about_app_widget = QWidget()
-        self.about_app_widget.setFixedHeight(30*desktop_scaled)
-        self.about_app_widget.setFixedWidth(1077*desktop_scaled)
 
-        self.about_app_layout = QHBoxLayout(self.about_app_widget)
-        self.about_app_layout.setAlignment(Qt.AlignCenter)
-    
-        self.ver_info_label = QLabel(ver_info)
-        self.ver_info_label.setAlignment(Qt.AlignCenter)
-        self.author_info_label = QLabel(author_info)
-        self.author_info_label.setAlignment(Qt.AlignCenter)
-        
-        self.about_app_layout.addWidget(self.author_info_label)
-        self.about_app_layout.addWidget(self.ver_info_label)        
-        
-        self.main_layout.addWidget(self.about_app_widget)
-        
-        # set the miscellaneous attributes
-        self.setFixedHeight(1007*desktop_scaled)
-        self.setFixedWidth(1077*desktop_scaled)
+    def start_drive_enumeration(self):
+        '''
+        - fills the drive combo box progressively, every drive is probed in background, see drive_enumeration.Drive_Enumerator
+        - a drive that doesn't answer within configuration.drive_probe_timeout seconds is listed greyed out as not responding,
+          it's enabled if it answers later and removed if it's offline
+        '''
+        self.drive_enumerator = drive_enumeration.Drive_Enumerator(timeout=configuration.drive_probe_timeout)
+        self.drive_enumerator.start()
+        self.drive_poll_timer = QTimer(self)
+        self.drive_poll_timer.timeout.connect(lambda: self.add_probed_drives())
+        self.drive_poll_timer.start(50)
 
-        self.setLayout(self.main_layout)
 
-        self.setWindowFlags(Qt.Window)
-        self.setWindowTitle('PROJECT FILE MANAGER')
-        
-        self.refresh_design_tabs_dict = { 0:        'self.populate_items_in_design_tab("Character_Design")', 
-                                          1:        'self.populate_items_in_design_tab("Props_Design")',
-                                          2:        'self.populate_items_in_design_tab("Environment_Design")',
-                                          3:        'self.populate_items_in_design_tab("2D_Continuities")' }        
-
-        self.refresh_shot_tabs_dict = {   0:        'self.populate_items_in_shot_tab("Model")',
-                                          1:        'self.populate_items_in_shot_tab("Layout")',
-                                          2:        'self.populate_items_in_shot_tab("Layout_MOV")',
-                                          3:        'self.populate_items_in_shot_tab("Animation")',
-                                          4:        'self.populate_items_in_shot_tab("Animation_MOV")',
-                                          5:        'self.populate_items_in_shot_tab("Anim_Cache")',    
-                                          6:        'self.populate_items_in_shot_tab("Lighting")',
-                                          7:        'self.populate_items_in_shot_tab("VFX")',
-                                          8:        'self.populate_items_in_shot_tab("VFX_Cache")',
-                                          9:        'self.populate_items_in_shot_tab("Rendering")' }
-        
-        self.refresh_asset_tabs_dict = {  (0,0):    'self.populate_asset_model_char_tab()',
-                                          (0,1):    'self.populate_asset_model_component_tab()',
-                                          (0,2):    'self.populate_asset_model_environment_tab()',
-                                          (0,3):    'self.populate_asset_model_props_tab()',
-                                          (1,0):    'self.populate_asset_rig_char_tab()',
-                                          (1,1):    'self.populate_asset_rig_props_tab()',
-                                          (2,0):    'self.populate_asset_shader_tab()',
-                                          (2,1):    'self.populate_asset_texture_tab()',
-                                          (3,0):    'self.populate_items_in_asset_tab("TEMPLATE_CHARACTER")',
-                                          (3,1):    'self.populate_items_in_asset_tab("TEMPLATE_ENVIRONMENT")',
-                                          (3,2):    'self.populate_items_in_asset_tab("TEMPLATE_RENDERING")' }
-
-        self.refresh_ui_dict = { 0: 'self.refresh_design_tabs_dict.get(self.get_design_tabs_current_index())',
-                                 1: 'self.refresh_asset_tabs_dict.get(self.get_asset_stacked_layout_current_index())',
-                                 2: 'self.refresh_shot_tabs_dict.get(self.get_shots_tabs_current_index())' }        
+    def add_probed_drives(self):
+        '''
+        - adds the drives that answered since the last call to the drive combo box, in the order of their letters
+        - a greyed out drive is never left selected, the first responding one is selected instead
+        '''
+        for drive, status in self.drive_enumerator.poll():
+            if status == 'offline':
+                if drive in self.drive_list:
+                    self.select_drive_combo_box.removeItem(self.drive_list.index(drive))
+                    self.drive_list.remove(drive)
+                continue
+            if drive not in self.drive_list:
+                self.drive_list.append(drive)
+                self.drive_list.sort()
+                self.select_drive_combo_box.insertItem(self.drive_list.index(drive), drive)
+            item = self.select_drive_combo_box.model().item(self.drive_list.index(drive))
+            item.setEnabled(status == 'online')
+            item.setToolTip('' if status == 'online' else 'not responding')
 
+        current_item = self.select_drive_combo_box.model().item(self.select_drive_combo_box.currentIndex())
+        if current_item == None or not current_item.isEnabled():
+            online_drives = [drive for drive in self.drive_list if self.drive_enumerator.status.get(drive) == 'online']
+            self.select_drive_combo_box.setCurrentIndex(self.drive_list.index(online_drives[0]) if online_drives else -1)
 
-        self.current_project = None
+        if self.drive_enumerator.is_done() or self.drive_enumerator.elapsed() > configuration.drive_probe_give_up:
+            self.drive_poll_timer.stop()
+            self.startup_timer.mark('drives probed')
+
+
+    def folder_type_directory(self, folder_type):
+        '''
+        - returns the directory of the given folder type in the current project, a key of folder_type_directories_dict
+        - the getters answer from the role tables of the project, so nothing is evaluated or scanned
+        '''
+        return getattr(self.current_project, self.folder_type_directories_dict[folder_type])()
 
-        self.track_project_directory = Track_Directory('p:/mov/')
-        self.track_project_directory.start()
-        
 
     def eval_get_current_project(self):        
         self.current_project = self.get_current_project()
+        if self.current_project != None and self.startup_finished:
+            # the new files of the project show up in its views as they're written
+            self.watch_project_directory(self.current_project.project_directory)
         return self.current_project
 
 
@@ -2054,9 +2288,8 @@ class main_gui(QWidget):
         self.create_design_tab_widgets[treeView2].setFixedWidth(407*desktop_scaled)   
         self.create_design_tab_widgets[treeView2].setSelectionBehavior(QAbstractItemView.SelectRows)
         self.create_design_tab_widgets[treeView2].setSelectionMode(QAbstractItemView.ExtendedSelection)
-        self.create_design_tab_widgets[model2] = QStandardItemModel()
-        self.create_design_tab_widgets[model2].setHorizontalHeaderLabels(['>>> FILE <<<'.upper()])   
-        self.create_design_tab_widgets[treeView2].setModel(self.create_design_tab_widgets[model2])            
+        self.create_design_tab_widgets[model2] = file_list_model.install_file_list_model(self.create_design_tab_widgets[treeView2], '>>> FILE <<<'.upper(),
+                                                                                               self.thumbnail_loader)
         
         self.create_design_tab_widgets[lineEdit] = QLineEdit()
         self.create_design_tab_widgets[lineEdit].setMinimumWidth(177*desktop_scaled)
@@ -2196,7 +2429,7 @@ class main_gui(QWidget):
             self.create_asset_tab_widgets[section+'_'+treeView1].setFixedHeight((high_value-30)/len(section_names)*desktop_scaled)
             self.create_asset_tab_widgets[section+'_'+treeView1].setFixedWidth(277*desktop_scaled)        
             self.create_asset_tab_widgets[section+'_'+treeView1].setSelectionBehavior(QAbstractItemView.SelectRows)
-            self.create_asset_tab_widgets[section+'_'+model1] = QStandardItemModel()
+            self.create_asset_tab_widgets[section+'_'+model1] = Lazy_Folder_Model(self.create_asset_tab_widgets[section+'_'+treeView1].style().standardIcon(QStyle.SP_DirIcon))
             self.create_asset_tab_widgets[section+'_'+model1].setHorizontalHeaderLabels(['>>> {} <<<'.format(section).upper()])
             self.create_asset_tab_widgets[section+'_'+treeView1].setModel(self.create_asset_tab_widgets[section+'_'+model1])
             
@@ -2207,9 +2440,7 @@ class main_gui(QWidget):
             self.create_asset_tab_widgets[section+'_'+treeView2].setFixedHeight((high_value-30)/len(section_names)*desktop_scaled)
             self.create_asset_tab_widgets[section+'_'+treeView2].setFixedWidth(277*desktop_scaled)   
             self.create_asset_tab_widgets[section+'_'+treeView2].setSelectionBehavior(QAbstractItemView.SelectRows)
-            self.create_asset_tab_widgets[section+'_'+model2] = QStandardItemModel()
-            self.create_asset_tab_widgets[section+'_'+model2].setHorizontalHeaderLabels(['>>> File <<<'.upper()])
-            self.create_asset_tab_widgets[section+'_'+treeView2].setModel(self.create_asset_tab_widgets[section+'_'+model2])             
+            self.create_asset_tab_widgets[section+'_'+model2] = file_list_model.install_file_list_model(self.create_asset_tab_widgets[section+'_'+treeView2], '>>> File <<<'.upper())
 
             self.history_widget = QTreeWidget()
             self.history_widget.setFixedHeight((high_value-30)/len(section_names)*desktop_scaled)
@@ -2218,9 +2449,7 @@ class main_gui(QWidget):
             self.create_asset_tab_widgets[section+'_'+treeView3].setFixedHeight((high_value-30)/len(section_names)*desktop_scaled)
             self.create_asset_tab_widgets[section+'_'+treeView3].setFixedWidth(277*desktop_scaled)   
             self.create_asset_tab_widgets[section+'_'+treeView3].setSelectionBehavior(QAbstractItemView.SelectRows)
-            self.create_asset_tab_widgets[section+'_'+model3] = QStandardItemModel()
-            self.create_asset_tab_widgets[section+'_'+model3].setHorizontalHeaderLabels(['>>> History <<<'.upper()])
-            self.create_asset_tab_widgets[section+'_'+treeView3].setModel(self.create_asset_tab_widgets[section+'_'+model3])                           
+            self.create_asset_tab_widgets[section+'_'+model3] = file_list_model.install_file_list_model(self.create_asset_tab_widgets[section+'_'+treeView3], '>>> History <<<'.upper())
             
             self.sub_file_layout.addWidget(self.folder_widget)
             self.sub_file_layout.addWidget(self.file_widget)
@@ -2315,7 +2544,7 @@ class main_gui(QWidget):
         self.create_shot_tab_widgets[treeView1].setFixedWidth(277*desktop_scaled)   
         self.create_shot_tab_widgets[treeView1].setSelectionBehavior(QAbstractItemView.SelectRows)
         self.create_shot_tab_widgets[treeView1].setSelectionMode(QAbstractItemView.ExtendedSelection)
-        self.create_shot_tab_widgets[model1] = QStandardItemModel()
+        self.create_shot_tab_widgets[model1] = Lazy_Folder_Model(self.create_shot_tab_widgets[treeView1].style().standardIcon(QStyle.SP_DirIcon))
         self.create_shot_tab_widgets[model1].setHorizontalHeaderLabels(['>>> {} <<<'.format(shot_type).upper()])   
         self.create_shot_tab_widgets[treeView1].setModel(self.create_shot_tab_widgets[model1])  
         #self.create_shot_tab_widgets[treeView1].doubleClicked.connect(lambda: self.refresh_current_ui())         
@@ -2329,9 +2558,7 @@ class main_gui(QWidget):
         self.create_shot_tab_widgets[treeView2].setFixedWidth(277*desktop_scaled)   
         self.create_shot_tab_widgets[treeView2].setSelectionBehavior(QAbstractItemView.SelectRows)
         self.create_shot_tab_widgets[treeView2].setSelectionMode(QAbstractItemView.ExtendedSelection)
-        self.create_shot_tab_widgets[model2] = QStandardItemModel()
-        self.create_shot_tab_widgets[model2].setHorizontalHeaderLabels(['>>> File <<<'.upper()])   
-        self.create_shot_tab_widgets[treeView2].setModel(self.create_shot_tab_widgets[model2])   
+        self.create_shot_tab_widgets[model2] = file_list_model.install_file_list_model(self.create_shot_tab_widgets[treeView2], '>>> File <<<'.upper())
 
         self.shot_type_history_file_widget = QTreeWidget()
         self.shot_type_history_file_widget.setFixedHeight(730*desktop_scaled)
@@ -2341,9 +2568,7 @@ class main_gui(QWidget):
         self.create_shot_tab_widgets[treeView3].setFixedWidth(277*desktop_scaled)   
         self.create_shot_tab_widgets[treeView3].setSelectionBehavior(QAbstractItemView.SelectRows)
         self.create_shot_tab_widgets[treeView3].setSelectionMode(QAbstractItemView.ExtendedSelection)
-        self.create_shot_tab_widgets[model3] = QStandardItemModel()
-        self.create_shot_tab_widgets[model3].setHorizontalHeaderLabels(['>>> HISTORY <<<'.upper()])   
-        self.create_shot_tab_widgets[treeView3].setModel(self.create_shot_tab_widgets[model3])
+        self.create_shot_tab_widgets[model3] = file_list_model.install_file_list_model(self.create_shot_tab_widgets[treeView3], '>>> HISTORY <<<'.upper())
 
         self.create_shot_tab_widgets[line_edit1] = QLineEdit()
         self.create_shot_tab_widgets[line_edit1].setFixedWidth(170*desktop_scaled) 
@@ -2357,8 +2582,8 @@ class main_gui(QWidget):
         
         self.create_shot_tab_widgets[button1] = QPushButton('Generate Scene-Shot Folders')
         self.create_shot_tab_widgets[button1].setFixedWidth(170*desktop_scaled)    
+        # the folders are generated in background, refresh_current_ui() is called when the job succeeded
         self.create_shot_tab_widgets[button1].clicked.connect(lambda: self.generate_new_scene_shot_folders())
-        self.create_shot_tab_widgets[button1].clicked.connect(lambda: self.refresh_current_ui())
         self.create_shot_tab_widgets[button1].clicked.connect(lambda: self.create_shot_tab_widgets[line_edit1].clear())
         self.create_shot_tab_widgets[button1].clicked.connect(lambda: self.create_shot_tab_widgets[line_edit2].clear())
         
@@ -2426,66 +2651,115 @@ class main_gui(QWidget):
         
     
     def create_project(self):
+        '''
+        - creates the project in background by a Project_Job, the window stays responsive and the job can be cancelled
+        '''
         project_name = self.project_name_line_edit.text()
-        if project_name == '':     
+        if project_name == '' or self.project_job_is_running():     
             return
         else:
             dict_scene_shot = initial_shot_dict()
             if dict_scene_shot == None:
                 dict_scene_shot = {1:1}
-            project = CG_Project(project_name, dict_scene_shot)
-            return project
+            # the drive is read here, the job mustn't touch any widget
+            root_directory = self.select_drive_combo_box.currentText()
+            work = lambda job: CG_Project(project_name, dict_scene_shot, root_directory, job)
+            expected_amount = len(department_layout) + estimate_scene_shot_amount(dict_scene_shot)
 
+            self.start_project_job(work, expected_amount, 'Creating project "{}"'.format(project_name),
+                                   lambda project: self.set_to_newly_created_project(project_name))
 
-    def list_available_projects(self):
-        
-        self.list_to_verify = configuration.Departments.keys()
-        self.list_to_verify.sort()
 
+    def project_job_is_running(self):
+        return self.project_job != None and self.project_job.isRunning()
+
+
+    def start_project_job(self, work, expected_amount, title, on_succeeded):
+        '''
+        - runs the given work by a Project_Job, a progress dialog shows the directories created, files written and the ETA
+        - on_succeeded is called with the result of the work, back on the gui thread
+        '''
+        job = Project_Job(work, expected_amount)
+        progress_dialog = Project_Job_Dialog(job, title, expected_amount, on_succeeded, self.project_job_finished, self)
+        self.project_job = job
+        progress_dialog.show()
+        job.start()
+
+
+    def project_job_finished(self):
+        self.project_job = None
+
+
+    def list_available_projects(self, refresh=False, probe=True):
+        '''
+        - returns the projects on the selected drive, see project_discovery.discover_projects()
+        - the list is cached for configuration.project_list_ttl seconds, refresh probes the drive right away
+        - without probe, the last known list is returned however old it is, or an empty list
+        '''
         self.drive = self.select_drive_combo_box.currentText() 
-        try:
-            self.candidate_list = os.listdir(self.drive)
-        except WindowsError:
-            return
-            
-        self.projects = []
-        
-        for folder in self.candidate_list:
-            try:
-                dir = self.drive + folder
-            except UnicodeEncodeError:
-                pass 
-                
-            if os.path.isdir(dir):
-                try:
-                    sub_folders = os.listdir(dir)
-                    if len(sub_folders) == 10:                        
-                        sub_folders.sort()
-                        if self.list_to_verify == sub_folders:
-                            self.projects.append(folder)
-                except WindowsError :
-                    pass
-        
+        if self.drive == '':
+            return []
+
+        if probe:
+            self.projects = self.project_list_cache.projects(self.drive, configuration.Departments.keys(),
+                                                             configuration.materializer_threads, refresh)
+        else:
+            self.projects = self.project_list_cache.cached(self.drive) or []
         return self.projects           
 
 
-    def update_combo_box_list(self):
-        
+    def show_drive_projects(self):
+        '''
+        - fills the project combo box from the cached project list of the selected drive right away,
+          a stale list is probed in background, see probe_drive_projects()
+        '''
+        self.update_combo_box_list(probe=False)
+        if self.project_list_cache.is_stale(self.select_drive_combo_box.currentText()):
+            self.probe_drive_projects()
+
+
+    def probe_drive_projects(self, refresh=False):
+        '''
+        - probes the selected drive for its projects on the project_list_pool, the combo box is filled again once the probe answered,
+          unless another drive was selected meanwhile
+        - a new probe supersedes the one before, so only the last selected drive is shown
+        '''
+        drive = self.select_drive_combo_box.currentText()
+        if drive == '':
+            return
+
+        def probe():
+            return self.project_list_cache.projects(drive, configuration.Departments.keys(), configuration.materializer_threads, refresh)
+
+        def show_projects(projects):
+            if self.select_drive_combo_box.currentText() == drive:
+                self.update_combo_box_list(probe=False)
+
+        self.project_list_pool.request('project_list', probe, show_projects)
+
+
+    def update_combo_box_list(self, refresh=False, probe=True):
+        '''
+        - fills the project combo box with the projects on the selected drive, see list_available_projects()
+        - nothing is touched when the list didn't change, otherwise the selected project is kept if it still exists
+        '''
+        projects = self.list_available_projects(refresh, probe)
+        if self.listed_projects == (self.drive, projects):
+            return
+        self.listed_projects = (self.drive, projects)
+
+        current_project_name = self.current_project_combo_box.currentText()
         self.current_project_combo_box.clear()
-        
-        projects = self.list_available_projects()
-        
-        try:
-            
-            self.current_project_combo_box.addItems(projects)
-            
-        except TypeError:
-            pass
+        self.current_project_combo_box.addItems(projects)
+        if current_project_name in projects:
+            self.current_project_combo_box.setCurrentIndex(projects.index(current_project_name))
 
 
-    def set_to_newly_created_project(self):
-        self.update_combo_box_list()
-        latest_index = self.current_project_combo_box.count() - 1
+    def set_to_newly_created_project(self, project_name=None):
+        self.update_combo_box_list(True)
+        latest_index = self.current_project_combo_box.findText(project_name) if project_name else -1
+        if latest_index == -1:
+            latest_index = self.current_project_combo_box.count() - 1
 
         self.current_project_combo_box.setCurrentIndex(latest_index)
 
@@ -2501,54 +2775,68 @@ class main_gui(QWidget):
             return None
         
         
-    def update_scene_shot_dict(self):
-        #current_project = self.get_current_project()
-        new_scene_shot_dict = {}
-        if self.current_project != None:
-
-            current_scene_shot_dict = self.current_project.get_current_scene_shot_dict(True)      
-            
-            try:        
-                for single_shot_tab in self.shot_categories:     
-                
-                    treeView1   = single_shot_tab + '_treeView1'
-                    model1      = single_shot_tab + '_model1'
-                    treeView2   = single_shot_tab + '_treeView2'
-                    model2      = single_shot_tab + '_model2'
-                    line_edit1  = single_shot_tab + '_line_edit1'
-                    line_edit2  = single_shot_tab + '_line_edit2'
-                    button1     = single_shot_tab + '_button1'
-                    button2     = single_shot_tab + '_button2'
-                    button3     = single_shot_tab + '_button3'     
-                    
-                    new_scenes = convert_digit_strings_to_int_list(self.create_shot_tab_widgets[line_edit1].text())
-                    new_shots = convert_digit_strings_to_int_list(self.create_shot_tab_widgets[line_edit2].text())
-                
-                    if new_scenes != None and new_shots != None:
-                        for new_scn, new_shot in zip(new_scenes, new_shots):
-                            new_scene_shot_dict = update_shot_dict(current_scene_shot_dict, new_scn, new_shot)    
-                                    
-                    else:
-                        continue   
+    def entered_scene_shot_dict(self):
+        '''
+        - returns the scenes and shot amounts entered in the line edits of the shot tabs, e.g. {40:13}, without the existing scenes
+        '''
+        entered_dict = {}
+        try:        
+            for single_shot_tab in self.shot_categories:     
+                line_edit1  = single_shot_tab + '_line_edit1'
+                line_edit2  = single_shot_tab + '_line_edit2'
                 
-                return new_scene_shot_dict
-           
-            except TypeError, ValueError:
-                pass
-        else:
+                new_scenes = convert_digit_strings_to_int_list(self.create_shot_tab_widgets[line_edit1].text())
+                new_shots = convert_digit_strings_to_int_list(self.create_shot_tab_widgets[line_edit2].text())
+            
+                if new_scenes != None and new_shots != None:
+                    for new_scn, new_shot in zip(new_scenes, new_shots):
+                        update_shot_dict(entered_dict, new_scn, new_shot)    
+        except (TypeError, ValueError):
+            pass
+        return entered_dict
+
+
+    def update_scene_shot_dict(self, entered_dict=None):
+        '''
+        - returns the current scene-shot table of the project updated by the entered scenes, see entered_scene_shot_dict()
+        '''
+        #current_project = self.get_current_project()
+        if self.current_project == None:
             return None
+        if entered_dict == None:
+            entered_dict = self.entered_scene_shot_dict()
+        if not entered_dict:
+            return {}
+
+        new_scene_shot_dict = self.current_project.get_current_scene_shot_dict(True)      
+        for new_scn, new_shot in entered_dict.iteritems():
+            new_scene_shot_dict = update_shot_dict(new_scene_shot_dict, new_scn, new_shot)    
+        return new_scene_shot_dict
 
 
     def generate_new_scene_shot_folders(self):
+        '''
+        - adds the new scene-shot folders in background by a Project_Job, the ui is refreshed when the job succeeded
+        '''
         #current_project = self.get_current_project()
-        new_scene_shot_dict = self.update_scene_shot_dict()
+        # only the entered scenes are planned, so adding a shot to scene 40 never lists the folders of scenes 1-39
+        entered_dict = self.entered_scene_shot_dict()
+        new_scene_shot_dict = self.update_scene_shot_dict(entered_dict)
+        project = self.current_project
 
-        try:            
-            self.current_project.add_scene_shot_folders(new_scene_shot_dict)
-            self.current_project.dict_amount = new_scene_shot_dict
+        if project == None or not new_scene_shot_dict or self.project_job_is_running():
+            return
 
-        except AttributeError:
-            pass 
+        def work(job):
+            project.job = job
+            try:
+                project.add_scene_shot_folders(entered_dict)
+            finally:
+                project.job = None
+            project.dict_amount = new_scene_shot_dict
+
+        self.start_project_job(work, project.estimate_creation_amount(entered_dict), 'Adding scene-shot folders',
+                               lambda result: self.refresh_current_ui())
 
 
     def clear_non_focus_qtreeview_selection(self, current_folder_type, widget_dict, treeview_num):
@@ -2568,25 +2856,26 @@ class main_gui(QWidget):
 
 
     def populate_folders_into_qtreeview(self, folder_type, widget_dict, parent_directory):
-
+        '''
+        - lists the folders of parent_directory on the populate pool, the model is filled once the rows arrive
+        '''
         treeView1 = folder_type + '_treeView1'
         model1 = folder_type + '_model1'
 
-        try:
+        def show_folders(folder_names):
             widget_dict[model1].clear()
             widget_dict[model1].setHorizontalHeaderLabels(['>>> {} <<<'.format(folder_type).upper()])  
+            for folder in folder_names:
+                item = QStandardItem(remove_double_under_scores(folder))
+                item.setIcon(widget_dict[treeView1].style().standardIcon(QStyle.SP_DirIcon))
+                item.setEditable(False)
+                widget_dict[model1].appendRow([item])                                           
 
-            if os.path.isdir(parent_directory):
-                for folder in os.listdir(parent_directory):
-
-                    item = QStandardItem(remove_double_under_scores(folder))
-
-                    item.setIcon(widget_dict[treeView1].style().standardIcon(QStyle.SP_DirIcon))
-                    item.setEditable(False)
-                    if os.path.isdir(parent_directory + folder):
-                        widget_dict[model1].appendRow([item])                                           
+        try:
+            self.populate_pool.request(model1, lambda: populate_workers.list_folders(parent_directory), show_folders,
+                                       (folder_type, unix_format(parent_directory)))
 
-            widget_dict[treeView1].clicked.connect(lambda: self.populate_files_into_qtreeview(folder_type, widget_dict, parent_directory))
+            self.click_router.route(widget_dict[treeView1], treeView1, lambda: self.populate_files_into_qtreeview(folder_type, widget_dict, parent_directory))
 
             
         except UnboundLocalError, WindowsError:
@@ -2594,52 +2883,23 @@ class main_gui(QWidget):
 
 
     def populate_hierarchical_folders_into_qtreeview(self, folder_type, widget_dict, parent_directory):
-        
+        '''
+        - shows the folders of parent_directory and their sub-folders in the Lazy_Folder_Model of the folder type
+        - nothing is built here, the view asks for the top level folders, the sub-folders of a folder are listed when it's expanded,
+          the names come from the project index, see CG_Project.list_folder_tree(), so it costs the same for 30 or 3,000 shots
+        - the shot inventory is checked against the drive and the folders are listed on the folder_tree_pool,
+          the revalidation is requested first, so the folders listed after it come from the current structure
+        '''
         treeView1 = folder_type + '_treeView1'
         model1 = folder_type + '_model1'
 
         try:            
-            widget_dict[model1].clear()                    
+            project = self.current_project
+            self.folder_tree_pool.request(model1 + '_structure', project.shot_inventory, lambda inventory: None)
             widget_dict[model1].setHorizontalHeaderLabels(['>>> {} <<<'.format(folder_type).upper()])  
-            
-            try:
-                if os.path.isdir(parent_directory):
-                    
-                    for folder in os.listdir(parent_directory):
-                       
-                        
-                        item = QStandardItem(remove_double_under_scores(folder))
-                  
-                        item.setIcon(widget_dict[treeView1].style().standardIcon(QStyle.SP_DirIcon))
-                     
-                        item.setEditable(False)
-                   
-                        sub_dir = unix_format(os.path.join(parent_directory, folder))
-                   
-                        if os.path.isdir(sub_dir):
-                            
-                            sub_folders = os.listdir(sub_dir)
-                        
-                            for sub_folder in sub_folders: 
-                              
-                                #  filter out those hidden '___Backup' folders
-                                test_dir = unix_format(os.path.join(sub_dir, sub_folder))
-                             
-                                if os.path.isdir(test_dir) and not(folder_is_hidden(test_dir)):  
-                                                                                             
-                                    sub_item = QStandardItem(remove_double_under_scores(sub_folder)) 
-                                
-                                    sub_item.setIcon(widget_dict[treeView1].style().standardIcon(QStyle.SP_DirIcon))
-                                    sub_item.setEditable(False)
-                             
-                                    item.appendRow([sub_item])                        
-                              
-                        widget_dict[model1].appendRow([item])     
-                   
-            except TypeError:
-                pass                                      
+            widget_dict[model1].set_root(parent_directory, project.list_folder_tree, self.folder_tree_pool)
        
-            widget_dict[treeView1].clicked.connect(lambda: self.populate_files_into_qtreeview(folder_type, widget_dict, parent_directory))
+            self.click_router.route(widget_dict[treeView1], treeView1, lambda: self.populate_files_into_qtreeview(folder_type, widget_dict, parent_directory))
   
         except UnboundLocalError, WindowsError:
             pass  
@@ -2659,6 +2919,9 @@ class main_gui(QWidget):
         if '/' not in folder_name and 'SCENE_' in folder_name:
             # if '/' not in folder_name means current selected folder is not a child folder
             # and if 'SCENE_' not in folder_name means current selected folder should be an asset folder so it could jump to the 'else' block below.
+            self.populate_pool.cancel(folder_type + '_files')
+            self.view_updater.unbind(model2)
+            self.view_updater.unbind(model3)
             
             widget_dict[model2].clear()
             widget_dict[model2].setHorizontalHeaderLabels(['>>> file <<<'.upper()])     
@@ -2671,80 +2934,17 @@ class main_gui(QWidget):
         else:       
             
             try:
-                # populate the active files
+                # the active and the history files are listed on the populate pool, see show_active_and_history_files()
                 folder_directory = unix_format(parent_directory) + folder_name
+                self.populate_pool.request(folder_type + '_files',
+                                           lambda: populate_workers.list_active_and_history_files(folder_directory),
+                                           lambda rows: self.show_active_and_history_files(folder_type, widget_dict, folder_directory, rows),
+                                           (folder_type, folder_directory))
 
-                widget_dict[model2].clear()
-                widget_dict[model2].setHorizontalHeaderLabels(['>>> file <<<'.upper()])   
-
-                try:
-                    widget_dict[model3].clear()
-                    widget_dict[model3].setHorizontalHeaderLabels(['>>> history <<<'.upper()])  
-                except KeyError:
-                    pass                       
-
-                if os.path.isdir(folder_directory):
-                    for file in os.listdir(folder_directory):                                            
-                        # filter out the hidden folder '___backup'
-                        candidate_dir = os.path.join(unix_format(folder_directory), file)
-
-                        if not(os.path.isdir(candidate_dir)):  
-
-                            #self.clear_non_focus_qtreeview_selection(folder_type, widget_dict, 2)  
-                            item = QStandardItem(file)                
-
-                            item.setIcon(widget_dict[treeView2].style().standardIcon(QStyle.SP_FileIcon))
-                            item.setEditable(False)
-
-                            widget_dict[model2].appendRow([item])
-                else:
-                    widget_dict[model2].clear()
-                    widget_dict[model2].setHorizontalHeaderLabels(['>>> file <<<'.upper()]) 
-
-                    try:
-                        widget_dict[model3].clear()
-                        widget_dict[model3].setHorizontalHeaderLabels(['>>> history <<<'.upper()])   
-                    except KeyError:
-                        pass                      
-
-                # populate the history files
-                backup_directory = unix_format(parent_directory) + folder_name + '\___backup'
-                try:
-                    widget_dict[model3].clear()
-                    widget_dict[model3].setHorizontalHeaderLabels(['>>> history <<<'.upper()])        
-                except KeyError:
-                    pass
-
-                if os.path.isdir(backup_directory):
-                    for file in os.listdir(backup_directory):
-                        # filter out the hidden folder '___script'
-                        candidate_dir = os.path.join(unix_format(folder_directory), file)
-                        if not(os.path.isdir(candidate_dir)):      
-                            try:
-                                #self.clear_non_focus_qtreeview_selection(folder_type, widget_dict, 3)                                               
-                                item = QStandardItem(file)                            
-                                           
-                           
-                                item.setIcon(widget_dict[treeView3].style().standardIcon(QStyle.SP_FileIcon))
-                                item.setEditable(False)
-
-                                widget_dict[model3].appendRow([item])
-                            except KeyError:
-                                pass
-                else:
-                    widget_dict[model2].clear()
-                    widget_dict[model2].setHorizontalHeaderLabels(['>>> file <<<'.upper()]) 
-
-                    try:
-                        widget_dict[model3].clear()
-                        widget_dict[model3].setHorizontalHeaderLabels(['>>> history <<<'.upper()])     
-                    except KeyError:
-                        pass                  
-
-                widget_dict[treeView2].clicked.connect(lambda: self.clear_non_focus_qtreeview_selection(folder_type, widget_dict, 2))    
+                self.click_router.route(widget_dict[treeView2], treeView2, lambda: self.clear_non_focus_qtreeview_selection(folder_type, widget_dict, 2), 0)    
                 #widget_dict[treeView2].clicked.connect(lambda: self.get_selected_file_dir(folder_type, 'maya', widget_dict, parent_directory))
                 try:
-                    widget_dict[treeView3].clicked.connect(lambda: self.clear_non_focus_qtreeview_selection(folder_type, widget_dict, 3)) 
+                    self.click_router.route(widget_dict[treeView3], treeView3, lambda: self.clear_non_focus_qtreeview_selection(folder_type, widget_dict, 3), 0) 
                     #widget_dict[treeView3].clicked.connect(lambda: self.get_selected_file_dir(folder_type, 'history', widget_dict, parent_directory))
                 except KeyError:
                     pass
@@ -2753,6 +2953,38 @@ class main_gui(QWidget):
                 pass
 
 
+    def show_active_and_history_files(self, folder_type, widget_dict, folder_directory, rows):
+        '''
+        - fills the file and the history views of the folder type with the rows of populate_workers.list_active_and_history_files()
+        - the files of a folder without a '___backup' folder aren't shown, as before
+        '''
+        model2 = folder_type + '_model2'
+        model3 = folder_type + '_model3'
+
+        widget_dict[model2].clear()
+        widget_dict[model2].setHorizontalHeaderLabels(['>>> file <<<'.upper()])   
+        try:
+            widget_dict[model3].clear()
+            widget_dict[model3].setHorizontalHeaderLabels(['>>> history <<<'.upper()])  
+        except KeyError:
+            pass                       
+        self.view_updater.unbind(model2)
+        self.view_updater.unbind(model3)
+
+        if rows['files'] == None or rows['history'] == None:
+            return
+
+        # the lazy shot files that are not created yet are shown as virtual entries in italic
+        widget_dict[model2].set_files(rows['files'], self.current_project.lazy_shot_files(folder_directory), folder_directory)
+        # from now on, the files written or deleted in the folder are added to or removed from the views, see watch_directory()
+        self.view_updater.bind(model2, folder_directory, widget_dict[model2])
+        try:
+            widget_dict[model3].set_files(rows['history'])
+            self.view_updater.bind(model3, unix_format(folder_directory) + populate_workers.BACKUP_FOLDER_NAME, widget_dict[model3])
+        except KeyError:
+            pass
+
+
     def get_selected_item_index(self, folder_type, widget_dict):
         '''
         returns an int that indicates the exact index of selected folder in the treeview
@@ -2834,8 +3066,7 @@ class main_gui(QWidget):
         texts = []
 
         for sel_item_index in widget_dict[treeView2].selectedIndexes():
-            item = sel_item_index.model().itemFromIndex(sel_item_index).text()
-            texts.append(item)
+            texts.append(sel_item_index.data())
 
         return texts[0]
 
@@ -2849,18 +3080,18 @@ class main_gui(QWidget):
         texts = []
 
         for sel_item_index in widget_dict[treeView3].selectedIndexes():
-            item = sel_item_index.model().itemFromIndex(sel_item_index).text()
-            texts.append(item)
+            texts.append(sel_item_index.data())
 
         return texts[0]       
 
 
-    def get_selected_file_dir(self, folder_type, file_type, widget_dict, parent_directory):
+    def get_selected_file_dir(self, folder_type, file_type, widget_dict, parent_directory, materialize=False):
         '''
         - return a full path of selected file
         - folder_type should be the 'xxx', which is the prefix name of  the 'xxx_treeView2' or 'xxx_treeView3' in the widget_dict
         - widget_dict are those 'self.create_shot_tab_widgets', 'self.create_design_tab_widgets' and 'self.create_asset_tab_widgets'
         - file_type specifies the maya file or history file, only passes '2d', maya' or 'history' for this argument    
+        - with materialize=True, a selected lazy shot file which is not created yet is created from the template
         '''
         try:
             selected_file = ''
@@ -2874,6 +3105,9 @@ class main_gui(QWidget):
                 if os.path.isfile(sel_file_directory):
                
                     return sel_file_directory
+
+                elif materialize and self.current_project.materialize_lazy_shot_file(sel_file_directory):
+                    return sel_file_directory
                       
             elif file_type == 'history':
 
@@ -2925,8 +3159,8 @@ class main_gui(QWidget):
         if self.current_project != None:
 
             try:
-                parent_folder = self.folder_type_directories_dict.get(design_type)
-                self.populate_folders_into_qtreeview(design_type, self.create_design_tab_widgets, eval(parent_folder))
+                parent_folder = self.folder_type_directory(design_type)
+                self.populate_folders_into_qtreeview(design_type, self.create_design_tab_widgets, parent_folder)
 
             except AttributeError, WindowsError:
                 pass  
@@ -2967,7 +3201,7 @@ class main_gui(QWidget):
         
         open_image_file = design_categories_dict.get(design_category, 'none')
         try:
-            return open_image_file(design_category, eval(self.folder_type_directories_dict[design_category]))
+            return open_image_file(design_category, self.folder_type_directory(design_category))
         except TypeError:
             return
 
@@ -2979,7 +3213,7 @@ class main_gui(QWidget):
         if selected_file == None:
             return 
         else:
-            subprocess.Popen(r'explorer /select, {}'.format(windows_format(selected_file)))
+            open_file_in_explorer(selected_file)
 
 
     def open_file_in_explorer_design_tabs(self, design_category):        
@@ -2991,7 +3225,7 @@ class main_gui(QWidget):
 
         open_file_explorer = eval(design_categories_dict.get(design_category))
         try:
-            return open_file_explorer(design_category, eval(self.folder_type_directories_dict[design_category]))
+            return open_file_explorer(design_category, self.folder_type_directory(design_category))
         except TypeError:
             return
 
@@ -3006,9 +3240,9 @@ class main_gui(QWidget):
         else:
             try:
           
-                shot_directory = self.folder_type_directories_dict.get(folder_type)
+                shot_directory = self.folder_type_directory(folder_type)
     
-                self.populate_hierarchical_folders_into_qtreeview(folder_type, self.create_shot_tab_widgets, eval(shot_directory))
+                self.populate_hierarchical_folders_into_qtreeview(folder_type, self.create_shot_tab_widgets, shot_directory)
        
             except WindowsError, AttributeError:
                 return 
@@ -3032,8 +3266,8 @@ class main_gui(QWidget):
 
         else:                   
             try:
-                asset_directory = self.folder_type_directories_dict.get(folder_type) 
-                self.populate_hierarchical_folders_into_qtreeview(folder_type, self.create_asset_tab_widgets, eval(asset_directory))
+                asset_directory = self.folder_type_directory(folder_type) 
+                self.populate_hierarchical_folders_into_qtreeview(folder_type, self.create_asset_tab_widgets, asset_directory)
 
             except WindowsError, AttributeError:
                 return
@@ -3128,8 +3362,13 @@ class main_gui(QWidget):
 
         
     def refresh_current_ui(self):   
-     
-        exec( eval( self.refresh_ui_dict.get( self.get_main_stacked_layout_current_index() ) ) )        
+        # the scans of the tab the user left are superseded, their rows are never shown
+        self.populate_pool.cancel()
+        self.build_section(self.get_main_stacked_layout_current_index())
+
+        populate_current_tab = self.refresh_ui_dict.get( self.get_main_stacked_layout_current_index() )()
+        if populate_current_tab != None:
+            populate_current_tab()
      
     
     def refresh_tabwidget(self, tab_widget):
@@ -3185,10 +3424,10 @@ class main_gui(QWidget):
         '''
         for folder_type in folder_types:
             
-            temp_dir = self.folder_type_directories_dict.get(folder_type)
+            temp_dir = self.folder_type_directory(folder_type)
           
 
-            sel_file_directory = self.get_selected_file_dir(folder_type, 'maya', widget_dict, eval(temp_dir))
+            sel_file_directory = self.get_selected_file_dir(folder_type, 'maya', widget_dict, temp_dir, True)
    
 
             if sel_file_directory != None:
@@ -3233,33 +3472,22 @@ class main_gui(QWidget):
 
 
     def refresh_history_qtreeview(self, folder_type, widget_dict, parent_directory):
-
-        treeView3 = folder_type + '_treeView3'
+        '''
+        - lists the history files in parent_directory on the populate pool, the view is filled once the rows arrive
+        '''
         model3 = folder_type + '_model3'
 
-        try:
-            widget_dict[model3].clear()
-            widget_dict[model3].setHorizontalHeaderLabels(['>>> history <<<'.upper()])        
-        except KeyError:
-            pass
-
-        if os.path.isdir(parent_directory):
-            for file in os.listdir(parent_directory):   
-                try:                                                  
-                    item = QStandardItem(file)                            
-
-                    item.setIcon(widget_dict[treeView3].style().standardIcon(QStyle.SP_FileIcon))
-                    item.setEditable(False)
-
-                    widget_dict[model3].appendRow([item])
-                except KeyError:
-                    pass
-        else:
+        def show_history(files):
             try:
                 widget_dict[model3].clear()
-                widget_dict[model3].setHorizontalHeaderLabels(['>>> history <<<'.upper()])     
+                widget_dict[model3].setHorizontalHeaderLabels(['>>> history <<<'.upper()])        
             except KeyError:
-                pass        
+                return
+            widget_dict[model3].set_files(files or [])
+            self.view_updater.bind(model3, parent_directory, widget_dict[model3])
+
+        self.populate_pool.request(folder_type + '_files', lambda: populate_workers.list_files(parent_directory), show_history,
+                                   (folder_type, unix_format(parent_directory)))
 
 
     def set_active(self, widget_dict, *folder_types):
@@ -3269,9 +3497,9 @@ class main_gui(QWidget):
         '''
         for folder_type in folder_types:
 
-            temp_dir = self.folder_type_directories_dict.get(folder_type)       
+            temp_dir = self.folder_type_directory(folder_type)       
 
-            sel_file_directory = self.get_selected_file_dir( folder_type, 'history', widget_dict, eval(temp_dir) )
+            sel_file_directory = self.get_selected_file_dir( folder_type, 'history', widget_dict, temp_dir )
 
             if sel_file_directory != None:
 
@@ -3349,9 +3577,9 @@ class main_gui(QWidget):
 
         for folder_type in folder_types:
             try:
-                temp_dir = self.folder_type_directories_dict.get(folder_type)          
+                temp_dir = self.folder_type_directory(folder_type)          
 
-                sel_file_directory = self.get_selected_file_dir( folder_type, 'maya', widget_dict, eval(temp_dir) )
+                sel_file_directory = self.get_selected_file_dir( folder_type, 'maya', widget_dict, temp_dir, True )
 
                 amount = self.get_amount_of_referencing(folder_type) 
            
@@ -3406,12 +3634,12 @@ class main_gui(QWidget):
 
         for folder_type in folder_types:
             try:
-                temp_dir = self.folder_type_directories_dict.get(folder_type)          
+                temp_dir = self.folder_type_directory(folder_type)          
 
-                sel_file_directory = self.get_selected_file_dir( folder_type, 'maya', widget_dict, eval(temp_dir) )                
+                sel_file_directory = self.get_selected_file_dir( folder_type, 'maya', widget_dict, temp_dir, True )                
                 
                 if sel_file_directory != None:
-                    os.system('start maya.exe "{}"'.format(sel_file_directory))
+                    self.open_maya_file(sel_file_directory)
                     break
                 else:
                     pass 
@@ -3420,33 +3648,634 @@ class main_gui(QWidget):
                 pass    
 
 
+    def open_maya_file(self, maya_file):
+        '''
+        - opens the given maya file, a complete path, in a new maya
+        '''
+        # a hard linked shot file gets its own data before it's opened and saved
+        if configuration.hardlink_shot_files:
+            template_files.break_hardlink(maya_file)
+        os.system('start maya.exe "{}"'.format(maya_file))
+
+
+
+    # ===============================================================
+    # ======= the quick-open palette of the project files ===========
+    # ===============================================================
+
+    def show_quick_open(self):
+        '''
+        - shows the quick-open palette of the current project, see Quick_Open_Dialog
+        - the index of the project is built the first time, the palette searches it as soon as it's delivered,
+          then it's kept up to date by the directory watcher, see update_quick_open_index()
+        '''
+        if self.current_project == None:
+            return
+        project_directory = unix_format(self.current_project.project_directory)
+        if self.quick_open_index == None or self.quick_open_index.project_directory != project_directory:
+            self.quick_open_index = None
+            self.build_quick_open_index(project_directory)
+        if self.quick_open_dialog == None:
+            self.quick_open_dialog = Quick_Open_Dialog(self)
+        self.quick_open_dialog.show_index(self.quick_open_index)
+
+
+    def build_quick_open_index(self, project_directory):
+        '''
+        - walks the given project on the quick-open pool, the lazy shot files not created yet are indexed too
+        '''
+        extra_files = self.current_project.lazy_shot_files if configuration.lazy_shot_files else None
+
+        def build_index():
+            paths = quick_open.list_project_files(project_directory, configuration.quick_open_extensions, extra_files,
+                                                  configuration.populate_threads)
+            return quick_open.Quick_Open_Index(project_directory, paths)
+
+        def index_built(index):
+            if self.current_project == None or unix_format(self.current_project.project_directory) != index.project_directory:
+                return
+            self.quick_open_index = index
+            if self.quick_open_dialog != None and self.quick_open_dialog.isVisible():
+                self.quick_open_dialog.show_index(index)
+
+        self.quick_open_pool.request('quick_open_index', build_index, index_built)
+
+
+    def update_quick_open_index(self, file_type, path, action):
+        '''
+        - applies a change seen by a directory watcher to the quick-open index, the files of the hidden '___' folders aren't indexed
+        '''
+        if self.quick_open_index == None or '/___' in path.replace('\\', '/'):
+            return
+        if action in (change_events.DELETED, change_events.RENAMED_FROM):
+            self.quick_open_index.remove_path(path)
+        elif action in (change_events.CREATED, change_events.RENAMED_TO) and file_type == 'file' and \
+                path.rsplit('.', 1)[-1].lower() in configuration.quick_open_extensions:
+            self.quick_open_index.add_path(path)
+
+
+    def quick_open_file(self, file_path):
+        '''
+        - opens a file chosen in the quick-open palette like the views do: a maya file in a new maya, a lazy shot file
+          is created from the template first, an image or a video in its viewer
+        '''
+        file_ext = file_path.rsplit('.', 1)[-1].lower()
+        if file_ext in img_exts:
+            open_image_file(file_path)
+        elif file_ext in vid_exts:
+            open_video_file(file_path)
+        elif self.current_project.materialize_lazy_shot_file(file_path):
+            self.open_maya_file(file_path)
+
+
+    def quick_reference_file(self, file_path):
+        '''
+        - references a maya file chosen in the quick-open palette once into a new maya, the images can't be referenced
+        '''
+        if file_path.rsplit('.', 1)[-1].lower() == 'ma' and self.current_project.materialize_lazy_shot_file(file_path):
+            self.reference_maya_file(file_path, 1)
+
+
+
+#========================================================
+#========= the lazy model of the folder trees ===========
+#========================================================
+
+class Folder_Node(object):
+    """
+    - a folder shown by a Lazy_Folder_Model, it answers text() and parent() like the QStandardItem it replaces
+    - pending are the names of the sub-folders which aren't added as nodes yet, None means they weren't listed yet
+    """
+    def __init__(self, name, directory, parent_node=None, depth=0, row=0):
+        self.name = name
+        self.directory = directory
+        self.parent_node = parent_node
+        self.depth = depth
+        self.row = row
+        self.children = []
+        self.pending = None
+        # True while the sub-folders are listed on the pool of the model
+        self.listing = False
+
+    def text(self):
+        return remove_double_under_scores(self.name)
+
+    def parent(self):
+        # a top level folder has no parent item, like a QStandardItem
+        if self.parent_node == None or self.parent_node.parent_node == None:
+            return None
+        return self.parent_node
+
+
+
+class Lazy_Folder_Model(QAbstractItemModel):
+    """
+    - a folder tree which only holds the folders that were shown, the sub-folders of a folder are listed when it's expanded
+    - the names come from list_children, a function which takes a directory and returns the sorted names of its sub-folders,
+      e.g. CG_Project.list_folder_tree(), which answers from the project index without touching the drive
+    - the rows are added in batches of batch_size by canFetchMore()/fetchMore(), so opening a tree costs the same however big it is
+    - with a Populate_Pool, list_children runs on its threads and the rows are added when they're delivered,
+      so a folder that has to be scanned, or an index that has to be built first, never freezes the window
+    - the folders deeper than max_depth are never listed, the shot trees show scenes and shots, the asset trees assets and variations
+    """
+    def __init__(self, icon=None, max_depth=2, batch_size=256, parent=None):
+        QAbstractItemModel.__init__(self, parent)
+        self.icon = icon
+        self.max_depth = max_depth
+        self.batch_size = batch_size
+        self.header = ''
+        self.list_children = None
+        self.pool = None
+        self.root = Folder_Node('', '')
+        self.root.pending = []
+
+
+    def set_root(self, directory, list_children, pool=None):
+        '''
+        - shows the sub-folders of the given directory, nothing is listed until the view asks for the rows
+        - with a populate_workers.Populate_Pool, the folders are listed on its threads, see list_in_background()
+        '''
+        self.beginResetModel()
+        self.root = Folder_Node('', unix_format(directory) if directory else '')
+        self.list_children = list_children
+        self.pool = pool
+        if not directory or list_children == None:
+            self.root.pending = []
+        self.endResetModel()
+
+
+    def clear(self):
+        self.set_root('', None)
+
+
+    def setHorizontalHeaderLabels(self, labels):
+        self.header = labels[0] if labels else ''
+        self.headerDataChanged.emit(Qt.Horizontal, 0, 0)
+
+
+    def node(self, index):
+        return index.internalPointer() if index.isValid() else self.root
+
+
+    def itemFromIndex(self, index):
+        return index.internalPointer() if index.isValid() else None
+
+
+    def index(self, row, column, parent=QModelIndex()):
+        node = self.node(parent)
+        if column != 0 or row < 0 or row >= len(node.children):
+            return QModelIndex()
+        return self.createIndex(row, 0, node.children[row])
+
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        node = index.internalPointer().parent_node
+        if node == None or node is self.root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return len(self.node(parent).children)
+
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+
+    def is_expandable(self, node):
+        return node is self.root or node.depth < self.max_depth
+
+
+    def hasChildren(self, parent=QModelIndex()):
+        node = self.node(parent)
+        if not self.is_expandable(node):
+            return False
+        # a folder that wasn't listed yet shows an expander, it's taken away if the folder turns out to be empty
+        return bool(node.children) or node.pending == None or bool(node.pending)
+
+
+    def canFetchMore(self, parent):
+        node = self.node(parent)
+        return self.is_expandable(node) and not node.listing and (node.pending == None or bool(node.pending))
+
+
+    def fetchMore(self, parent):
+        node = self.node(parent)
+        if node.listing:
+            return
+        if node.pending == None:
+            if self.pool != None:
+                self.list_in_background(node)
+                return
+            self.set_pending(node, self.list_sub_folders(self.list_children, node.directory))
+        self.add_rows(node)
+
+
+    def list_sub_folders(self, list_children, directory):
+        try:
+            return list(list_children(directory))
+        except (OSError, IOError):
+            return []
+
+
+    def list_in_background(self, node):
+        '''
+        - lists the sub-folders of the node on the pool, the first batch of rows is added when they're delivered,
+          unless the model was given a new root meanwhile
+        '''
+        root = self.root
+        list_children = self.list_children
+
+        def show_sub_folders(names):
+            if self.root is not root:
+                return
+            node.listing = False
+            self.set_pending(node, names)
+            self.add_rows(node)
+
+        node.listing = True
+        # every folder is a target of its own, expanding a folder never supersedes the listing of another one
+        self.pool.request((id(self), node.directory), lambda: self.list_sub_folders(list_children, node.directory), show_sub_folders)
+
+
+    def node_index(self, node):
+        return QModelIndex() if node is self.root else self.createIndex(node.row, 0, node)
+
+
+    def set_pending(self, node, names):
+        node.pending = names
+        if not names and node is not self.root:
+            # the expander of an empty folder goes away
+            index = self.node_index(node)
+            self.dataChanged.emit(index, index)
+
+
+    def add_rows(self, node):
+        batch = node.pending[:self.batch_size]
+        if not batch:
+            return
+        del node.pending[:self.batch_size]
+        first_row = len(node.children)
+        self.beginInsertRows(self.node_index(node), first_row, first_row + len(batch) - 1)
+        for name in batch:
+            node.children.append(Folder_Node(name, node.directory + name + '/', node, node.depth + 1, len(node.children)))
+        self.endInsertRows()
+
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return index.internalPointer().text()
+        if role == Qt.DecorationRole:
+            return self.icon
+        return None
+
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if section == 0 and orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.header
+        return None
+
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+
+
+#========================================================
+#========= the quick-open palette =======================
+#========================================================
+
+class Quick_Open_Dialog(QDialog):
+    """
+    - the quick-open palette: the best matches of a quick_open.Quick_Open_Index, searched again at every key typed
+    - Enter opens the selected file, Ctrl+Enter references it and Ctrl+E shows it in the explorer, like the buttons,
+      Up and Down move the selection without leaving the line edit
+    - the actions are the ones of the gui, see main_gui.quick_open_file() and main_gui.quick_reference_file()
+    """
+    def __init__(self, gui):
+        QDialog.__init__(self, gui)
+        self.gui = gui
+        self.index = None
+        self.setWindowTitle('Quick Open')
+        self.setMinimumWidth(600*desktop_scaled)
+
+        self.line_edit = QLineEdit()
+        self.line_edit.setPlaceholderText('type a part of a file name or of its path, e.g. s3sh12anim')
+        self.result_list = QListWidget()
+        self.result_list.setMinimumHeight(400*desktop_scaled)
+        self.status_label = QLabel()
+        self.open_button = QPushButton('OPEN')
+        self.reference_button = QPushButton('REFERENCE')
+        self.explorer_button = QPushButton('SHOW IN EXPLORER')
+
+        button_layout = QHBoxLayout()
+        for button in (self.open_button, self.reference_button, self.explorer_button):
+            # Enter is handled by the line edit, it must not press a button
+            button.setAutoDefault(False)
+            button_layout.addWidget(button)
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.line_edit)
+        layout.addWidget(self.result_list)
+        layout.addWidget(self.status_label)
+        layout.addLayout(button_layout)
+
+        self.line_edit.textChanged.connect(self.search)
+        self.line_edit.installEventFilter(self)
+        self.result_list.itemActivated.connect(lambda item: self.run_action(self.gui.quick_open_file))
+        self.open_button.clicked.connect(lambda: self.run_action(self.gui.quick_open_file))
+        self.reference_button.clicked.connect(lambda: self.run_action(self.gui.quick_reference_file))
+        self.explorer_button.clicked.connect(lambda: self.run_action(open_file_in_explorer))
+
+
+    def show_index(self, index):
+        '''
+        - shows the palette on the given index, None while the index is being built
+        '''
+        self.index = index
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        self.line_edit.setFocus()
+        self.line_edit.selectAll()
+        self.search(self.line_edit.text())
+
+
+    def search(self, text):
+        self.result_list.clear()
+        if self.index == None:
+            self.status_label.setText('indexing the files of the project...')
+            return
+        started_time = time.time()
+        paths = self.index.search(text, configuration.quick_open_results)
+        for path in paths:
+            item = QListWidgetItem(path[len(self.index.project_directory):])
+            item.setData(Qt.UserRole, path)
+            self.result_list.addItem(item)
+        if paths:
+            self.result_list.setCurrentRow(0)
+        self.status_label.setText('{0} of {1} files, {2:.1f} ms'.format(len(paths), len(self.index), (time.time() - started_time) * 1000))
+
+
+    def run_action(self, action):
+        item = self.result_list.currentItem()
+        if item == None:
+            return
+        self.hide()
+        action(item.data(Qt.UserRole))
+
+
+    def eventFilter(self, watched, event):
+        if watched is self.line_edit and event.type() == QEvent.KeyPress:
+            key = event.key()
+            if key in (Qt.Key_Up, Qt.Key_Down):
+                step = -1 if key == Qt.Key_Up else 1
+                row = min(max(self.result_list.currentRow() + step, 0), self.result_list.count() - 1)
+                self.result_list.setCurrentRow(row)
+                return True
+            if key in (Qt.Key_Return, Qt.Key_Enter):
+                if event.modifiers() & Qt.ControlModifier:
+                    self.run_action(self.gui.quick_reference_file)
+                else:
+                    self.run_action(self.gui.quick_open_file)
+                return True
+            if key == Qt.Key_E and event.modifiers() & Qt.ControlModifier:
+                self.run_action(open_file_in_explorer)
+                return True
+        return QDialog.eventFilter(self, watched, event)
+
+
+
+#========================================================
+#========= run the long project jobs in background ======
+#========================================================
+
+class Job_Cancelled(Exception):
+    pass
+
+
+
+class Project_Job(QThread):
+    """
+    - runs a long project job, such as creating a project or adding scene-shot folders, on a worker thread
+    - 'work' is a function which takes this job as its only argument, the work reports every directory and file it creates by
+      directory_created() and file_written(), both of them raise Job_Cancelled once cancel() was called
+    - 'expected_amount' is the estimated amount of directories and files, which is used for the ETA
+    - progress is emitted with the amount of directories created, files written and the ETA in seconds (-1 when unknown)
+    - a cancelled job removes its partial output: the whole project if the job created its root folder,
+      otherwise every reported directory and file, the newest ones first
+    """
+    progress = Signal(int, int, float)
+    succeeded = Signal(object)
+    failed = Signal(str)
+    cancelled = Signal()
+
+    def __init__(self, work, expected_amount=0):
+        super(Project_Job, self).__init__()
+        self.work = work
+        self.expected_amount = expected_amount
+        self.directories = 0
+        self.files = 0
+        self.created_paths = []
+        self.created_root = None
+        self.started_time = time.time()
+        self.__cancel_requested = False
+        self.__last_report = 0
+        self.__lock = threading.Lock()
+
+
+    def cancel(self):
+        self.__cancel_requested = True
+
+
+    def check_cancelled(self):
+        if self.__cancel_requested:
+            raise Job_Cancelled()
+
+
+    def root_created(self, root_directory):
+        self.created_root = root_directory
+
+
+    def directory_created(self, directory):
+        # the parallel materializer reports from several threads
+        with self.__lock:
+            self.directories += 1
+            self.created_paths.append(directory)
+        self.report()
+
+
+    def file_written(self, file_path):
+        with self.__lock:
+            self.files += 1
+            self.created_paths.append(file_path)
+        self.report()
+
+
+    def report(self, force=False):
+        '''
+        - emits the progress at most 10 times per second, so the gui isn't flooded
+        '''
+        self.check_cancelled()
+        now = time.time()
+        if not force and now - self.__last_report < 0.1:
+            return
+        self.__last_report = now
+
+        done = self.directories + self.files
+        eta = -1.0
+        if done > 0 and self.expected_amount > 0:
+            eta = max(0.0, (now - self.started_time) / done * (self.expected_amount - done))
+        self.progress.emit(self.directories, self.files, eta)
+
+
+    def run(self):
+        self.started_time = time.time()
+        try:
+            result = self.work(self)
+            self.report(True)
+        except Job_Cancelled:
+            self.cleanup()
+            self.cancelled.emit()
+            return
+        except (OSError, IOError), error:
+            self.failed.emit(str(error))
+            return
+        except Exception, error:
+            # every error must end the job, otherwise its dialog stays up and no other job can start
+            self.failed.emit('{0}: {1}'.format(type(error).__name__, error))
+            return
+        self.succeeded.emit(result)
+
+
+    def cleanup(self):
+        '''
+        - removes the partial output of a cancelled job
+        '''
+        if self.created_root != None:
+            shutil.rmtree(self.created_root, ignore_errors=True)
+            return
+        for path in reversed(self.created_paths):
+            try:
+                if os.path.isdir(path):
+                    os.rmdir(path)
+                else:
+                    os.remove(path)
+            except OSError:
+                pass
+
+
+
+class Project_Job_Dialog(QProgressDialog):
+    """
+    - the progress dialog of a Project_Job, it shows the directories created, files written and the ETA
+    - the signals of the job are emitted by its worker thread, they're connected to the methods of this dialog,
+      so they're queued to the gui thread it lives in
+    - on_succeeded is called with the result of the work, on_finished once the job ended in any way
+    """
+    def __init__(self, job, title, expected_amount, on_succeeded, on_finished, parent=None):
+        super(Project_Job_Dialog, self).__init__(title, 'Cancel', 0, max(1, expected_amount), parent)
+        self.title = title
+        self.on_succeeded = on_succeeded
+        self.on_finished = on_finished
+        self.setWindowTitle(title)
+        self.setAutoClose(False)
+        self.setAutoReset(False)
+        self.setMinimumDuration(0)
+        self.setMinimumWidth(400 * desktop_scaled)
+
+        job.progress.connect(self.show_progress)
+        job.succeeded.connect(self.job_succeeded)
+        job.failed.connect(self.job_failed)
+        job.cancelled.connect(self.job_ended)
+        self.canceled.connect(job.cancel)
+
+
+    def show_progress(self, directories, files, eta):
+        eta_text = '--' if eta < 0 else '{:.0f} s'.format(eta)
+        self.setLabelText('{0}\n{1} folders created, {2} files written | ETA: {3}'.format(self.title, directories, files, eta_text))
+        self.setValue(min(directories + files, self.maximum()))
+
+
+    def job_ended(self):
+        self.close()
+        self.on_finished()
+
+
+    def job_succeeded(self, result):
+        self.job_ended()
+        self.on_succeeded(result)
+
+
+    def job_failed(self, message):
+        self.job_ended()
+        QMessageBox.warning(self.parent(), self.title, message)
+
+
 
 #========================================================
 #======= implement the watching directory feature =======
 #========================================================
 
-ACTIONS = {     1 : "Created",
-                2 : "Deleted",
-                3 : "Updated",
-                4 : "Renamed to something",
-                5 : "Renamed from something" }
+# the access stop() needs to cancel the blocking read of a watcher thread, see Track_Directory
+THREAD_TERMINATE = 0x0001
+# FILE_ACTION_RENAMED_OLD_NAME is 4 and FILE_ACTION_RENAMED_NEW_NAME is 5, the views rely on this order, see change_events.View_Updater
+ACTIONS = change_events.ACTIONS
 
 
 
 
 class Track_Directory(QThread):
-    
+    """
+    - watches a directory and its sub directories on a worker thread
+    - every change is emitted by the 'changed' signal with the type ('file', 'folder' or '<deleted>'), the full path and the action
+    - stop() ends the watch, a stop that comes right before a read is only seen after the next change
+    """
+    changed = Signal(str, str, str)
+
     def __init__(self, path_to_watch):
         super(Track_Directory, self).__init__()
         self.path_to_watch = path_to_watch
         self.FILE_LIST_DIRECTORY = 0x0001
         self.include_subdirectories = True
+        self.stopped = False
+        # the handle of the watching thread, so stop() can cancel the read it's blocked in
+        self.thread_handle = None
+        self.thread_lock = threading.Lock()
 
 
     def run(self):
-   
-        for result in self.watch_path():
-            print result
+        kernel32 = ctypes.windll.kernel32
+        with self.thread_lock:
+            self.thread_handle = kernel32.OpenThread(THREAD_TERMINATE, False, kernel32.GetCurrentThreadId())
+        try:
+            for file_type, full_filename, action in self.watch_path():
+                if self.stopped:
+                    break
+                self.changed.emit(file_type, full_filename, action)
+        finally:
+            with self.thread_lock:
+                kernel32.CloseHandle(self.thread_handle)
+                self.thread_handle = None
+
+
+    def stop(self):
+        '''
+        - ends the watch from the gui thread, the blocking read of the changes is cancelled, so the thread finishes
+          without waiting for a change
+        '''
+        self.stopped = True
+        with self.thread_lock:
+            if self.thread_handle:
+                ctypes.windll.kernel32.CancelSynchronousIo(self.thread_handle)
 
 
     def watch_path(self):
@@ -3459,29 +4288,38 @@ class Track_Directory(QThread):
                                         win32con.FILE_FLAG_BACKUP_SEMANTICS,
                                         None )
 
-        while 1:
+        try:
+            while not self.stopped:
             
-            results = win32file.ReadDirectoryChangesW ( hDir,
-                                                        1024,
-                                                        self.include_subdirectories,
-                                                        win32con.FILE_NOTIFY_CHANGE_FILE_NAME | 
-                                                        win32con.FILE_NOTIFY_CHANGE_DIR_NAME |
-                                                        win32con.FILE_NOTIFY_CHANGE_ATTRIBUTES |
-                                                        win32con.FILE_NOTIFY_CHANGE_SIZE |
-                                                        win32con.FILE_NOTIFY_CHANGE_LAST_WRITE |
-                                                        win32con.FILE_NOTIFY_CHANGE_SECURITY,
-                                                        None,
-                                                        None )
-
-            for action, file in results:
-                full_filename = os.path.join(self.path_to_watch, file)
-                if not os.path.exists(full_filename):
-                    file_type = "<deleted>"
-                elif os.path.isdir(full_filename):
-                    file_type = 'folder'
-                else:
-                    file_type = 'file'
-                yield (file_type, full_filename, ACTIONS.get (action, "Unknown"))            
+                try:
+                    results = win32file.ReadDirectoryChangesW ( hDir,
+                                                                1024,
+                                                                self.include_subdirectories,
+                                                                win32con.FILE_NOTIFY_CHANGE_FILE_NAME | 
+                                                                win32con.FILE_NOTIFY_CHANGE_DIR_NAME |
+                                                                win32con.FILE_NOTIFY_CHANGE_ATTRIBUTES |
+                                                                win32con.FILE_NOTIFY_CHANGE_SIZE |
+                                                                win32con.FILE_NOTIFY_CHANGE_LAST_WRITE |
+                                                                win32con.FILE_NOTIFY_CHANGE_SECURITY,
+                                                                None,
+                                                                None )
+                except win32file.error:
+                    # the read is cancelled by stop()
+                    if self.stopped:
+                        break
+                    raise
+
+                for action, file in results:
+                    full_filename = os.path.join(self.path_to_watch, file)
+                    if not os.path.exists(full_filename):
+                        file_type = "<deleted>"
+                    elif os.path.isdir(full_filename):
+                        file_type = 'folder'
+                    else:
+                        file_type = 'file'
+                    yield (file_type, full_filename, ACTIONS.get (action, "Unknown"))            
+        finally:
+            hDir.Close()
 
 
 
@@ -3524,30 +4362,18 @@ def windows_format(path_of_directory):
     return path_of_directory
 
 
-def get_drives_letters():
-
-    if 'win' in sys.platform:
-        #drivelist = subprocess.Popen('wmic logicaldisk get name,description', shell=True, stdout=subprocess.PIPE)
-        #drivelisto, err = drivelist.communicate()
-        #driveLines = drivelisto.split('\n')
-        drives = win32api.GetLogicalDriveStrings()
-        drives = drives.split('\000')[:-1]
-        
-        # filter out those optical drives
-        physical_drives = []
-
-        for drive in drives:
-            not_optical = win32file.GetDriveType(unix_format(drive)[:-1])
-            if not_optical == win32file.DRIVE_FIXED or not_optical == win32file.DRIVE_REMOTE:
-                physical_drives.append(unix_format(drive))
-
-        return physical_drives
-        
-    elif 'linux' in sys.platform:
-         listdrives=subprocess.Popen('mount', shell=True, stdout=subprocess.PIPE)
-         listdrivesout, err=listdrives.communicate()
-         for idx,drive in enumerate(filter(None,listdrivesout)):
-             listdrivesout[idx]=drive.split()[2]         
+def get_drives_letters(timeout=2.0):
+    '''
+    - returns the drives that answered within timeout seconds, every drive is probed at the same time, see drive_enumeration
+    - the gui doesn't wait for it, it fills its drive combo box progressively, see main_gui.start_drive_enumeration()
+    '''
+    enumerator = drive_enumeration.Drive_Enumerator(timeout=timeout)
+    enumerator.start()
+    enumerator.poll()
+    while not enumerator.is_done() and enumerator.elapsed() < timeout:
+        time.sleep(0.01)
+        enumerator.poll()
+    return enumerator.online_drives()
 
 
 def convert_digit_strings_to_int_list(input_strings):
@@ -3629,6 +4455,17 @@ def folder_is_hidden(dir):
             return False
     
 
+def make_asset_folder(folder_dir):
+    '''
+    - creates the given folder, a folder created meanwhile by someone else is taken as it is
+    '''
+    try:
+        os.mkdir(folder_dir)
+    except OSError:
+        if not os.path.isdir(folder_dir):
+            raise
+
+
 def add_double_under_scores(folder_name):
     if folder_name[:2] != '__':
         return '__' + folder_name
@@ -3667,6 +4504,13 @@ def open_video_file(vid_file):
         pass
 
 
+def open_file_in_explorer(file_path):
+    '''
+    - opens the folder of the given file in the Windows Explorer, with the file selected
+    '''
+    subprocess.Popen(r'explorer /select, {}'.format(windows_format(file_path)))
+
+
 def add_maya_reference_file_mel(src_file, dst_file):
     '''
     return a MEL string for file referencing
@@ -3692,6 +4536,7 @@ def add_maya_reference_file_mel(src_file, dst_file):
 
 
 project_manager_app = QApplication(sys.argv)         
+startup_timer.mark('qapplication')
 project_manager_gui = main_gui()   
 
 project_manager_app.setStyle('cleanlooks')
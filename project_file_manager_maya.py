@@ -33,6 +33,15 @@ import maya.mel as mel
 current_python_file_directory = r'D:/DEV/PROJECT_FILE_MANAGER/'
 sys.path.append(current_python_file_directory)
 import configuration_maya
+import folder_layout
+import template_files
+import project_staging
+import drive_enumeration
+import populate_workers
+import view_events
+import file_list_model
+import project_manifest
+import thumbnail_cache
 
 VLC_PLAYER = r'C:/Applications/vlc-2.2.4-win64/vlc.exe'
 img_exts = ['png', 'jpg', 'jpeg', 'tif', 'tiff', 'bmp']
@@ -40,6 +49,13 @@ vid_exts = ['mov', 'mpeg', 'avi', 'mp4', 'wmv']
 
 current_python_file_directory = r'D:/DEV/PROJECT_FILE_MANAGER/'
 
+# the asset folders are compiled into a flat, ordered list of relative directories only once
+asset_layout = folder_layout.compile_folder_layout(configuration_maya.assets)
+
+# every shot file starts as a copy of 'empty.ma', the template is only read once and written by the cheapest method available
+empty_maya_template = template_files.Template_File(current_python_file_directory + 'empty.ma',
+                                                   configuration_maya.shot_file_materialization, configuration_maya.hardlink_shot_files)
+
 # =======================================================
 # ======= the implementation of Folder Structures =======
 # =======================================================
@@ -53,10 +69,49 @@ class Maya_Project(object):
         self.project_root_directory = project_manager_gui.select_drive_combo_box.currentText()
         self.project_directory = self.project_root_directory + self.project_name + '/'
         self.dict_amount = dict_amount
-        self.make_folder_structure()    
+        # the manifest records the lazy shot files, see configuration_maya.lazy_shot_files
+        self.manifest = project_manifest.Project_Manifest(self.project_directory)
+        self.manifest.load()
+        if not os.path.isdir(self.project_directory) and project_staging.use_staging(configuration_maya.project_creation_mode, self.project_root_directory):
+            # a new project can be built on a local staging drive, then transferred to its drive in bulk
+            self.make_project_staged()
+        else:
+            self.make_folder_structure()    
+
+            # generates initial maya shot files
+            self.make_init_maya_shot_files(self.dict_amount)  
+
+
+    def make_project_staged(self):
+        '''
+        - builds the whole new project, folders, hidden folders and initial maya shot files, in a local staging folder,
+          then transfers it to the project drive in one pass and verifies it, see project_staging.stage_and_transfer()
+        - the staging, transfer and verification are timed separately and printed when configuration_maya.staging_report is on,
+          which tells whether configuration_maya.project_creation_mode should be 'staged' or 'direct' for the drive
+        - returns the timings
+        '''
+        target_directory = self.project_directory
+
+        def build(staging_root):
+            self.project_directory = staging_root + self.project_name + '/'
+            try:
+                self.make_folder_structure()
+                if not configuration_maya.lazy_shot_files:
+                    self.make_init_maya_shot_files(self.dict_amount)
+            finally:
+                self.project_directory = target_directory
+
+        timings = project_staging.stage_and_transfer(build, target_directory, configuration_maya.staging_directory,
+                                                     configuration_maya.materializer_threads, ('___backup', '___script'))
+        if configuration_maya.staging_report:
+            print project_staging.format_timings(timings)
 
-        # generates initial maya shot files
-        self.make_init_maya_shot_files(self.dict_amount)  
+        if configuration_maya.lazy_shot_files:
+            # the manifest is written straight into the transferred project
+            self.make_init_maya_shot_files(self.dict_amount)
+        # maya was pointed to the staging folder while the project was built
+        self.set_maya_project()
+        return timings
 
 
     def generate_maya_project(self):
@@ -68,8 +123,7 @@ class Maya_Project(object):
             os.mkdir(self.project_directory)
         except WindowsError:
             pass
-        cmds.workspace(directory = self.project_directory)
-        mel.eval('setProject "{}"'.format(self.project_directory))
+        self.set_maya_project()
         mel.eval("projectWindow;")
         mel.eval("np_editCurrentProjectCallback;")
 
@@ -82,6 +136,14 @@ class Maya_Project(object):
         shutil.rmtree(self.project_directory + 'scenes/edits/')
 
 
+    def set_maya_project(self):
+        '''
+        - sets the project directory as the current maya project
+        '''
+        cmds.workspace(directory = self.project_directory)
+        mel.eval('setProject "{}"'.format(self.project_directory))
+
+
     def directories_for_shots(self):
         '''
         - this function returns a list of directories that hold scene-shot hierarchical folders
@@ -99,69 +161,6 @@ class Maya_Project(object):
         return directories    
 
 
-    def __make_hierarchical_folders(self, parent_dir, parent_name, child_name):
-        '''
-        - this function generates folders based on given amount of parent folders and their amount of sub-folders
-        - the amount of sub-folders might be vary 
-        - parent_name is the base name of all the parent folders, it refers to "scene" folders in most of cases
-        - child_name is the base name of all the child folders, it refers to "shot" folders in most of cases
-        - parent_dir is a string type, make sure to be end with '/'
-        - dict_amount is a dictionary type, it looks like: {<scn_num>:<amount_of_shots>}, for example: {1:10,2:7,...}
-        - can pass a new dict, which adds new "scene" folders and their "shot" folders
-        - for example: dir = r'Z:\CG_Production_File_Structure\ANIMATION\Finals'
-        the first time you use make_hierarchical_folders(dir,'scn','__shot',{1:10,2:17,3:37})
-        it generates:  "scn1" with 10 "__shot" sub folders 
-                       "scn2" with 17 "__shot" sub folders 
-                       "scn1" with 37 "__shot" sub folders 
-        the second time you use make_hierarchical_folders(dir,'scn','__shot',{1:14,4:31})
-        it updates: "scn1" with 14 "__shot" sub folders 
-        and adds:   "scn4" with 31 "__shot" sub folders 
-        '''
-        dir = unix_format(parent_dir)
-    
-        #list all the folders in parent_dir
-        current_folders = os.listdir(dir)
-
-        parent_folder_surffix_digits = self.dict_amount.keys()
-
-        #create parent folders
-        for i in parent_folder_surffix_digits:
-            #check whether the parent_folder is alread existed in current_folders or not
-            parent_folder_name = parent_name + str(i)
-            if parent_folder_name not in current_folders:
-                make_folders(dir,parent_folder_name)
-    
-        #iterate all the parent folders and create their sub folders based on the given numbers
-        for k, v in self.dict_amount.iteritems():
-            # k is the scene number, and v is the amount of shots for certain scene
-            # sub_dir is one of the parent_folders under the parent_dir, which should be the "scene" folders               
-            sub_dir = dir + parent_name + str(k) + '/'
-            #list all the sub folders under current "scene" folder
-            current_sub_folders = os.listdir(sub_dir)
-            amount_of_sub_folders = v
-            sub_folder_surffix_digits = []
-            if v < 1:
-                break
-            if v == 1: 
-                sub_folder_name = child_name + str(v)
-                if sub_folder_name not in current_sub_folders:
-                    make_folders(sub_dir,sub_folder_name)
-            if v > 1:
-                sub_folder_surffix_digits = range(v)
-                # range(v) --> [0,1,...,(v-1)]
-                # we desire the surffix begins from 1 rather than 0
-                if sub_folder_surffix_digits[0] == 0:          
-                    start_num = 1              
-                # sub_folder_surffix_digits[-1] = (v-1)
-                # (v-1) + 2 = (v + 1)
-                # range(1, (v+1)) --> [1,2,...,v]
-                end_num = sub_folder_surffix_digits[-1] + 2
-                for i in range(start_num, end_num):     
-                    sub_folder_name = child_name + str(i)
-                    if sub_folder_name not in current_sub_folders:
-                        make_folders(sub_dir,sub_folder_name)
-
-
     def generate_scene_shot_folders(self):
         '''
         - this function generate scene-shots folders for directories_for_shots
@@ -170,87 +169,25 @@ class Maya_Project(object):
         '''
         dirs_for_shots = self.directories_for_shots()
         try:
-            for dir in dirs_for_shots:
-                self.__make_hierarchical_folders(dir,'SCENE_','__Shot_')    
+            scene_shot_layout = folder_layout.compile_scene_shot_layout(self.project_directory, dirs_for_shots, self.dict_amount)
+            self.materialize_layout(scene_shot_layout)
 
-            self.make_hidden_folders('backup') 
-            self.make_hidden_folders('script')   
+            self.make_hidden_folders()
                     
         except WindowsError:
             pass 
 
-    def __make_dict_folders(self, parent_dir, folder_dict):
-        '''
-        - parent_dir is string type, which indicates the directory
-        - folder_dict is dictionary, which the keys are the parent folders and values are the sub folders
-        - folder_dict can be a nested dictionary, however, the type of all the values must be list.
-        - for example,
-              dir = r'Z:\zzz\2D' 
-              d = {'a':['a1','a2','a3'],'b':['b1','b2',b3],'c':c,'z':v}     
-              b3 = {'b3':['b3_1','b3_2'],'b4':['b4_1','b4_2'],'b5':b5}
-              b5 = {'b5_5':['b5_1','b5_2']}
-              v = {'av':['az']}
-              c = {'cc':['c1','c2','c3']}
-          make_dict_folders(dir,d) this will generate a folder structure like:
-          a
-          |----a1
-          |----a2
-          |----a3
-          
-          b
-          |----b1
-          |----b2
-          |----b3
-                |----b3_1
-                |----b3_2
-          |----b4
-                |----b4_1
-                |----b4_2
-          |----b5
-                |----b5_5
-                        |----b5_1
-                        |----b5_2
-          
-          c
-          |----cc
-                |----c1
-                |----c2
-                |----c3
-          
-          z
-          |----av
-                |----az
-        '''
-        dir = unix_format(parent_dir) 
-        # list all the folders in current parent_dir
-        current_parent_folders = os.listdir(dir)
-        # iterate all keys in folder_dict, which are folders that contain child folders
-        for folder in folder_dict.keys():
-            folder_dir = dir + folder + '/'
-            # creates parnet folders under the parent_dir
-            if folder not in current_parent_folders:        
-                os.mkdir(folder_dir)
-            # list all the sub folders under current parent folder
-            current_sub_folders = os.listdir(folder_dir)
-            # use recursion to handle those "nested dict" in dict-values, 
-            # it recursively iterates all the elements until there're no more dict, then execute codes from line 163
-            if type(folder_dict[folder]) == dict:
-                self.__make_dict_folders(folder_dir,folder_dict[folder])        
-            else: 
-                # if current dict-value is not dictionary, then we iterates elements of the list
-                for sub_folder in folder_dict[folder]:
-                    sub_folder_dir = folder_dir + str(sub_folder) + '/'  
-                    # use recursion to handle those "nested dict" in list-elements
-                    # it recursively iterates all the elements until there're no more dict, then execute codes from line 163
-                    if type(sub_folder) == dict:
-                        self.__make_dict_folders(folder_dir,sub_folder)
-                    #can also pass an empty list, which indicates there's no sub folder under current parent folder
-                    elif sub_folder == []:
-                        os.mkdir(folder_dir)
-                    else:
-                    # finally, there're no more nested dict, can create folders one by one based on the elements from the list
-                        if sub_folder not in current_sub_folders:                  
-                            os.mkdir(sub_folder_dir)                 
+
+    def materialize_layout(self, layout, root_directory=None, assume_missing=False):
+        '''
+        - creates the missing directories of a compiled layout under root_directory, which is the project directory by default
+        - configuration_maya.materializer_mode picks the serial or the parallel materializer
+        - returns a list of the directories that were created
+        '''
+        if root_directory == None:
+            root_directory = self.project_directory
+        return folder_layout.materialize_layout(root_directory, layout, False,
+                                                configuration_maya.materializer_mode, configuration_maya.materializer_threads, assume_missing)
 
 
     def make_folder_structure(self):
@@ -262,45 +199,25 @@ class Maya_Project(object):
         asset_directory = self.project_directory + r'assets/'
 
         try:
-            # create department folders        
-            self.__make_dict_folders(asset_directory, configuration_maya.assets)
-            self.make_hidden_folders('backup') 
-            self.make_hidden_folders('script') 
-            # creates scene-shots hierarchical folders
+            # create department folders, only the missing ones are created
+            self.materialize_layout(asset_layout, asset_directory)
+            # creates scene-shots hierarchical folders, and then the hidden folders of the whole project in one pass
             self.generate_scene_shot_folders()
 
         except AttributeError:
             pass
 
 
-    def make_hidden_folders(self, folder_name):
+    def make_hidden_folders(self, *folder_names):
         '''
         - create a hidden folders for all the 3d assets and shot files
-        - useful for making '___backup' folder and '___script' folder 
-        - can pass 'backup' or 'script' for the 'folder_name'
+        - useful for making '___backup' folder and '___script' folder, both of them are made in one pass when no 'folder_names' is given
+        - can pass 'backup' and/or 'script' for the 'folder_names'
+        - the traversal never descends into the '___' folders and skips the folders that are already hidden
         '''
-        # collect the proper dirs for the 'backup' folder
-        dirs_for_hidden_folders = []
-
-        for path, dirs, files in os.walk(self.project_directory):
-            path = unix_format(path)
-            if path.split('/')[-2][:2] == '__' and path.split('/')[-2][:3] != '___':
-                dirs_for_hidden_folders.append(path) 
-        
-        # create the 'backup' folders in collected dirs above
-
-        for dir in dirs_for_hidden_folders:
-            folder_dir = unix_format(dir) + '___' + folder_name
-            try:
-                
-                os.mkdir(folder_dir)
-            except WindowsError:
-                pass 
-            # hide the folder 
-            if os.path.isdir(folder_dir):               
-                # SetFileAttributesW(unicode(folder_dir), 2) ----> hide the folder
-                # SetFileAttributesW(unicode(folder_dir), 1) ----> unhide the folder
-                ctypes.windll.kernel32.SetFileAttributesW(unicode(folder_dir), 2)
+        if not folder_names:
+            folder_names = ('backup', 'script')
+        return folder_layout.make_hidden_folders(self.project_directory, ['___' + name for name in folder_names])
 
 
     def add_scene_shot_folders(self, new_dict_amount):
@@ -313,17 +230,38 @@ class Maya_Project(object):
             for k, v in new_dict_amount.iteritems():
                 update_shot_dict(self.dict_amount, k, v)
             dirs_for_shots = self.directories_for_shots()
-            for dir in dirs_for_shots:
-                self.__make_hierarchical_folders(dir,'SCENE_','__Shot_')
-
-            self.make_hidden_folders('backup') 
-            self.make_hidden_folders('script')  
-
-            self.make_init_maya_shot_files(new_dict_amount)  
+            # only the scenes of the new dict are looked at, the cost doesn't grow with the amount of existing scenes
+            shot_files = {} if configuration_maya.lazy_shot_files else self.shot_file_patterns()
+            delta = folder_layout.plan_scene_shot_delta(self.project_directory, dirs_for_shots, new_dict_amount, shot_files)
+            self.apply_scene_shot_delta(delta)
+            if configuration_maya.lazy_shot_files:
+                self.make_init_maya_shot_files(new_dict_amount)
         except AttributeError:
             pass            
 
 
+    def shot_file_patterns(self):
+        '''
+        - returns a dictionary which tells the maya files that belong into the shot folders of every shot directory
+        - it looks like: {<shot_directory>: [<file_name_pattern>, ...]}, for example: {'Z:/proj/ANIMATION/Finals/': ['anim_scene_{0}_shot_{1}.ma']}
+        '''
+        shot_types = ['anim_', 'layout_', 'vfx_', 'render_', 'light_', 'geo_']
+        patterns = {self.project_directory + 'scenes/': [type + 'scene_{0}_shot_{1}.ma' for type in shot_types]}
+        return patterns
+
+
+    def apply_scene_shot_delta(self, delta):
+        '''
+        - creates the scene-shot folders, the hidden folders and the shot files planned by folder_layout.plan_scene_shot_delta()
+        - everything in the delta is known to be missing, so nothing is listed or walked again
+        '''
+        self.materialize_layout(delta['folders'] + delta['hidden_folders'], assume_missing=True)
+        for hidden_folder in delta['hidden_folders']:
+            folder_layout.hide_folder(self.project_directory + hidden_folder)
+
+        empty_maya_template.materialize_files(delta['files'])
+
+
     def exec_once_when_init(in_class_method):
         @wraps(in_class_method)
         def wrapper( *args, **kwargs):
@@ -900,50 +838,50 @@ class Maya_Project(object):
         '''
         - this function generates empty maya files for all the shots based on the given dictionary of scene-shots
         - 'dict_scene_shot' is an argument of dict type
+        - the files are written by empty_maya_template, configuration_maya.shot_file_materialization picks the method
+        - an existing file is left untouched
+        - returns the stats of the written files, which include the bytes and system calls saved compared with plain copies,
+          they're printed when configuration_maya.shot_file_report is on
+        - with configuration_maya.lazy_shot_files, the files are only recorded in the project manifest,
+          each of them is created from the template when it's first opened, referenced or versioned
         '''
-        empty_maya_file = windows_format(current_python_file_directory + 'empty.ma')
+        if configuration_maya.lazy_shot_files:
+            if self.manifest.add_lazy_shot_files(self.shot_file_patterns(), dict_scene_shot):
+                self.manifest.save()
+            return template_files.new_stats()
 
-        for scn_number, shot_amount in dict_scene_shot.iteritems():          
-            
-            for shot_number in range(shot_amount):
-
-                anim_shot_file          =   self.make_maya_shot_file_strings('anim_',       scn_number, (shot_number+1))
-                layout_shot_file        =   self.make_maya_shot_file_strings('layout_',     scn_number, (shot_number+1))
-                vfx_shot_file           =   self.make_maya_shot_file_strings('vfx_',        scn_number, (shot_number+1))
-                render_shot_file        =   self.make_maya_shot_file_strings('render_',     scn_number, (shot_number+1))
-                light_shot_file         =   self.make_maya_shot_file_strings('light_',      scn_number, (shot_number+1))
-                geo_shot_file           =   self.make_maya_shot_file_strings('geo_',        scn_number, (shot_number+1))
-               
-                if not os.path.isfile(anim_shot_file):
-                    shutil.copyfile(empty_maya_file, anim_shot_file)
-                else:
-                    pass
+        shot_files = []
+        for shot_dir, patterns in self.shot_file_patterns().iteritems():
+            for scn_number, shot_amount in dict_scene_shot.iteritems():
+                for shot_number in range(1, shot_amount + 1):
+                    folder_dir = shot_dir + 'SCENE_{0}/__Shot_{1}/'.format(str(scn_number), str(shot_number))
+                    for pattern in patterns:
+                        shot_files.append(folder_dir + pattern.format(str(scn_number), str(shot_number)))
 
-                if not os.path.isfile(layout_shot_file):
-                    shutil.copyfile(empty_maya_file, layout_shot_file)
-                else:
-                    pass                    
+        stats = empty_maya_template.materialize_files(shot_files)
+        if configuration_maya.shot_file_report:
+            print template_files.format_stats(stats)
+        return stats
 
-                if not os.path.isfile(vfx_shot_file):
-                    shutil.copyfile(empty_maya_file, vfx_shot_file)
-                else:
-                    pass                    
 
-                if not os.path.isfile(render_shot_file):
-                    shutil.copyfile(empty_maya_file, render_shot_file)      
-                else:
-                    pass                    
-                    
-                if not os.path.isfile(geo_shot_file):
-                    shutil.copyfile(empty_maya_file, geo_shot_file)
-                else:
-                    pass                    
+    def lazy_shot_files(self, folder_directory):
+        '''
+        - returns the names of the lazy shot files intended for the given shot folder, whether they're on disk or not
+        '''
+        return self.manifest.lazy_shot_files(folder_directory)
 
-                if not os.path.isfile(anim_shot_file):
-                    shutil.copyfile(empty_maya_file, anim_shot_file)
-                else:
-                    pass                    
 
+    def materialize_lazy_shot_file(self, file_path):
+        '''
+        - creates an intended lazy shot file from the template, the first time it's used
+        - returns True if the file exists afterwards
+        '''
+        if os.path.isfile(file_path):
+            return True
+        if not self.manifest.is_lazy_shot_file(file_path):
+            return False
+        empty_maya_template.materialize(file_path)
+        return os.path.isfile(file_path)
 
     def get_char_design_dir(self):
         '''
@@ -1134,6 +1072,11 @@ class main_gui(MayaQWidgetDockableMixin, QWidget):
 
         self.setParent(mayaMainWindow)
 
+        # the thumbnails of the images of the 2D drawings are made on a pool of their own and kept on disk, see thumbnail_cache
+        self.thumbnail_loader = thumbnail_cache.Thumbnail_Loader(thumbnail_cache.Thumbnail_Cache(configuration_maya.thumbnail_cache_directory,
+                                                                                                 configuration_maya.thumbnail_size),
+                                                                 configuration_maya.thumbnail_threads, img_exts, self)
+
         self.main_layout = QVBoxLayout()
         
         self.main_stacked_widget = QWidget()
@@ -1210,10 +1153,9 @@ class main_gui(MayaQWidgetDockableMixin, QWidget):
         self.select_drive_combo_box = QComboBox()
         self.select_drive_combo_box.setFixedWidth(47)       
 
-        # clear and populate drive letters into the combox
+        # the drives are probed in background and added as they answer, see start_drive_enumeration()
         self.select_drive_combo_box.clear()
-        self.drive_list = get_drives_letters()
-        self.select_drive_combo_box.addItems(self.drive_list)        
+        self.drive_list = []
         
         self.create_project_button = QPushButton('Create Project')
         self.create_project_button.setFixedWidth(170)  
@@ -1349,42 +1291,90 @@ class main_gui(MayaQWidgetDockableMixin, QWidget):
         self.setWindowFlags(Qt.Dialog)
         self.setWindowTitle('PROJECT FILE MANAGER')
         
-        self.refresh_design_tabs_dict = { 0:        'self.populate_items_in_focused_tab("CHARACTER", self.create_design_tab_widgets)', 
-                                          1:        'self.populate_items_in_focused_tab("PROPS", self.create_design_tab_widgets)',
-                                          2:        'self.populate_items_in_focused_tab("COMPONENT", self.create_design_tab_widgets)',
-                                          3:        'self.populate_items_in_focused_tab("ENVIRONMENT", self.create_design_tab_widgets)',
-                                          4:        'self.populate_items_in_focused_tab("CONTINUITY", self.create_design_tab_widgets)'}        
-
-        self.refresh_shot_tabs_dict = {   0:        'self.populate_items_in_shot_tab("Model")',
-                                          1:        'self.populate_items_in_shot_tab("Layout")',
-                                          2:        'self.populate_items_in_shot_tab("Layout_MOV")',
-                                          3:        'self.populate_items_in_shot_tab("Animation")',
-                                          4:        'self.populate_items_in_shot_tab("Animation_MOV")',
-                                          5:        'self.populate_items_in_shot_tab("Anim_Cache")',    
-                                          6:        'self.populate_items_in_shot_tab("Lighting")',
-                                          7:        'self.populate_items_in_shot_tab("VFX")',
-                                          8:        'self.populate_items_in_shot_tab("VFX_Cache")',
-                                          9:        'self.populate_items_in_shot_tab("Rendering")' }
+        # the tabs are populated by these callables, looked up by the indexes of the current tabs, see refresh_current_ui()
+        self.refresh_design_tabs_dict = { 0:        partial(self.populate_items_in_focused_tab, "CHARACTER", self.create_design_tab_widgets), 
+                                          1:        partial(self.populate_items_in_focused_tab, "PROPS", self.create_design_tab_widgets),
+                                          2:        partial(self.populate_items_in_focused_tab, "COMPONENT", self.create_design_tab_widgets),
+                                          3:        partial(self.populate_items_in_focused_tab, "ENVIRONMENT", self.create_design_tab_widgets),
+                                          4:        partial(self.populate_items_in_focused_tab, "CONTINUITY", self.create_design_tab_widgets)}        
+
+        self.refresh_shot_tabs_dict = {   0:        partial(self.populate_items_in_shot_tab, "Model"),
+                                          1:        partial(self.populate_items_in_shot_tab, "Layout"),
+                                          2:        partial(self.populate_items_in_shot_tab, "Layout_MOV"),
+                                          3:        partial(self.populate_items_in_shot_tab, "Animation"),
+                                          4:        partial(self.populate_items_in_shot_tab, "Animation_MOV"),
+                                          5:        partial(self.populate_items_in_shot_tab, "Anim_Cache"),    
+                                          6:        partial(self.populate_items_in_shot_tab, "Lighting"),
+                                          7:        partial(self.populate_items_in_shot_tab, "VFX"),
+                                          8:        partial(self.populate_items_in_shot_tab, "VFX_Cache"),
+                                          9:        partial(self.populate_items_in_shot_tab, "Rendering") }
         
-        self.refresh_asset_tabs_dict = {  (0,0):    'self.populate_asset_model_char_tab()',
-                                          (0,1):    'self.populate_asset_model_component_tab()',
-                                          (0,2):    'self.populate_asset_model_environment_tab()',
-                                          (0,3):    'self.populate_asset_model_props_tab()',
-                                          (1,0):    'self.populate_asset_rig_char_tab()',
-                                          (1,1):    'self.populate_asset_rig_props_tab()',
-                                          (2,0):    'self.populate_asset_shader_tab()',
-                                          (2,1):    'self.populate_asset_texture_tab()',
-                                          (3,0):    'self.populate_items_in_asset_tab("TEMPLATE_CHARACTER")',
-                                          (3,1):    'self.populate_items_in_asset_tab("TEMPLATE_ENVIRONMENT")',
-                                          (3,2):    'self.populate_items_in_asset_tab("TEMPLATE_RENDERING")' }
-
-        self.refresh_ui_dict = { 0: 'self.refresh_design_tabs_dict.get(self.get_design_tabs_current_index())',
-                                 1: 'self.refresh_asset_tabs_dict.get(self.get_asset_tabs_current_index())' ,
-                                 2: ''}        
+        self.refresh_asset_tabs_dict = {  (0,0):    self.populate_asset_model_char_tab,
+                                          (0,1):    self.populate_asset_model_component_tab,
+                                          (0,2):    self.populate_asset_model_environment_tab,
+                                          (0,3):    self.populate_asset_model_props_tab,
+                                          (1,0):    self.populate_asset_rig_char_tab,
+                                          (1,1):    self.populate_asset_rig_props_tab,
+                                          (2,0):    self.populate_asset_shader_tab,
+                                          (2,1):    self.populate_asset_texture_tab,
+                                          (3,0):    partial(self.populate_items_in_asset_tab, "TEMPLATE_CHARACTER"),
+                                          (3,1):    partial(self.populate_items_in_asset_tab, "TEMPLATE_ENVIRONMENT"),
+                                          (3,2):    partial(self.populate_items_in_asset_tab, "TEMPLATE_RENDERING") }
+
+        self.refresh_ui_dict = { 0: lambda: self.refresh_design_tabs_dict.get(self.get_design_tabs_current_index()),
+                                 1: lambda: self.refresh_asset_tabs_dict.get(self.get_asset_tabs_current_index()),
+                                 2: lambda: None }
 
 
         self.current_project = None
-        
+        # the directory scans of the views run on a thread pool, see populate_workers.Populate_Pool
+        self.populate_pool = populate_workers.Populate_Pool(configuration_maya.populate_threads, self)
+        # the clicks of the views are routed to their current folder type and directory, see view_events.Click_Router
+        self.click_router = view_events.Click_Router(configuration_maya.click_debounce_ms, self)
+
+        self.start_drive_enumeration()
+
+
+    def start_drive_enumeration(self):
+        '''
+        - fills the drive combo box progressively, every drive is probed in background, see drive_enumeration.Drive_Enumerator
+        - a drive that doesn't answer within configuration_maya.drive_probe_timeout seconds is listed greyed out as not responding,
+          it's enabled if it answers later and removed if it's offline
+        '''
+        self.drive_enumerator = drive_enumeration.Drive_Enumerator(timeout=configuration_maya.drive_probe_timeout)
+        self.drive_enumerator.start()
+        self.drive_poll_timer = QTimer(self)
+        self.drive_poll_timer.timeout.connect(lambda: self.add_probed_drives())
+        self.drive_poll_timer.start(50)
+
+
+    def add_probed_drives(self):
+        '''
+        - adds the drives that answered since the last call to the drive combo box, in the order of their letters
+        - a greyed out drive is never left selected, the first responding one is selected instead
+        '''
+        for drive, status in self.drive_enumerator.poll():
+            if status == 'offline':
+                if drive in self.drive_list:
+                    self.select_drive_combo_box.removeItem(self.drive_list.index(drive))
+                    self.drive_list.remove(drive)
+                continue
+            if drive not in self.drive_list:
+                self.drive_list.append(drive)
+                self.drive_list.sort()
+                self.select_drive_combo_box.insertItem(self.drive_list.index(drive), drive)
+            item = self.select_drive_combo_box.model().item(self.drive_list.index(drive))
+            item.setEnabled(status == 'online')
+            item.setToolTip('' if status == 'online' else 'not responding')
+
+        current_item = self.select_drive_combo_box.model().item(self.select_drive_combo_box.currentIndex())
+        if current_item == None or not current_item.isEnabled():
+            online_drives = [drive for drive in self.drive_list if self.drive_enumerator.status.get(drive) == 'online']
+            self.select_drive_combo_box.setCurrentIndex(self.drive_list.index(online_drives[0]) if online_drives else -1)
+
+        if self.drive_enumerator.is_done() or self.drive_enumerator.elapsed() > configuration_maya.drive_probe_give_up:
+            self.drive_poll_timer.stop()
+
 
     def eval_get_current_project(self):        
         self.current_project = self.get_current_project()
@@ -1427,9 +1417,8 @@ class main_gui(MayaQWidgetDockableMixin, QWidget):
         self.create_design_tab_widgets[treeView2].setFixedWidth(407)   
         self.create_design_tab_widgets[treeView2].setSelectionBehavior(QAbstractItemView.SelectRows)
         self.create_design_tab_widgets[treeView2].setSelectionMode(QAbstractItemView.ExtendedSelection)
-        self.create_design_tab_widgets[model2] = QStandardItemModel()
-        self.create_design_tab_widgets[model2].setHorizontalHeaderLabels(['>>> FILE <<<'.upper()])   
-        self.create_design_tab_widgets[treeView2].setModel(self.create_design_tab_widgets[model2])            
+        self.create_design_tab_widgets[model2] = file_list_model.install_file_list_model(self.create_design_tab_widgets[treeView2], '>>> FILE <<<'.upper(),
+                                                                                               self.thumbnail_loader)
 
         self.create_design_tab_widgets[button2] = QPushButton('Open in File Explorer')
         self.create_design_tab_widgets[button2].setMinimumWidth(177)
@@ -1475,9 +1464,7 @@ class main_gui(MayaQWidgetDockableMixin, QWidget):
         self.create_asset_tab_widgets[treeView2].setFixedWidth(277)   
         self.create_asset_tab_widgets[treeView2].setSelectionBehavior(QAbstractItemView.SelectRows)
         self.create_asset_tab_widgets[treeView2].setSelectionMode(QAbstractItemView.ExtendedSelection)
-        self.create_asset_tab_widgets[model2] = QStandardItemModel()
-        self.create_asset_tab_widgets[model2].setHorizontalHeaderLabels(['>>> File <<<'.upper()])   
-        self.create_asset_tab_widgets[treeView2].setModel(self.create_asset_tab_widgets[model2])   
+        self.create_asset_tab_widgets[model2] = file_list_model.install_file_list_model(self.create_asset_tab_widgets[treeView2], '>>> File <<<'.upper())
 
         self.asset_type_history_file_widget = QTreeWidget()
         self.asset_type_history_file_widget.setFixedHeight(730)
@@ -1487,9 +1474,7 @@ class main_gui(MayaQWidgetDockableMixin, QWidget):
         self.create_asset_tab_widgets[treeView3].setFixedWidth(277)   
         self.create_asset_tab_widgets[treeView3].setSelectionBehavior(QAbstractItemView.SelectRows)
         self.create_asset_tab_widgets[treeView3].setSelectionMode(QAbstractItemView.ExtendedSelection)
-        self.create_asset_tab_widgets[model3] = QStandardItemModel()
-        self.create_asset_tab_widgets[model3].setHorizontalHeaderLabels(['>>> HISTORY <<<'.upper()])   
-        self.create_asset_tab_widgets[treeView3].setModel(self.create_asset_tab_widgets[model3])
+        self.create_asset_tab_widgets[model3] = file_list_model.install_file_list_model(self.create_asset_tab_widgets[treeView3], '>>> HISTORY <<<'.upper())
         
         self.create_asset_tab_widgets[button2] = QPushButton('Open')
         self.create_asset_tab_widgets[button2].setFixedWidth(170)
@@ -1548,9 +1533,7 @@ class main_gui(MayaQWidgetDockableMixin, QWidget):
         self.create_shot_tab_widgets[treeView2].setFixedWidth(277)   
         self.create_shot_tab_widgets[treeView2].setSelectionBehavior(QAbstractItemView.SelectRows)
         self.create_shot_tab_widgets[treeView2].setSelectionMode(QAbstractItemView.ExtendedSelection)
-        self.create_shot_tab_widgets[model2] = QStandardItemModel()
-        self.create_shot_tab_widgets[model2].setHorizontalHeaderLabels(['>>> File <<<'.upper()])   
-        self.create_shot_tab_widgets[treeView2].setModel(self.create_shot_tab_widgets[model2])   
+        self.create_shot_tab_widgets[model2] = file_list_model.install_file_list_model(self.create_shot_tab_widgets[treeView2], '>>> File <<<'.upper())
 
         self.shot_type_history_file_widget = QTreeWidget()
         self.shot_type_history_file_widget.setFixedHeight(730)
@@ -1560,9 +1543,7 @@ class main_gui(MayaQWidgetDockableMixin, QWidget):
         self.create_shot_tab_widgets[treeView3].setFixedWidth(277)   
         self.create_shot_tab_widgets[treeView3].setSelectionBehavior(QAbstractItemView.SelectRows)
         self.create_shot_tab_widgets[treeView3].setSelectionMode(QAbstractItemView.ExtendedSelection)
-        self.create_shot_tab_widgets[model3] = QStandardItemModel()
-        self.create_shot_tab_widgets[model3].setHorizontalHeaderLabels(['>>> HISTORY <<<'.upper()])   
-        self.create_shot_tab_widgets[treeView3].setModel(self.create_shot_tab_widgets[model3])
+        self.create_shot_tab_widgets[model3] = file_list_model.install_file_list_model(self.create_shot_tab_widgets[treeView3], '>>> HISTORY <<<'.upper())
 
         self.create_shot_tab_widgets[line_edit1] = QLineEdit()
         self.create_shot_tab_widgets[line_edit1].setFixedWidth(170) 
@@ -1677,50 +1658,55 @@ class main_gui(MayaQWidgetDockableMixin, QWidget):
             return None
         
         
-    def update_scene_shot_dict(self):
-        #current_project = self.get_current_project()
-        new_scene_shot_dict = {}
-        if self.current_project != None:
-
-            current_scene_shot_dict = self.current_project.get_current_scene_shot_dict(True)      
-            
-            try:        
-                for single_shot_tab in self.shot_categories:     
-                
-                    treeView1   = single_shot_tab + '_treeView1'
-                    model1      = single_shot_tab + '_model1'
-                    treeView2   = single_shot_tab + '_treeView2'
-                    model2      = single_shot_tab + '_model2'
-                    line_edit1  = single_shot_tab + '_line_edit1'
-                    line_edit2  = single_shot_tab + '_line_edit2'
-                    button1     = single_shot_tab + '_button1'
-                    button2     = single_shot_tab + '_button2'
-                    button3     = single_shot_tab + '_button3'     
-                    
-                    new_scenes = convert_digit_strings_to_int_list(self.create_shot_tab_widgets[line_edit1].text())
-                    new_shots = convert_digit_strings_to_int_list(self.create_shot_tab_widgets[line_edit2].text())
-                
-                    if new_scenes != None and new_shots != None:
-                        for new_scn, new_shot in zip(new_scenes, new_shots):
-                            new_scene_shot_dict = update_shot_dict(current_scene_shot_dict, new_scn, new_shot)    
-                                    
-                    else:
-                        continue   
+    def entered_scene_shot_dict(self):
+        '''
+        - returns the scenes and shot amounts entered in the line edits of the shot tabs, e.g. {40:13}, without the existing scenes
+        '''
+        entered_dict = {}
+        try:        
+            for single_shot_tab in self.shot_categories:     
+                line_edit1  = single_shot_tab + '_line_edit1'
+                line_edit2  = single_shot_tab + '_line_edit2'
                 
-                return new_scene_shot_dict
-           
-            except TypeError, ValueError:
-                pass
-        else:
+                new_scenes = convert_digit_strings_to_int_list(self.create_shot_tab_widgets[line_edit1].text())
+                new_shots = convert_digit_strings_to_int_list(self.create_shot_tab_widgets[line_edit2].text())
+            
+                if new_scenes != None and new_shots != None:
+                    for new_scn, new_shot in zip(new_scenes, new_shots):
+                        update_shot_dict(entered_dict, new_scn, new_shot)    
+        except (TypeError, ValueError):
+            pass
+        return entered_dict
+
+
+    def update_scene_shot_dict(self, entered_dict=None):
+        '''
+        - returns the current scene-shot table of the project updated by the entered scenes, see entered_scene_shot_dict()
+        '''
+        #current_project = self.get_current_project()
+        if self.current_project == None:
             return None
+        if entered_dict == None:
+            entered_dict = self.entered_scene_shot_dict()
+        if not entered_dict:
+            return {}
+
+        new_scene_shot_dict = self.current_project.get_current_scene_shot_dict(True)      
+        for new_scn, new_shot in entered_dict.iteritems():
+            new_scene_shot_dict = update_shot_dict(new_scene_shot_dict, new_scn, new_shot)    
+        return new_scene_shot_dict
 
 
     def generate_new_scene_shot_folders(self):
         #current_project = self.get_current_project()
-        new_scene_shot_dict = self.update_scene_shot_dict()
+        # only the entered scenes are planned, so adding a shot to scene 40 never lists the folders of scenes 1-39
+        entered_dict = self.entered_scene_shot_dict()
+        new_scene_shot_dict = self.update_scene_shot_dict(entered_dict)
+        if not new_scene_shot_dict:
+            return
 
         try:            
-            self.current_project.add_scene_shot_folders(new_scene_shot_dict)
+            self.current_project.add_scene_shot_folders(entered_dict)
             self.current_project.dict_amount = new_scene_shot_dict
 
         except AttributeError:
@@ -1744,25 +1730,26 @@ class main_gui(MayaQWidgetDockableMixin, QWidget):
 
 
     def populate_folders_into_qtreeview(self, folder_type, widget_dict, parent_directory):
-
+        '''
+        - lists the folders of parent_directory on the populate pool, the model is filled once the rows arrive
+        '''
         treeView1 = folder_type + '_treeView1'
         model1 = folder_type + '_model1'
 
-        try:
+        def show_folders(folder_names):
             widget_dict[model1].clear()
             widget_dict[model1].setHorizontalHeaderLabels(['>>> {} <<<'.format(folder_type).upper()])  
+            for folder in folder_names:
+                item = QStandardItem(remove_double_under_scores(folder))
+                item.setIcon(widget_dict[treeView1].style().standardIcon(QStyle.SP_DirIcon))
+                item.setEditable(False)
+                widget_dict[model1].appendRow([item])                                           
 
-            if os.path.isdir(parent_directory):
-                for folder in os.listdir(parent_directory):
-
-                    item = QStandardItem(remove_double_under_scores(folder))
-
-                    item.setIcon(widget_dict[treeView1].style().standardIcon(QStyle.SP_DirIcon))
-                    item.setEditable(False)
-                    if os.path.isdir(parent_directory + folder):
-                        widget_dict[model1].appendRow([item])                                           
+        try:
+            self.populate_pool.request(model1, lambda: populate_workers.list_folders(parent_directory), show_folders,
+                                       (folder_type, unix_format(parent_directory)))
 
-            widget_dict[treeView1].clicked.connect(lambda: self.populate_files_into_qtreeview(folder_type, widget_dict, parent_directory))
+            self.click_router.route(widget_dict[treeView1], treeView1, lambda: self.populate_files_into_qtreeview(folder_type, widget_dict, parent_directory))
 
             
         except UnboundLocalError, WindowsError:
@@ -1770,52 +1757,31 @@ class main_gui(MayaQWidgetDockableMixin, QWidget):
 
 
     def populate_hierarchical_folders_into_qtreeview(self, folder_type, widget_dict, parent_directory):
-        
+        '''
+        - lists the folders of parent_directory and their sub-folders on the populate pool, the model is filled once the rows arrive
+        '''
         treeView1 = folder_type + '_treeView1'
         model1 = folder_type + '_model1'
 
-        try:            
+        def show_folders(rows):
             widget_dict[model1].clear()                    
             widget_dict[model1].setHorizontalHeaderLabels(['>>> {} <<<'.format(folder_type).upper()])  
-            
-            try:
-                if os.path.isdir(parent_directory):
-                    
-                    for folder in os.listdir(parent_directory):
-                       
-                        
-                        item = QStandardItem(remove_double_under_scores(folder))
-                  
-                        item.setIcon(widget_dict[treeView1].style().standardIcon(QStyle.SP_DirIcon))
-                     
-                        item.setEditable(False)
-                   
-                        sub_dir = unix_format(os.path.join(parent_directory, folder))
-                   
-                        if os.path.isdir(sub_dir):
-                            
-                            sub_folders = os.listdir(sub_dir)
-                        
-                            for sub_folder in sub_folders: 
-                              
-                                #  filter out those hidden '___Backup' folders
-                                test_dir = unix_format(os.path.join(sub_dir, sub_folder))
-                             
-                                if os.path.isdir(test_dir) and not(folder_is_hidden(test_dir)):  
-                                                                                             
-                                    sub_item = QStandardItem(remove_double_under_scores(sub_folder)) 
-                                
-                                    sub_item.setIcon(widget_dict[treeView1].style().standardIcon(QStyle.SP_DirIcon))
-                                    sub_item.setEditable(False)
-                             
-                                    item.appendRow([sub_item])                        
-                              
-                        widget_dict[model1].appendRow([item])     
-                   
-            except TypeError:
-                pass                                      
+            for folder, sub_folders in rows:
+                item = QStandardItem(remove_double_under_scores(folder))
+                item.setIcon(widget_dict[treeView1].style().standardIcon(QStyle.SP_DirIcon))
+                item.setEditable(False)
+                for sub_folder in sub_folders: 
+                    sub_item = QStandardItem(remove_double_under_scores(sub_folder)) 
+                    sub_item.setIcon(widget_dict[treeView1].style().standardIcon(QStyle.SP_DirIcon))
+                    sub_item.setEditable(False)
+                    item.appendRow([sub_item])                        
+                widget_dict[model1].appendRow([item])     
+
+        try:            
+            self.populate_pool.request(model1, lambda: populate_workers.list_hierarchical_folders(parent_directory), show_folders,
+                                       (folder_type, unix_format(parent_directory)))
        
-            widget_dict[treeView1].clicked.connect(lambda: self.populate_files_into_qtreeview(folder_type, widget_dict, parent_directory))
+            self.click_router.route(widget_dict[treeView1], treeView1, lambda: self.populate_files_into_qtreeview(folder_type, widget_dict, parent_directory))
   
         except UnboundLocalError, WindowsError:
             pass  
@@ -1835,6 +1801,7 @@ class main_gui(MayaQWidgetDockableMixin, QWidget):
         if '/' not in folder_name and 'SCENE_' in folder_name:
             # if '/' not in folder_name means current selected folder is not a child folder
             # and if 'SCENE_' not in folder_name means current selected folder should be an asset folder so it could jump to the 'else' block below.
+            self.populate_pool.cancel(folder_type + '_files')
             
             widget_dict[model2].clear()
             widget_dict[model2].setHorizontalHeaderLabels(['>>> file <<<'.upper()])     
@@ -1847,80 +1814,17 @@ class main_gui(MayaQWidgetDockableMixin, QWidget):
         else:       
             
             try:
-                # populate the active files
+                # the active and the history files are listed on the populate pool, see show_active_and_history_files()
                 folder_directory = unix_format(parent_directory) + folder_name
+                self.populate_pool.request(folder_type + '_files',
+                                           lambda: populate_workers.list_active_and_history_files(folder_directory),
+                                           lambda rows: self.show_active_and_history_files(folder_type, widget_dict, folder_directory, rows),
+                                           (folder_type, folder_directory))
 
-                widget_dict[model2].clear()
-                widget_dict[model2].setHorizontalHeaderLabels(['>>> file <<<'.upper()])   
-
-                try:
-                    widget_dict[model3].clear()
-                    widget_dict[model3].setHorizontalHeaderLabels(['>>> history <<<'.upper()])  
-                except KeyError:
-                    pass                       
-
-                if os.path.isdir(folder_directory):
-                    for file in os.listdir(folder_directory):                                            
-                        # filter out the hidden folder '___backup'
-                        candidate_dir = os.path.join(unix_format(folder_directory), file)
-
-                        if not(os.path.isdir(candidate_dir)):  
-
-                            #self.clear_non_focus_qtreeview_selection(folder_type, widget_dict, 2)  
-                            item = QStandardItem(file)                
-
-                            item.setIcon(widget_dict[treeView2].style().standardIcon(QStyle.SP_FileIcon))
-                            item.setEditable(False)
-
-                            widget_dict[model2].appendRow([item])
-                else:
-                    widget_dict[model2].clear()
-                    widget_dict[model2].setHorizontalHeaderLabels(['>>> file <<<'.upper()]) 
-
-                    try:
-                        widget_dict[model3].clear()
-                        widget_dict[model3].setHorizontalHeaderLabels(['>>> history <<<'.upper()])   
-                    except KeyError:
-                        pass                      
-
-                # populate the history files
-                backup_directory = unix_format(parent_directory) + folder_name + '\___backup'
-                try:
-                    widget_dict[model3].clear()
-                    widget_dict[model3].setHorizontalHeaderLabels(['>>> history <<<'.upper()])        
-                except KeyError:
-                    pass
-
-                if os.path.isdir(backup_directory):
-                    for file in os.listdir(backup_directory):
-                        # filter out the hidden folder '___script'
-                        candidate_dir = os.path.join(unix_format(folder_directory), file)
-                        if not(os.path.isdir(candidate_dir)):      
-                            try:
-                                #self.clear_non_focus_qtreeview_selection(folder_type, widget_dict, 3)                                               
-                                item = QStandardItem(file)                            
-                                           
-                           
-                                item.setIcon(widget_dict[treeView3].style().standardIcon(QStyle.SP_FileIcon))
-                                item.setEditable(False)
-
-                                widget_dict[model3].appendRow([item])
-                            except KeyError:
-                                pass
-                else:
-                    widget_dict[model2].clear()
-                    widget_dict[model2].setHorizontalHeaderLabels(['>>> file <<<'.upper()]) 
-
-                    try:
-                        widget_dict[model3].clear()
-                        widget_dict[model3].setHorizontalHeaderLabels(['>>> history <<<'.upper()])     
-                    except KeyError:
-                        pass                  
-
-                widget_dict[treeView2].clicked.connect(lambda: self.clear_non_focus_qtreeview_selection(folder_type, widget_dict, 2))    
+                self.click_router.route(widget_dict[treeView2], treeView2, lambda: self.clear_non_focus_qtreeview_selection(folder_type, widget_dict, 2), 0)    
                 #widget_dict[treeView2].clicked.connect(lambda: self.get_selected_file_dir(folder_type, 'maya', widget_dict, parent_directory))
                 try:
-                    widget_dict[treeView3].clicked.connect(lambda: self.clear_non_focus_qtreeview_selection(folder_type, widget_dict, 3)) 
+                    self.click_router.route(widget_dict[treeView3], treeView3, lambda: self.clear_non_focus_qtreeview_selection(folder_type, widget_dict, 3), 0) 
                     #widget_dict[treeView3].clicked.connect(lambda: self.get_selected_file_dir(folder_type, 'history', widget_dict, parent_directory))
                 except KeyError:
                     pass
@@ -1929,6 +1833,33 @@ class main_gui(MayaQWidgetDockableMixin, QWidget):
                 pass
 
 
+    def show_active_and_history_files(self, folder_type, widget_dict, folder_directory, rows):
+        '''
+        - fills the file and the history views of the folder type with the rows of populate_workers.list_active_and_history_files()
+        - the files of a folder without a '___backup' folder aren't shown, as before
+        '''
+        model2 = folder_type + '_model2'
+        model3 = folder_type + '_model3'
+
+        widget_dict[model2].clear()
+        widget_dict[model2].setHorizontalHeaderLabels(['>>> file <<<'.upper()])   
+        try:
+            widget_dict[model3].clear()
+            widget_dict[model3].setHorizontalHeaderLabels(['>>> history <<<'.upper()])  
+        except KeyError:
+            pass                       
+
+        if rows['files'] == None or rows['history'] == None:
+            return
+
+        # the lazy shot files that are not created yet are shown as virtual entries in italic
+        widget_dict[model2].set_files(rows['files'], self.current_project.lazy_shot_files(folder_directory), folder_directory)
+        try:
+            widget_dict[model3].set_files(rows['history'])
+        except KeyError:
+            pass
+
+
     def get_selected_item_index(self, folder_type, widget_dict):
         '''
         returns an int that indicates the exact index of selected folder in the treeview
@@ -2010,8 +1941,7 @@ class main_gui(MayaQWidgetDockableMixin, QWidget):
         texts = []
 
         for sel_item_index in widget_dict[treeView2].selectedIndexes():
-            item = sel_item_index.model().itemFromIndex(sel_item_index).text()
-            texts.append(item)
+            texts.append(sel_item_index.data())
 
         return texts[0]
 
@@ -2025,18 +1955,18 @@ class main_gui(MayaQWidgetDockableMixin, QWidget):
         texts = []
 
         for sel_item_index in widget_dict[treeView3].selectedIndexes():
-            item = sel_item_index.model().itemFromIndex(sel_item_index).text()
-            texts.append(item)
+            texts.append(sel_item_index.data())
 
         return texts[0]       
 
 
-    def get_selected_file_dir(self, folder_type, file_type, widget_dict, parent_directory):
+    def get_selected_file_dir(self, folder_type, file_type, widget_dict, parent_directory, materialize=False):
         '''
         - return a full path of selected file
         - folder_type should be the 'xxx', which is the prefix name of  the 'xxx_treeView2' or 'xxx_treeView3' in the widget_dict
         - widget_dict are those 'self.create_shot_tab_widgets', 'self.create_design_tab_widgets' and 'self.create_asset_tab_widgets'
         - file_type specifies the maya file or history file, only passes '2d', maya' or 'history' for this argument    
+        - with materialize=True, a selected lazy shot file which is not created yet is created from the template
         '''
         try:
             selected_file = ''
@@ -2050,6 +1980,9 @@ class main_gui(MayaQWidgetDockableMixin, QWidget):
                 if os.path.isfile(sel_file_directory):
                
                     return sel_file_directory
+
+                elif materialize and self.current_project.materialize_lazy_shot_file(sel_file_directory):
+                    return sel_file_directory
                       
             elif file_type == 'history':
 
@@ -2299,8 +2232,12 @@ class main_gui(MayaQWidgetDockableMixin, QWidget):
 
         
     def refresh_current_ui(self):   
-     
-        exec( eval( self.refresh_ui_dict.get( self.get_main_stacked_layout_current_index() ) ) )        
+        # the scans of the tab the user left are superseded, their rows are never shown
+        self.populate_pool.cancel()
+
+        populate_current_tab = self.refresh_ui_dict.get( self.get_main_stacked_layout_current_index() )()
+        if populate_current_tab != None:
+            populate_current_tab()
      
     
     def refresh_tabwidget(self, tab_widget):
@@ -2355,7 +2292,7 @@ class main_gui(MayaQWidgetDockableMixin, QWidget):
             temp_dir = self.folder_type_directories_dict.get(folder_type)
           
 
-            sel_file_directory = self.get_selected_file_dir(folder_type, 'maya', widget_dict, eval(temp_dir))
+            sel_file_directory = self.get_selected_file_dir(folder_type, 'maya', widget_dict, eval(temp_dir), True)
    
 
             if sel_file_directory != None:
@@ -2400,33 +2337,21 @@ class main_gui(MayaQWidgetDockableMixin, QWidget):
 
 
     def refresh_history_qtreeview(self, folder_type, widget_dict, parent_directory):
-
-        treeView3 = folder_type + '_treeView3'
+        '''
+        - lists the history files in parent_directory on the populate pool, the view is filled once the rows arrive
+        '''
         model3 = folder_type + '_model3'
 
-        try:
-            widget_dict[model3].clear()
-            widget_dict[model3].setHorizontalHeaderLabels(['>>> history <<<'.upper()])        
-        except KeyError:
-            pass
-
-        if os.path.isdir(parent_directory):
-            for file in os.listdir(parent_directory):   
-                try:                                                  
-                    item = QStandardItem(file)                            
-
-                    item.setIcon(widget_dict[treeView3].style().standardIcon(QStyle.SP_FileIcon))
-                    item.setEditable(False)
-
-                    widget_dict[model3].appendRow([item])
-                except KeyError:
-                    pass
-        else:
+        def show_history(files):
             try:
                 widget_dict[model3].clear()
-                widget_dict[model3].setHorizontalHeaderLabels(['>>> history <<<'.upper()])     
+                widget_dict[model3].setHorizontalHeaderLabels(['>>> history <<<'.upper()])        
             except KeyError:
-                pass        
+                return
+            widget_dict[model3].set_files(files or [])
+
+        self.populate_pool.request(folder_type + '_files', lambda: populate_workers.list_files(parent_directory), show_history,
+                                   (folder_type, unix_format(parent_directory)))
 
 
     def set_active(self, widget_dict, *folder_types):
@@ -2518,7 +2443,7 @@ class main_gui(MayaQWidgetDockableMixin, QWidget):
             try:
                 temp_dir = self.folder_type_directories_dict.get(folder_type)          
 
-                sel_file_directory = self.get_selected_file_dir( folder_type, 'maya', widget_dict, eval(temp_dir) )
+                sel_file_directory = self.get_selected_file_dir( folder_type, 'maya', widget_dict, eval(temp_dir), True )
 
                 amount = self.get_amount_of_referencing(folder_type) 
            
@@ -2575,9 +2500,12 @@ class main_gui(MayaQWidgetDockableMixin, QWidget):
             try:
                 temp_dir = self.folder_type_directories_dict.get(folder_type)          
 
-                sel_file_directory = self.get_selected_file_dir( folder_type, 'maya', widget_dict, eval(temp_dir) )                
+                sel_file_directory = self.get_selected_file_dir( folder_type, 'maya', widget_dict, eval(temp_dir), True )                
                 
                 if sel_file_directory != None:
+                    # a hard linked shot file gets its own data before it's opened and saved
+                    if configuration_maya.hardlink_shot_files:
+                        template_files.break_hardlink(sel_file_directory)
                     os.system('start maya.exe "{}"'.format(sel_file_directory))
                     break
                 else:
@@ -2593,13 +2521,18 @@ class main_gui(MayaQWidgetDockableMixin, QWidget):
 # ======= some backend functions =======
 # ======================================
 
-def get_drives_letters():
-    physical_drives = []
-    from string import ascii_uppercase
-    for letter in ascii_uppercase[2:]:
-        if os.path.exists(letter + r':/'):
-            physical_drives.append(letter + r':/')
-    return physical_drives
+def get_drives_letters(timeout=2.0):
+    '''
+    - returns the drives that answered within timeout seconds, every drive is probed at the same time, see drive_enumeration
+    - the gui doesn't wait for it, it fills its drive combo box progressively, see main_gui.start_drive_enumeration()
+    '''
+    enumerator = drive_enumeration.Drive_Enumerator(timeout=timeout)
+    enumerator.start()
+    enumerator.poll()
+    while not enumerator.is_done() and enumerator.elapsed() < timeout:
+        time.sleep(0.01)
+        enumerator.poll()
+    return enumerator.online_drives()
 
 def export_strings_to_file(strings, dst_file_dir):
     '''
@@ -0,0 +1,202 @@
+import os
+import re
+import json
+
+import directory_scanner
+from helper_functions import unix_format
+
+MANIFEST_FILE_NAME = '.project_manifest.json'
+MANIFEST_VERSION = 1
+
+# matches the relative directory of a shot folder, e.g.: 'ANIMATION/Finals/SCENE_3/__Shot_12/'
+SHOT_FOLDER_PATTERN = re.compile(r'^(.*/)SCENE_(\d+)/__Shot_(\d+)/$')
+
+
+class Project_Manifest(object):
+    """
+    - a small JSON file in the project root, which records what the project is supposed to contain
+    - lazy shot files: the shot files that are intended but left off disk until they're first used,
+      they're recorded as rules rather than file by file, so a 2,000-shot project still has a tiny manifest:
+        {'patterns': {<shot directory relative to the project>: [<file name pattern>, ...]},
+         'scenes':   {<scene number>: <amount of shots>}}
+    - structure: what an existing project is opened from without walking its tree, all the directories are relative to the project:
+        {'shot_roots':  [<directory that holds the SCENE_ folders>, ...],
+         'asset_roots': [<directory that holds the asset folders>, ...],
+         'scenes':      {<scene number>: <amount of shots>},
+         'missing_shots': {<shot root>: {<scene number>: [<shot number missing from that shot root>, ...]}},
+         'assets':      {<asset root>: [<asset folder name>, ...]},
+         'stamps':      {<watched directory>: <modification time>}}
+      the stamps are the modification times of the directories whose direct children make up the structure,
+      a new scene, shot or asset changes one of them, so a few stat calls tell whether the structure is still current
+    """
+    def __init__(self, project_directory):
+        self.project_directory = unix_format(project_directory)
+        self.manifest_path = self.project_directory + MANIFEST_FILE_NAME
+        self.data = {'version': MANIFEST_VERSION}
+
+
+    def load(self):
+        '''
+        - reads the manifest from the project root, returns False if there's none or it was written by another version
+        '''
+        try:
+            manifest_file = open(self.manifest_path, 'r')
+            try:
+                data = json.load(manifest_file)
+            finally:
+                manifest_file.close()
+        except (IOError, ValueError):
+            return False
+
+        if data.get('version') != MANIFEST_VERSION:
+            return False
+        self.data = data
+        return True
+
+
+    def save(self):
+        '''
+        - writes the manifest into a temporary file first, so a half-written manifest never replaces a good one
+        '''
+        temp_path = self.manifest_path + '.tmp'
+        manifest_file = open(temp_path, 'w')
+        try:
+            json.dump(self.data, manifest_file, sort_keys=True, separators=(',', ':'))
+        finally:
+            manifest_file.close()
+        if os.path.isfile(self.manifest_path):
+            os.remove(self.manifest_path)
+        os.rename(temp_path, self.manifest_path)
+
+
+    def add_lazy_shot_files(self, shot_file_patterns, dict_scene_shot):
+        '''
+        - records the shot files of the given scenes as intended, without creating them
+        - shot_file_patterns looks like: {<shot_directory>: [<file_name_pattern>, ...]}, see CG_Project.shot_file_patterns()
+        - dict_scene_shot looks like: {<scn_num>:<amount_of_shots>}
+        - returns True if anything new was recorded
+        '''
+        lazy = self.data.setdefault('lazy_shot_files', {'patterns': {}, 'scenes': {}})
+        changed = False
+
+        for shot_dir, patterns in shot_file_patterns.iteritems():
+            relative_dir = unix_format(shot_dir)[len(self.project_directory):]
+            recorded = lazy['patterns'].setdefault(relative_dir, [])
+            for pattern in patterns:
+                if pattern not in recorded:
+                    recorded.append(pattern)
+                    changed = True
+
+        for scn_number, shot_amount in dict_scene_shot.iteritems():
+            if lazy['scenes'].get(str(scn_number), 0) < shot_amount:
+                lazy['scenes'][str(scn_number)] = shot_amount
+                changed = True
+
+        return changed
+
+
+    def record_structure(self, shot_roots, asset_roots, dict_scene_shot, watched_directories, missing_shots=None):
+        '''
+        - records the structure of the project, see the docstring of the class, it's saved by save()
+        - shot_roots and asset_roots are absolute directories, dict_scene_shot looks like: {<scn_num>:<amount_of_shots>}
+        - missing_shots are the shots below the highest one that a shot root doesn't hold, see Shot_Inventory.to_record()
+        - watched_directories are the absolute directories whose modification times are stamped,
+          every asset root is watched anyway, since its listing gives the recorded assets
+        '''
+        assets = {}
+        for asset_root in asset_roots:
+            names = [entry.name for entry in directory_scanner.scan_directory(asset_root)
+                     if entry.name[:2] == '__' and entry.name[:3] != '___' and entry.is_dir()]
+            assets[self.relative(asset_root)] = sorted(names)
+
+        stamps = {}
+        for directory in list(watched_directories) + list(asset_roots):
+            modified_time = modification_time(directory)
+            if modified_time != None:
+                stamps[self.relative(directory)] = modified_time
+
+        self.data['structure'] = {'shot_roots':  [self.relative(directory) for directory in shot_roots],
+                                  'asset_roots': [self.relative(directory) for directory in asset_roots],
+                                  'scenes':      dict((str(scn_number), shot_amount) for scn_number, shot_amount in dict_scene_shot.iteritems()),
+                                  'missing_shots': missing_shots or {},
+                                  'assets':      assets,
+                                  'stamps':      stamps}
+
+
+    def structure(self):
+        '''
+        - returns the recorded structure with absolute directories and int scene numbers, or None if nothing is recorded
+        - it looks like: {'shot_roots': [...], 'asset_roots': [...], 'scenes': {1: 10, ...}, 'missing_shots': {<shot root>: {...}},
+                          'assets': {<asset root>: [...]}}
+        '''
+        structure = self.data.get('structure')
+        if not structure:
+            return None
+        return {'shot_roots':  [self.project_directory + directory for directory in structure['shot_roots']],
+                'asset_roots': [self.project_directory + directory for directory in structure['asset_roots']],
+                'scenes':      dict((int(scn_number), shot_amount) for scn_number, shot_amount in structure['scenes'].iteritems()),
+                'missing_shots': dict((self.project_directory + directory, scenes)
+                                      for directory, scenes in structure.get('missing_shots', {}).iteritems()),
+                'assets':      dict((self.project_directory + directory, names) for directory, names in structure['assets'].iteritems())}
+
+
+    def changed_directories(self):
+        '''
+        - returns the stamped directories that were modified or removed since the structure was recorded
+        - costs one stat call per stamped directory, nothing is listed or walked
+        '''
+        structure = self.data.get('structure')
+        if not structure:
+            return []
+        changed = []
+        for directory, modified_time in structure['stamps'].iteritems():
+            if modification_time(self.project_directory + directory) != modified_time:
+                changed.append(self.project_directory + directory)
+        return changed
+
+
+    def relative(self, directory):
+        directory = unix_format(directory)
+        if directory.startswith(self.project_directory):
+            return directory[len(self.project_directory):]
+        return directory
+
+
+    def lazy_shot_files(self, folder_directory):
+        '''
+        - returns the names of the lazy shot files intended for the given shot folder, whether they're on disk or not
+        - folder_directory looks like: 'Z:/proj/ANIMATION/Finals/SCENE_3/__Shot_12/'
+        '''
+        lazy = self.data.get('lazy_shot_files')
+        if not lazy:
+            return []
+
+        folder_directory = unix_format(folder_directory)
+        if not folder_directory.startswith(self.project_directory):
+            return []
+        matched = SHOT_FOLDER_PATTERN.match(folder_directory[len(self.project_directory):])
+        if matched == None:
+            return []
+
+        shot_dir, scn_number, shot_number = matched.group(1), matched.group(2), int(matched.group(3))
+        if shot_number > lazy['scenes'].get(scn_number, 0):
+            return []
+        return [pattern.format(scn_number, str(shot_number)) for pattern in lazy['patterns'].get(shot_dir, [])]
+
+
+    def is_lazy_shot_file(self, file_path):
+        '''
+        - tells whether the given file is one of the intended lazy shot files
+        '''
+        folder_directory, file_name = os.path.split(file_path.replace('\\', '/'))
+        return file_name in self.lazy_shot_files(folder_directory)
+
+
+def modification_time(directory):
+    '''
+    - returns the modification time of the directory, or None if it doesn't exist
+    '''
+    try:
+        return os.stat(directory).st_mtime
+    except OSError:
+        return None
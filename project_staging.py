@@ -0,0 +1,291 @@
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+import Queue
+
+import directory_scanner
+import folder_layout
+from helper_functions import unix_format
+
+
+def make_staging_root(staging_directory=''):
+    '''
+    - returns a new empty folder to build a project skeleton in, it ends with '/'
+    - staging_directory should be a fast local drive (SSD, tmpfs, ...), the temporary folder of the system is used when it's empty
+    - the caller removes the folder once the skeleton has been transferred
+    '''
+    if staging_directory and not os.path.isdir(staging_directory):
+        os.makedirs(staging_directory)
+    return unix_format(tempfile.mkdtemp(prefix='project_staging_', dir=staging_directory or None))
+
+
+def rebase_paths(paths, old_root, new_root):
+    '''
+    - moves the given paths from under old_root to under new_root, e.g. from a staging folder to the project drive
+    - both roots should end with '/', the paths that aren't under old_root are kept as they are
+    '''
+    return [new_root + path[len(old_root):] if path.startswith(old_root) else path for path in paths]
+
+
+def entry_size(entry):
+    try:
+        return entry.stat().st_size
+    except AttributeError:
+        # Listed_Entry has no stat()
+        return os.path.getsize(entry.path)
+
+
+def build_tree_manifest(root_directory):
+    '''
+    - walks the tree under root_directory once and records every folder and file relative to it
+    - returns a dictionary like: {'folders': [<relative folder>, ...], 'files': {<relative file>: <size in bytes>}}
+    - the folders end with '/' and a parent folder is always listed before its child folders, so the list is a layout
+      that folder_layout.materialize_layout() can create
+    '''
+    root = unix_format(root_directory)
+    folders = []
+    files = {}
+    pending = ['']
+    while pending:
+        relative_dir = pending.pop(0)
+        for entry in directory_scanner.scan_directory(root + relative_dir):
+            if entry.is_dir():
+                folders.append(relative_dir + entry.name + '/')
+                pending.append(relative_dir + entry.name + '/')
+            else:
+                files[relative_dir + entry.name] = entry_size(entry)
+    return {'folders': folders, 'files': files}
+
+
+def copy_files_pipelined(source_directory, target_directory, file_names, threads=8, queue_size=64, on_copied=None):
+    '''
+    - copies the given relative files from source_directory to target_directory, their folders must exist already
+    - one thread reads the files from the (local) source into a bounded queue, while the writer threads push them to the target,
+      so reading and the round-trips of the (remote) writes overlap, and no more than queue_size files are held in memory
+    - on_copied is an optional function, which is called with every target file right after it was written, from the writer threads
+    - the first error raised by any thread, including on_copied, stops the copy and is re-raised here
+    '''
+    source = unix_format(source_directory)
+    target = unix_format(target_directory)
+    pipe = Queue.Queue(queue_size)
+    stop = threading.Event()
+    errors = []
+    writer_amount = max(1, min(threads, len(file_names)))
+
+    def put(item):
+        # never blocks forever, the writers may have stopped
+        while not stop.is_set():
+            try:
+                pipe.put(item, True, 0.1)
+                return True
+            except Queue.Full:
+                pass
+        return False
+
+    def read():
+        try:
+            for file_name in file_names:
+                source_file = open(source + file_name, 'rb')
+                try:
+                    data = source_file.read()
+                finally:
+                    source_file.close()
+                if not put((file_name, data)):
+                    return
+        except Exception, error:
+            errors.append(error)
+            stop.set()
+        finally:
+            for i in range(writer_amount):
+                put(None)
+
+    def write():
+        while not stop.is_set():
+            try:
+                item = pipe.get(True, 0.1)
+            except Queue.Empty:
+                continue
+            if item is None:
+                return
+            file_name, data = item
+            try:
+                target_file = open(target + file_name, 'wb')
+                try:
+                    target_file.write(data)
+                finally:
+                    target_file.close()
+                if on_copied != None:
+                    on_copied(target + file_name)
+            except Exception, error:
+                errors.append(error)
+                stop.set()
+                return
+
+    threads_list = [threading.Thread(target=read)]
+    for i in range(writer_amount):
+        threads_list.append(threading.Thread(target=write))
+    for thread in threads_list:
+        thread.daemon = True
+        thread.start()
+    for thread in threads_list:
+        thread.join()
+
+    if errors:
+        raise errors[0]
+
+
+def transfer_tree(source_directory, target_directory, threads=8, hidden_folders=(), on_copied=None):
+    '''
+    - pushes the whole tree of source_directory into target_directory in one pass:
+      the folders are created by the parallel materializer, then the files are copied by copy_files_pipelined()
+    - target_directory is created if it doesn't exist, an existing one is merged into, existing files are overwritten
+    - the folders named in hidden_folders are hidden again on the target, the hidden attribute isn't carried over by the copy
+    - on_copied is called with every folder created and file written on the target, see copy_files_pipelined()
+    - returns the manifest of the source tree, see build_tree_manifest(), which verify_tree() checks the target against
+    '''
+    source = unix_format(source_directory)
+    target = unix_format(target_directory)
+    manifest = build_tree_manifest(source)
+
+    root_is_new = not os.path.isdir(target)
+    if root_is_new:
+        os.makedirs(target)
+    folder_layout.make_layout_folders_parallel(target, manifest['folders'], root_is_new, threads, root_is_new, on_copied)
+    copy_files_pipelined(source, target, sorted(manifest['files']), threads, on_copied=on_copied)
+
+    if hidden_folders:
+        for folder in manifest['folders']:
+            if folder_layout.split_layout_entry(folder)[1] in hidden_folders:
+                folder_layout.hide_folder(target + folder)
+    return manifest
+
+
+def verify_tree(target_directory, manifest):
+    '''
+    - checks the tree under target_directory against a manifest of build_tree_manifest()
+    - returns a sorted list of the relative folders and files that are missing or have another size, it's empty when the tree matches
+    - anything extra on the target is ignored, the target may have been merged into
+    '''
+    found = build_tree_manifest(target_directory)
+    found_folders = set(found['folders'])
+
+    problems = [folder for folder in manifest['folders'] if folder not in found_folders]
+    for file_name, size in manifest['files'].iteritems():
+        if found['files'].get(file_name) != size:
+            problems.append(file_name)
+    return sorted(problems)
+
+
+def stage_and_transfer(build, target_directory, staging_directory='', threads=8, hidden_folders=(), on_copied=None):
+    '''
+    - builds a project skeleton on a local staging drive, then pushes it to target_directory in bulk and verifies it
+    - build is a function which takes a staging directory and creates the whole skeleton in it
+    - the staging folder is always removed, even when the build or the transfer fails
+    - raises IOError when the transferred tree doesn't match the staged one
+    - returns the timings, which look like:
+        {'staging': <seconds>, 'transfer': <seconds>, 'verify': <seconds>, 'folders': <amount>, 'files': <amount>, 'bytes': <amount>}
+    '''
+    staging_root = make_staging_root(staging_directory)
+    try:
+        start = time.time()
+        build(staging_root)
+        staged = time.time()
+        manifest = transfer_tree(staging_root, target_directory, threads, hidden_folders, on_copied)
+        transferred = time.time()
+        problems = verify_tree(target_directory, manifest)
+        verified = time.time()
+    finally:
+        shutil.rmtree(staging_root, ignore_errors=True)
+
+    if problems:
+        raise IOError('{0} entries of {1} are missing or incomplete after the transfer, e.g. {2}'.format(
+                      len(problems), target_directory, problems[0]))
+
+    return {'staging':  staged - start,
+            'transfer': transferred - staged,
+            'verify':   verified - transferred,
+            'folders':  len(manifest['folders']),
+            'files':    len(manifest['files']),
+            'bytes':    sum(manifest['files'].values())}
+
+
+def format_timings(timings):
+    '''
+    - returns a one line summary of the timings of stage_and_transfer()
+    '''
+    return ('staged {folders} folders and {files} files ({bytes} bytes) in {staging:.3f} s, '
+            'transferred in {transfer:.3f} s, verified in {verify:.3f} s').format(**timings)
+
+
+def use_staging(mode, target_directory):
+    '''
+    - tells whether a new project under target_directory should be built by stage_and_transfer()
+    - mode can be:
+        'direct' ---> the project is created on its drive folder by folder
+        'staged' ---> the project is built on a local staging drive and transferred in bulk
+        'auto'   ---> staged on network drives, direct on local drives
+    '''
+    if mode == 'auto':
+        return folder_layout.is_network_directory(target_directory)
+    return mode == 'staged'
+
+
+def benchmark_strategies(parent_directory, layout, file_names, template_path, staging_directory='', threads=8):
+    '''
+    - times both ways of creating a project skeleton into fresh temporary folders under parent_directory:
+      'direct' creates the layout and writes the files on the drive, 'staged' runs stage_and_transfer()
+    - point parent_directory to the drive you want to measure, for example a network drive
+    - file_names are relative to the project, every file is written as a copy of template_path
+    - returns a dictionary like: {'direct': <seconds>, 'staged': <timings of stage_and_transfer()>}
+    '''
+    template_file = open(template_path, 'rb')
+    try:
+        template_data = template_file.read()
+    finally:
+        template_file.close()
+
+    def build(project_directory, mode):
+        if not os.path.isdir(project_directory):
+            os.mkdir(project_directory)
+        folder_layout.materialize_layout(project_directory, layout, True, mode, threads, True)
+        for file_name in file_names:
+            new_file = open(project_directory + file_name, 'wb')
+            try:
+                new_file.write(template_data)
+            finally:
+                new_file.close()
+
+    result = {}
+    bench_dir = unix_format(tempfile.mkdtemp(prefix='staging_bench_', dir=parent_directory))
+    try:
+        start = time.time()
+        build(bench_dir + 'direct/', 'auto')
+        result['direct'] = time.time() - start
+        result['staged'] = stage_and_transfer(lambda staging_root: build(staging_root, 'serial'), bench_dir + 'staged/',
+                                              staging_directory, threads)
+    finally:
+        shutil.rmtree(bench_dir, ignore_errors=True)
+    return result
+
+
+if __name__ == '__main__':
+    # usage: python project_staging.py <directory_on_the_drive_to_measure> [staging_directory]
+    # benchmarks a project with the default departments and 10 scenes of 20 shots, with one shot file in every shot folder
+    import configuration
+    bench_parent = sys.argv[1] if len(sys.argv) > 1 else tempfile.gettempdir()
+    bench_staging = sys.argv[2] if len(sys.argv) > 2 else configuration.staging_directory
+
+    department_layout = folder_layout.compile_folder_layout(configuration.Departments)
+    shot_directories = folder_layout.layout_shot_directories(department_layout, configuration.no_shot_folders)
+    scene_shot_layout = folder_layout.compile_scene_shot_layout('', shot_directories, dict((scn, 20) for scn in range(1, 11)))
+    shot_files = [directory + 'shot.ma' for directory in folder_layout.layout_leaves(scene_shot_layout)]
+    template_path = os.path.dirname(os.path.abspath(__file__)) + '/empty.ma'
+
+    result = benchmark_strategies(bench_parent, department_layout + scene_shot_layout, shot_files, template_path,
+                                  bench_staging, configuration.materializer_threads)
+    print 'direct: %.3f s' % result['direct']
+    print 'staged: %.3f s (%s)' % (result['staged']['staging'] + result['staged']['transfer'] + result['staged']['verify'],
+                                   format_timings(result['staged']))
@@ -0,0 +1,23 @@
+import sys
+
+# the shared modules must use the Qt binding the gui runs on, PySide2 in Maya 2017 and later, PySide in the standalone app,
+# a binding that's imported already wins, otherwise PySide2 is preferred
+if 'PySide2' in sys.modules:
+    BINDING = 'PySide2'
+elif 'PySide' in sys.modules:
+    BINDING = 'PySide'
+else:
+    try:
+        import PySide2
+        BINDING = 'PySide2'
+    except ImportError:
+        BINDING = 'PySide'
+
+if BINDING == 'PySide2':
+    from PySide2.QtCore import Qt, QAbstractListModel, QModelIndex, QObject, QRunnable, QSize, QSortFilterProxyModel, \
+                               QThreadPool, QTimer, Signal
+    from PySide2.QtGui import QFont, QIcon, QImage, QImageReader, QPixmap
+else:
+    # PySide keeps QSortFilterProxyModel in QtGui
+    from PySide.QtCore import Qt, QAbstractListModel, QModelIndex, QObject, QRunnable, QSize, QThreadPool, QTimer, Signal
+    from PySide.QtGui import QFont, QIcon, QImage, QImageReader, QPixmap, QSortFilterProxyModel
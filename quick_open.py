@@ -0,0 +1,254 @@
+import re
+from binascii import hexlify, unhexlify
+from bisect import bisect_left
+from itertools import compress, islice, repeat
+from operator import contains
+
+import directory_scanner
+import shot_inventory
+from helper_functions import unix_format
+
+# the most candidates matched all at once, the fuzzy tiers of more candidates are searched within the shortest ones first
+FULL_SCAN_LINES = 15000
+
+
+def list_project_files(project_directory, extensions, extra_files=None, threads=8):
+    '''
+    - returns the sorted paths, relative to project_directory, of the active files with the given extensions, e.g. ['ma', 'png']
+    - the hidden '___' folders, like '___backup' and '___script', aren't walked, so only the active files are listed
+    - extra_files is a function which takes a directory and returns the names of files that belong to it without being on disk yet,
+      e.g. CG_Project.lazy_shot_files()
+    - the folders of every level are listed by a pool of threads, so the round-trips to a network drive overlap
+    '''
+    project_directory = unix_format(project_directory)
+    extensions = set(extension.lower().lstrip('.') for extension in extensions)
+    paths = set()
+    directories = [project_directory]
+    while directories:
+        listings = shot_inventory.parallel_map(directory_scanner.scan_directory, directories, threads)
+        sub_directories = []
+        for directory, entries in zip(directories, listings):
+            relative_directory = directory[len(project_directory):]
+            for entry in entries:
+                if entry.is_dir():
+                    if entry.name[:3] != '___':
+                        sub_directories.append(directory + entry.name + '/')
+                elif entry.name.rsplit('.', 1)[-1].lower() in extensions:
+                    paths.add(relative_directory + entry.name)
+            if extra_files != None:
+                for name in extra_files(directory):
+                    paths.add(relative_directory + name)
+        directories = sub_directories
+    return sorted(paths)
+
+
+def fuzzy_pattern(query, start='\n', within=''):
+    '''
+    - returns the regular expression that finds the characters of the query in order, from start to the end of a line,
+      e.g. 'ab' ---> '\\n([^a\\n]*a[^b\\n]*b[^\\n]*)', its group is the rest of the line
+    - every gap takes anything but the next character, so a line that doesn't match is given up without backtracking
+    - the characters given as within are left out of the gaps too, e.g. '/' keeps the whole query within the file name
+    '''
+    excluded = re.escape(within) + '\\n'
+    parts = [re.escape(start), '(']
+    for character in query:
+        parts.append('[^{0}{1}]*{0}'.format(re.escape(character), excluded))
+    parts.append('[^{0}]*)(?![^\\n])'.format(excluded))
+    return re.compile(''.join(parts))
+
+
+def rank_key(line):
+    return (len(line), line)
+
+
+
+class Quick_Open_Index(object):
+    """
+    - an in-memory index of the files of a project, searched by fuzzy matching, e.g. 's3sh12anim' finds
+      'ANIMATION/Finals/SCENE_3/__Shot_12/scn3_shot12_anim.ma'
+    - the lowercase paths are kept shortest first, so the matches of a query come out ranked, the ranking is only the order
+      of the tiers: the file name holding the query, the path holding it, the file name holding its characters in order,
+      then the other matches
+    - the searches run in C over texts of a line per path, without a test per path in python:
+        - every character has the lines holding it as a mask, a byte per line, so the candidates of a query, the lines holding
+          all its characters, are cut out of the index at once
+        - the candidates are matched by one regular expression when they're few, see FULL_SCAN_LINES, and a query that extends
+          the previous one only searches its matches
+        - the tiers of many candidates are searched until there are enough results, which is soon since the candidates are many:
+          the query as it's typed by str.find() in the text of the file names then of the paths, the characters in order
+          in the shortest candidates, then in the others
+    - the paths are added and removed one by one as the directory watcher reports them, see add_path() and remove_path()
+    """
+    def __init__(self, project_directory, paths=()):
+        self.project_directory = unix_format(project_directory)
+        # {<lowercase relative path>: <relative path>}
+        self.originals = dict((path.lower(), path) for path in paths)
+        # the lowercase relative paths, sorted by rank_key(), and their file names in the same order
+        self.lines = sorted(self.originals, key=rank_key)
+        self.keys = [rank_key(line) for line in self.lines]
+        self.names = [line.rpartition('/')[2] for line in self.lines]
+        # {<character>: bytearray([<1 if the line holds the character else 0>, ...])}
+        self.flags = {}
+        for character in set(''.join(self.lines)):
+            self.flags[character] = bytearray(map(contains, self.lines, repeat(character, len(self.lines))))
+        self.changed()
+
+
+    def changed(self):
+        # the texts and the masks are made again when a search needs them
+        self.text = None
+        self.masks = {}
+        self.last_query = None
+        # the lines the last query matched, None when there were too many candidates to match them all
+        self.last_matches = None
+
+
+    def relative(self, path):
+        path = path.replace('\\', '/')
+        if path.lower().startswith(self.project_directory.lower()):
+            return path[len(self.project_directory):]
+        return None
+
+
+    def add_path(self, path):
+        '''
+        - adds a file of the project by its absolute path, returns whether it's new
+        '''
+        relative_path = self.relative(path)
+        if relative_path == None or relative_path.lower() in self.originals:
+            return False
+        line = relative_path.lower()
+        self.originals[line] = relative_path
+        position = bisect_left(self.keys, rank_key(line))
+        self.keys.insert(position, rank_key(line))
+        self.lines.insert(position, line)
+        self.names.insert(position, line.rpartition('/')[2])
+        for character in set(line).difference(self.flags):
+            self.flags[character] = bytearray(len(self.lines) - 1)
+        for character, flags in self.flags.items():
+            flags.insert(position, character in line)
+        self.changed()
+        return True
+
+
+    def remove_path(self, path):
+        '''
+        - takes a file of the project away by its absolute path, returns whether it was indexed
+        '''
+        relative_path = self.relative(path)
+        if relative_path == None or self.originals.pop(relative_path.lower(), None) == None:
+            return False
+        position = bisect_left(self.keys, rank_key(relative_path.lower()))
+        del self.keys[position]
+        del self.lines[position]
+        del self.names[position]
+        for flags in self.flags.values():
+            del flags[position]
+        self.changed()
+        return True
+
+
+    def mask(self, character):
+        '''
+        - returns the lines holding the character as a number, a byte per line, the first line in the highest byte
+        '''
+        if character not in self.masks:
+            flags = self.flags.get(character)
+            self.masks[character] = int(hexlify(flags), 16) if flags else 0
+        return self.masks[character]
+
+
+    def found_lines(self, query, text):
+        '''
+        - yields the lines whose part in the given text holds the query, the text is the paths' or the names', a line per path
+        - the line of a hit is told by the line breaks before it, counted from the hit before
+        '''
+        line = 0
+        start = 0
+        position = text.find(query)
+        while position != -1:
+            line += text.count('\n', start, position)
+            yield self.lines[line]
+            # the next hit is searched from the next line
+            start = text.find('\n', position)
+            if start == -1:
+                return
+            position = text.find(query, start)
+
+
+    def matched_lines(self, pattern, lines):
+        '''
+        - yields the lines the pattern finds, in their order
+        '''
+        text = '\n' + '\n'.join(lines)
+        for found in pattern.finditer(text):
+            end = text.find('\n', found.start() + 1)
+            yield text[text.rfind('\n', 0, found.start() + 1) + 1:end if end != -1 else len(text)]
+
+
+    def tiers(self, query):
+        '''
+        - returns the tiers of the query, the best first, every tier is an iterable of lines
+        - keeps the matches of the query for the next one, when they were all matched
+        - a file name never holds a '/', so the tiers of the file names are left out of a query holding one
+        '''
+        in_names = '/' not in query
+        if self.last_matches != None and query.startswith(self.last_query):
+            candidates = self.last_matches
+        else:
+            mask = -1
+            for character in set(query):
+                mask &= self.mask(character)
+                if not mask:
+                    self.last_matches = []
+                    return []
+            selected = bytearray(unhexlify('%0*x' % (2 * len(self.lines), mask)))
+            if selected.count('\x01') > FULL_SCAN_LINES:
+                self.last_matches = None
+                if self.text == None:
+                    self.text = '\n'.join(self.lines)
+                    self.names_text = '\n'.join(self.names)
+                # the longer candidates are only joined when the shortest ones don't give enough results
+                return [in_names and self.found_lines(query, self.names_text) or (),
+                        self.found_lines(query, self.text),
+                        in_names and self.matched_lines(fuzzy_pattern(query, '/', '/'),
+                                                        islice(compress(self.lines, selected), FULL_SCAN_LINES)) or (),
+                        self.matched_lines(fuzzy_pattern(query), islice(compress(self.lines, selected), FULL_SCAN_LINES)),
+                        self.matched_lines(fuzzy_pattern(query), islice(compress(self.lines, selected), FULL_SCAN_LINES, None))]
+            candidates = compress(self.lines, selected)
+
+        # the query as it's typed is matched too, so the tiers only search the matches
+        matches = self.last_matches = fuzzy_pattern(query).findall('\n' + '\n'.join(candidates))
+        return [in_names and self.matched_lines(re.compile(re.escape(query) + '[^/\\n]*(?![^\\n])'), matches) or (),
+                self.matched_lines(re.compile(re.escape(query)), matches),
+                in_names and self.matched_lines(fuzzy_pattern(query, '/', '/'), matches) or (),
+                matches]
+
+
+    def search(self, query, limit=50):
+        '''
+        - returns the best matches of the query as absolute paths, the best first
+        - the spaces of the query are ignored, the case too
+        '''
+        query = ''.join(query.lower().split())
+        if not query:
+            return []
+        tiers = self.tiers(query)
+        self.last_query = query
+
+        best = []
+        seen = set()
+        for lines in tiers:
+            for line in lines:
+                if line not in seen:
+                    seen.add(line)
+                    best.append(line)
+                    if len(best) == limit:
+                        break
+            if len(best) == limit:
+                break
+        return [self.project_directory + self.originals[line] for line in best]
+
+
+    def __len__(self):
+        return len(self.lines)
@@ -0,0 +1,225 @@
+import threading
+import Queue
+
+import directory_scanner
+from helper_functions import unix_format
+
+
+class Shot_Inventory(object):
+    """
+    - the complete scene x shot x department matrix of a project
+    - a department is a shot root, e.g. 'Z:/proj/ANIMATION/Finals/', the matrix looks like:
+        {<shot root>: {<scene number>: set([<shot number>, ...])}}
+    - it's built by scan_shot_inventory(), or from a manifest record, see to_record() and from_record()
+    """
+    def __init__(self, shot_roots, matrix):
+        self.shot_roots = list(shot_roots)
+        self.matrix = matrix
+        # {<scene number>: set([<shot number>, ...])}, every shot that exists in at least one department
+        self.all_shots = {}
+        for scenes in matrix.itervalues():
+            for scn_number, shots in scenes.iteritems():
+                self.all_shots.setdefault(scn_number, set()).update(shots)
+
+
+    def add_shots(self, dict_scene_shot):
+        '''
+        - adds the shots 1 to <amount_of_shots> of every scene to every department, e.g. after the folders were generated
+        - dict_scene_shot looks like: {<scn_num>:<amount_of_shots>}
+        '''
+        for scn_number, amount in dict_scene_shot.iteritems():
+            new_shots = set(range(1, amount + 1))
+            for shot_root in self.shot_roots:
+                self.matrix.setdefault(shot_root, {}).setdefault(scn_number, set()).update(new_shots)
+            self.all_shots.setdefault(scn_number, set()).update(new_shots)
+
+
+    def scenes(self):
+        return sorted(self.all_shots)
+
+
+    def shots(self, scn_number):
+        return sorted(self.all_shots.get(scn_number, ()))
+
+
+    def has_shot(self, scn_number, shot_number, shot_root=None):
+        '''
+        - tells whether the shot exists in the given department, or in any department without a shot_root
+        '''
+        if shot_root == None:
+            return shot_number in self.all_shots.get(scn_number, ())
+        return shot_number in self.matrix.get(shot_root, {}).get(scn_number, ())
+
+
+    def scene_directories(self, scene_name='SCENE_'):
+        '''
+        - returns the scene folders of every department, e.g. 'Z:/proj/ANIMATION/Finals/SCENE_3/', their listings are the shots of the matrix
+        '''
+        return [shot_root + '{0}{1}/'.format(scene_name, scn_number)
+                for shot_root in self.shot_roots for scn_number in sorted(self.matrix.get(shot_root, {}))]
+
+
+    def scene_shot_dict(self):
+        '''
+        - returns the highest shot number of every scene, it looks like: {<scn_num>:<amount_of_shots>}
+        '''
+        return dict((scn_number, max(shots)) for scn_number, shots in self.all_shots.iteritems() if shots)
+
+
+    def gaps(self):
+        '''
+        - returns the shot numbers below the highest one of a scene that don't exist in any department,
+          it looks like: {<scn_num>: [<shot number>, ...]}, only the scenes with gaps are in it
+        '''
+        gaps = {}
+        for scn_number, shots in self.all_shots.iteritems():
+            missing = [shot_number for shot_number in range(1, max(shots) + 1) if shot_number not in shots] if shots else []
+            if missing:
+                gaps[scn_number] = missing
+        return gaps
+
+
+    def incomplete_shots(self):
+        '''
+        - returns the shots that exist in some departments but not in all of them,
+          it looks like: {(<scn_num>, <shot number>): [<shot root that misses it>, ...]}
+        '''
+        incomplete = {}
+        for scn_number, shots in self.all_shots.iteritems():
+            for shot_number in shots:
+                missing = [shot_root for shot_root in self.shot_roots
+                           if shot_number not in self.matrix.get(shot_root, {}).get(scn_number, ())]
+                if missing:
+                    incomplete[(scn_number, shot_number)] = missing
+        return incomplete
+
+
+    def completeness(self):
+        '''
+        - returns the share of all the shots that exist in every department, it looks like: {<shot root>: <0.0 to 1.0>}
+        '''
+        total = sum(len(shots) for shots in self.all_shots.itervalues())
+        completeness = {}
+        for shot_root in self.shot_roots:
+            present = sum(len(shots) for shots in self.matrix.get(shot_root, {}).itervalues())
+            completeness[shot_root] = float(present) / total if total else 1.0
+        return completeness
+
+
+    def to_record(self, relative=lambda directory: directory):
+        '''
+        - returns a compact record of the matrix for a manifest: the highest shot of every scene,
+          and only the shots that are missing from a department, a show without holes records no shots at all:
+            {'scenes': {<scn_num>: <amount_of_shots>}, 'missing': {<shot root>: {<scn_num>: [<shot number>, ...]}}}
+        - relative is applied to every shot root, e.g. to make them relative to the project
+        - the scene numbers are strings, as JSON wants
+        '''
+        scene_shot_dict = self.scene_shot_dict()
+        missing = {}
+        for shot_root in self.shot_roots:
+            scenes = self.matrix.get(shot_root, {})
+            for scn_number, amount in scene_shot_dict.iteritems():
+                shots = scenes.get(scn_number, ())
+                missing_shots = [shot_number for shot_number in range(1, amount + 1) if shot_number not in shots]
+                if missing_shots:
+                    missing.setdefault(relative(shot_root), {})[str(scn_number)] = missing_shots
+        return {'scenes': dict((str(scn_number), amount) for scn_number, amount in scene_shot_dict.iteritems()),
+                'missing': missing}
+
+
+    @classmethod
+    def from_record(cls, shot_roots, record, absolute=lambda directory: directory):
+        '''
+        - rebuilds the inventory from a record of to_record(), absolute turns the recorded shot roots back into directories
+        - a scene missing all its shots in a department is left out of that department, like a scene folder that doesn't exist
+        '''
+        missing = {}
+        for shot_root, scenes in record.get('missing', {}).iteritems():
+            missing[absolute(shot_root)] = scenes
+        matrix = {}
+        for shot_root in shot_roots:
+            root_missing = missing.get(shot_root, {})
+            scenes = matrix[shot_root] = {}
+            for scn_number, amount in record.get('scenes', {}).iteritems():
+                shots = set(range(1, amount + 1)) - set(root_missing.get(str(scn_number), ()))
+                if shots:
+                    scenes[int(scn_number)] = shots
+        return cls(shot_roots, matrix)
+
+
+
+def folder_number(folder_name):
+    '''
+    - returns the number at the end of a scene or shot folder name, e.g. 12 for '__Shot_12', or None if there's none
+    '''
+    try:
+        return int(folder_name.split('_')[-1])
+    except ValueError:
+        return None
+
+
+def list_numbered_folders(directory, prefix):
+    '''
+    - returns {<number>: <folder name>} of the folders in the directory whose names start with prefix
+    '''
+    folders = {}
+    for entry in directory_scanner.scan_directory(directory):
+        if entry.name.startswith(prefix) and entry.is_dir():
+            number = folder_number(entry.name)
+            if number != None:
+                folders[number] = entry.name
+    return folders
+
+
+def parallel_map(function, items, threads=8):
+    '''
+    - calls function on every item by a bounded pool of threads, returns the results in the order of the items
+    - the first error raised by any call is re-raised here
+    '''
+    results = [None] * len(items)
+    errors = []
+    tasks = Queue.Queue()
+    for index, item in enumerate(items):
+        tasks.put((index, item))
+
+    def worker():
+        while not errors:
+            try:
+                index, item = tasks.get_nowait()
+            except Queue.Empty:
+                return
+            try:
+                results[index] = function(item)
+            except Exception, error:
+                errors.append(error)
+
+    workers = [threading.Thread(target=worker) for i in range(max(1, min(threads, len(items))))]
+    for thread in workers:
+        thread.daemon = True
+        thread.start()
+    for thread in workers:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return results
+
+
+def scan_shot_inventory(shot_roots, threads=8, scene_name='SCENE_', shot_name='__Shot_'):
+    '''
+    - builds the Shot_Inventory of the given shot roots in one parallel scandir pass:
+      every shot root is listed for its scene folders, then every scene folder for its shot folders, both by a pool of threads
+    - the shot folders themselves aren't listed, so the cost is one listing per department and scene
+    '''
+    shot_roots = [unix_format(shot_root) for shot_root in shot_roots]
+    root_scenes = parallel_map(lambda shot_root: list_numbered_folders(shot_root, scene_name), shot_roots, threads)
+
+    scene_folders = []
+    for shot_root, scenes in zip(shot_roots, root_scenes):
+        for scn_number, folder_name in scenes.iteritems():
+            scene_folders.append((shot_root, scn_number, shot_root + folder_name + '/'))
+    scene_shots = parallel_map(lambda scene_folder: list_numbered_folders(scene_folder[2], shot_name), scene_folders, threads)
+
+    matrix = dict((shot_root, {}) for shot_root in shot_roots)
+    for (shot_root, scn_number, scene_dir), shots in zip(scene_folders, scene_shots):
+        matrix[shot_root][scn_number] = set(shots)
+    return Shot_Inventory(shot_roots, matrix)
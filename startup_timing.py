@@ -0,0 +1,53 @@
+import time
+
+
+class Startup_Timer(object):
+    """
+    - times the startup of the gui, every stage is marked with the seconds since the timer started
+    - the stages of the app are, in order: 'qapplication', 'project bar built', 'window built', 'first paint' (time-to-window),
+      '<section> section built', 'interactive' (time-to-interactive), 'watcher and drive probes started', 'drives probed'
+    - a stage marked twice keeps its first time, e.g. a section built again never overwrites the time it was first built
+    """
+    def __init__(self, started=None):
+        self.started = time.time() if started == None else started
+        # [(<stage>, <seconds since the start>), ...] in the order they were marked
+        self.stages = []
+
+
+    def mark(self, stage):
+        '''
+        - marks the given stage now and returns its seconds since the start
+        '''
+        seconds = self.elapsed(stage)
+        if seconds == None:
+            seconds = time.time() - self.started
+            self.stages.append((stage, seconds))
+        return seconds
+
+
+    def elapsed(self, stage):
+        '''
+        - returns the seconds since the start of the given stage, or None if it wasn't marked
+        '''
+        for each_stage, seconds in self.stages:
+            if each_stage == stage:
+                return seconds
+        return None
+
+
+    def format_report(self):
+        '''
+        - returns the report of the stages marked so far, the first line sums up the time-to-window and the time-to-interactive,
+          every stage follows with its time since the start and since the stage before
+        '''
+        summary = []
+        for label, stage in (('to window', 'first paint'), ('to interactive', 'interactive')):
+            seconds = self.elapsed(stage)
+            if seconds != None:
+                summary.append('{0:.3f} s {1}'.format(seconds, label))
+        lines = ['startup: ' + (', '.join(summary) or 'not painted yet')]
+        previous = 0.0
+        for stage, seconds in self.stages:
+            lines.append('    {0:<36}{1:8.3f} s   +{2:.3f} s'.format(stage, seconds, seconds - previous))
+            previous = seconds
+        return '\n'.join(lines)
@@ -0,0 +1,344 @@
+import os
+import sys
+import errno
+import ctypes
+import shutil
+
+# shutil.copyfile() copies the data in chunks of 16 KB in python 2
+COPY_CHUNK_SIZE = 16 * 1024
+
+# the ioctl of a copy-on-write clone on Linux (btrfs, xfs, ...)
+FICLONE = 0x40049409
+# the control code of a block clone on Windows ReFS
+FSCTL_DUPLICATE_EXTENTS_TO_FILE = 0x00098344
+
+
+class DUPLICATE_EXTENTS_DATA(ctypes.Structure):
+    _fields_ = [('FileHandle',          ctypes.c_void_p),
+                ('SourceFileOffset',    ctypes.c_longlong),
+                ('TargetFileOffset',    ctypes.c_longlong),
+                ('ByteCount',           ctypes.c_longlong)]
+
+
+class FILETIME(ctypes.Structure):
+    # two DWORDs like ctypes.wintypes.FILETIME, which can't be imported outside Windows in python 2,
+    # a c_ulonglong would be aligned to 8 bytes and move the fields after it
+    _fields_ = [('dwLowDateTime',           ctypes.c_ulong),
+                ('dwHighDateTime',          ctypes.c_ulong)]
+
+
+class BY_HANDLE_FILE_INFORMATION(ctypes.Structure):
+    _fields_ = [('dwFileAttributes',        ctypes.c_ulong),
+                ('ftCreationTime',          FILETIME),
+                ('ftLastAccessTime',        FILETIME),
+                ('ftLastWriteTime',         FILETIME),
+                ('dwVolumeSerialNumber',    ctypes.c_ulong),
+                ('nFileSizeHigh',           ctypes.c_ulong),
+                ('nFileSizeLow',            ctypes.c_ulong),
+                ('nNumberOfLinks',          ctypes.c_ulong),
+                ('nFileIndexHigh',          ctypes.c_ulong),
+                ('nFileIndexLow',           ctypes.c_ulong)]
+
+
+class Template_File(object):
+    """
+    - writes copies of a template file, such as 'empty.ma', as cheaply as the file system allows
+    - mode can be:
+        'reflink'   ---> copy-on-write clones of a seed file on the same volume, where the file system supports them (ReFS, btrfs, xfs, apfs),
+                         every other volume falls back to 'buffer'
+        'buffer'    ---> the template is read only once, every copy is a single write of the cached bytes
+        'copy'      ---> shutil.copyfile(), one full copy per file
+        'auto'      ---> the same as 'reflink'
+    - with hardlinks=True, the copies are hard links of a seed file on the same volume, they share one set of data,
+      so break_hardlink() must give a file its own data before it's first opened and saved
+    - the seed of a volume is the first copy that was written on it
+    - self.stats keeps counting the files of every method, and the bytes and system calls saved compared with shutil.copyfile()
+    """
+    def __init__(self, template_path, mode='auto', hardlinks=False):
+        self.template_path = template_path
+        self.mode = 'reflink' if mode == 'auto' else mode
+        self.hardlinks = hardlinks
+        self.stats = new_stats()
+
+        self.__data = None
+        # {<volume>: <path of the seed file>}
+        self.__seeds = {}
+        # volumes that don't support hard links or clones
+        self.__no_links = set()
+        self.__no_clones = set()
+
+
+    def data(self):
+        '''
+        - returns the bytes of the template, it's only read from disk once
+        '''
+        if self.__data == None:
+            template = open(self.template_path, 'rb')
+            self.__data = template.read()
+            template.close()
+        return self.__data
+
+
+    def materialize_files(self, dst_files, on_written=None):
+        '''
+        - writes a copy of the template to every given path, an existing file is left untouched
+        - on_written is an optional function, which is called with every file right after it was written
+        - returns the stats of this batch, self.stats keeps the totals
+        '''
+        batch_stats = new_stats()
+        for dst_file in dst_files:
+            method = self.materialize(dst_file)
+            add_stats(batch_stats, method, len(self.data()))
+            if on_written != None and method != 'skipped':
+                on_written(dst_file)
+        return batch_stats
+
+
+    def materialize(self, dst_file):
+        '''
+        - writes one copy of the template to dst_file
+        - returns the method that was used: 'linked', 'cloned', 'written', 'copied', or 'skipped' if dst_file was already there
+        '''
+        method = self.__materialize(dst_file)
+        add_stats(self.stats, method, len(self.data()))
+        return method
+
+
+    def __materialize(self, dst_file):
+        if self.mode == 'copy':
+            if os.path.isfile(dst_file):
+                return 'skipped'
+            shutil.copyfile(self.template_path, dst_file)
+            return 'copied'
+
+        volume = get_volume(dst_file)
+        seed = self.__seeds.get(volume)
+
+        try:
+            if seed != None and self.hardlinks and volume not in self.__no_links:
+                try:
+                    os.link(seed, dst_file)
+                    return 'linked'
+                except AttributeError:
+                    # os.link() doesn't exist on Windows in python 2
+                    make_hardlink_windows(seed, dst_file)
+                    return 'linked'
+
+            if seed != None and self.mode == 'reflink' and volume not in self.__no_clones:
+                reflink(seed, dst_file, len(self.data()))
+                return 'cloned'
+
+        except (OSError, IOError), error:
+            if error.errno == errno.EEXIST:
+                return 'skipped'
+            # links or clones are not supported on this volume, stop trying them and write the data instead
+            if self.hardlinks and volume not in self.__no_links:
+                self.__no_links.add(volume)
+            else:
+                self.__no_clones.add(volume)
+
+        if not write_new_file(dst_file, self.data()):
+            return 'skipped'
+        if seed == None:
+            self.__seeds[volume] = dst_file
+        return 'written'
+
+
+
+def new_stats():
+    return {'files': 0, 'linked': 0, 'cloned': 0, 'written': 0, 'copied': 0, 'skipped': 0,
+            'bytes_saved': 0, 'syscalls_saved': 0}
+
+
+def copyfile_syscalls(size):
+    '''
+    - an estimation of the system calls of 'if not os.path.isfile(dst): shutil.copyfile(src, dst)' for a file of the given size:
+      1 stat for isfile(), 2 stats for the same-file check, 2 opens, 2 closes, the reads of the data and the empty read at the end, the writes of the data
+    '''
+    chunks = (size + COPY_CHUNK_SIZE - 1) // COPY_CHUNK_SIZE
+    return 7 + (chunks + 1) + chunks
+
+
+# the system calls of every method, the same existence check is covered by O_EXCL / EEXIST
+METHOD_SYSCALLS = { 'linked':   1,      # link
+                    'cloned':   5,      # open seed, open new file, clone, 2 closes
+                    'written':  3,      # open new file, write, close
+                    'skipped':  1 }     # the failed exclusive open/link
+
+
+def add_stats(stats, method, size):
+    '''
+    - counts one materialized file into the given stats
+    - the bytes saved are the bytes that didn't have to be moved compared with shutil.copyfile(), which reads and writes the whole file:
+      a single write saves the read, a link or a clone saves both
+    '''
+    stats['files'] += 1
+    stats[method] += 1
+    if method == 'copied':
+        return
+    if method in ('linked', 'cloned'):
+        stats['bytes_saved'] += size * 2
+    elif method == 'written':
+        stats['bytes_saved'] += size
+    baseline = copyfile_syscalls(size) if method != 'skipped' else 1
+    stats['syscalls_saved'] += baseline - METHOD_SYSCALLS[method]
+
+
+def format_stats(stats):
+    '''
+    - returns a line of text that reports the given stats
+    '''
+    return '{0} shot files: {1} linked, {2} cloned, {3} written, {4} copied, {5} already existed | saved {6:.1f} MB of I/O and {7} system calls'.format(
+            stats['files'], stats['linked'], stats['cloned'], stats['written'], stats['copied'], stats['skipped'],
+            stats['bytes_saved'] / (1024.0 * 1024.0), stats['syscalls_saved'])
+
+
+def get_volume(file_path):
+    '''
+    - returns a key of the volume that holds the file, the drive letter or UNC share on Windows
+    - other platforms are treated as one volume, a clone or link that crosses volumes fails and falls back to writing the data
+    '''
+    drive = os.path.splitdrive(os.path.abspath(file_path))[0]
+    return drive.replace('\\', '/').lower()
+
+
+def write_new_file(dst_file, data):
+    '''
+    - writes the data into a new file with a single write, returns False if the file was already there
+    '''
+    try:
+        fd = os.open(dst_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0))
+    except OSError, error:
+        if error.errno == errno.EEXIST:
+            return False
+        raise
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+    return True
+
+
+def reflink(src_file, dst_file, size):
+    '''
+    - makes dst_file a copy-on-write clone of src_file, raises OSError/IOError when the file system doesn't support it
+    '''
+    if sys.platform.startswith('linux'):
+        reflink_linux(src_file, dst_file)
+    elif sys.platform == 'darwin':
+        reflink_darwin(src_file, dst_file)
+    elif os.name == 'nt':
+        reflink_windows(src_file, dst_file, size)
+    else:
+        raise OSError(errno.EOPNOTSUPP, 'copy-on-write clones are not supported', dst_file)
+
+
+def reflink_linux(src_file, dst_file):
+    import fcntl
+    src_fd = os.open(src_file, os.O_RDONLY)
+    try:
+        dst_fd = os.open(dst_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+        try:
+            fcntl.ioctl(dst_fd, FICLONE, src_fd)
+        except IOError:
+            os.close(dst_fd)
+            os.remove(dst_file)
+            raise
+        os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+
+def reflink_darwin(src_file, dst_file):
+    libc = ctypes.CDLL(None, use_errno=True)
+    if libc.clonefile(src_file, dst_file, 0) != 0:
+        code = ctypes.get_errno()
+        raise OSError(code, os.strerror(code), dst_file)
+
+
+def reflink_windows(src_file, dst_file, size):
+    '''
+    - clones the blocks of src_file into a new dst_file on a ReFS volume
+    - the byte count of a block clone must be a multiple of the cluster size, the file size is set first so the tail is cut off
+    '''
+    kernel32 = ctypes.windll.kernel32
+    kernel32.CreateFileW.restype = ctypes.c_void_p
+    invalid_handle = ctypes.c_void_p(-1).value
+    GENERIC_READ, GENERIC_WRITE = 0x80000000, 0x40000000
+    FILE_SHARE_READ, CREATE_NEW, OPEN_EXISTING = 0x1, 1, 3
+
+    sectors_per_cluster, bytes_per_sector = ctypes.c_ulong(), ctypes.c_ulong()
+    free_clusters, total_clusters = ctypes.c_ulong(), ctypes.c_ulong()
+    volume_root = unicode(os.path.splitdrive(os.path.abspath(dst_file))[0] + '\\')
+    if not kernel32.GetDiskFreeSpaceW(volume_root, ctypes.byref(sectors_per_cluster), ctypes.byref(bytes_per_sector),
+                                      ctypes.byref(free_clusters), ctypes.byref(total_clusters)):
+        raise OSError(errno.EOPNOTSUPP, 'cannot read the cluster size', dst_file)
+    cluster_size = sectors_per_cluster.value * bytes_per_sector.value
+
+    src_handle = kernel32.CreateFileW(unicode(src_file), GENERIC_READ, FILE_SHARE_READ, None, OPEN_EXISTING, 0, None)
+    if src_handle == invalid_handle:
+        raise OSError(errno.ENOENT, 'cannot open the seed file', src_file)
+    try:
+        dst_handle = kernel32.CreateFileW(unicode(dst_file), GENERIC_READ | GENERIC_WRITE, 0, None, CREATE_NEW, 0, None)
+        if dst_handle == invalid_handle:
+            raise OSError(errno.EEXIST, 'the file already exists', dst_file)
+        try:
+            kernel32.SetFilePointerEx(ctypes.c_void_p(dst_handle), ctypes.c_longlong(size), None, 0)
+            kernel32.SetEndOfFile(ctypes.c_void_p(dst_handle))
+
+            extents = DUPLICATE_EXTENTS_DATA()
+            extents.FileHandle = src_handle
+            extents.ByteCount = (size + cluster_size - 1) // cluster_size * cluster_size
+            returned = ctypes.c_ulong()
+            cloned = kernel32.DeviceIoControl(ctypes.c_void_p(dst_handle), FSCTL_DUPLICATE_EXTENTS_TO_FILE,
+                                              ctypes.byref(extents), ctypes.sizeof(extents), None, 0, ctypes.byref(returned), None)
+        finally:
+            kernel32.CloseHandle(ctypes.c_void_p(dst_handle))
+        if not cloned:
+            os.remove(dst_file)
+            raise OSError(errno.EOPNOTSUPP, 'block cloning is not supported on this volume', dst_file)
+    finally:
+        kernel32.CloseHandle(ctypes.c_void_p(src_handle))
+
+
+def make_hardlink_windows(src_file, dst_file):
+    if not ctypes.windll.kernel32.CreateHardLinkW(unicode(dst_file), unicode(src_file), None):
+        if os.path.exists(dst_file):
+            raise OSError(errno.EEXIST, 'the file already exists', dst_file)
+        raise OSError(errno.EOPNOTSUPP, 'hard links are not supported on this volume', dst_file)
+
+
+def hardlink_count(file_path):
+    '''
+    - returns the amount of hard links of the file, python 2 doesn't fill st_nlink on Windows, so it's asked from the file handle there
+    '''
+    if os.name != 'nt':
+        return os.stat(file_path).st_nlink
+
+    kernel32 = ctypes.windll.kernel32
+    kernel32.CreateFileW.restype = ctypes.c_void_p
+    # FILE_READ_ATTRIBUTES, share read/write/delete, OPEN_EXISTING
+    handle = kernel32.CreateFileW(unicode(file_path), 0x80, 0x7, None, 3, 0, None)
+    if handle == ctypes.c_void_p(-1).value:
+        return 1
+    try:
+        info = BY_HANDLE_FILE_INFORMATION()
+        if not kernel32.GetFileInformationByHandle(ctypes.c_void_p(handle), ctypes.byref(info)):
+            return 1
+        return info.nNumberOfLinks
+    finally:
+        kernel32.CloseHandle(ctypes.c_void_p(handle))
+
+
+def break_hardlink(file_path):
+    '''
+    - gives a hard linked file its own copy of the data, so saving it doesn't change the other links
+    - does nothing for a file without other links, returns True if the link was broken
+    '''
+    if hardlink_count(file_path) < 2:
+        return False
+    temp_file = file_path + '.unlink_tmp'
+    shutil.copyfile(file_path, temp_file)
+    os.remove(file_path)
+    os.rename(temp_file, file_path)
+    return True
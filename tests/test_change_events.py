@@ -0,0 +1,86 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import change_events
+
+
+class Names_Model(object):
+    """
+    - the row changes of a file_list_model.File_List_Model, kept as a sorted list of names
+    """
+    def __init__(self, names):
+        self.names = sorted(names)
+
+    def insert_file(self, name):
+        if name in self.names:
+            return False
+        self.names = sorted(self.names + [name])
+        return True
+
+    def remove_file(self, name):
+        if name not in self.names:
+            return False
+        self.names.remove(name)
+        return True
+
+    def rename_file(self, old_name, new_name):
+        removed = self.remove_file(old_name)
+        return self.insert_file(new_name) or removed
+
+
+
+class View_Updater_Test(unittest.TestCase):
+
+    def setUp(self):
+        self.model = Names_Model(['a.ma', 'b.ma'])
+        self.updater = change_events.View_Updater()
+        self.updater.bind('Animation_model2', 'p:/proj/shots', self.model)
+
+
+    def feed(self, events):
+        '''
+        - applies the events as ReadDirectoryChangesW reports them, (<FILE_ACTION_* code>, <file type>, <path>)
+        '''
+        for code, file_type, path in events:
+            self.updater.apply(file_type, path, change_events.ACTIONS[code])
+
+
+    def test_rename_codes(self):
+        self.assertEqual(change_events.ACTIONS[4], change_events.RENAMED_FROM)
+        self.assertEqual(change_events.ACTIONS[5], change_events.RENAMED_TO)
+
+
+    def test_renames_old_then_new_name(self):
+        # the old path doesn't exist any more when the watcher looks at it, so its type is '<deleted>'
+        self.feed([(4, '<deleted>', 'p:/proj/shots/a.ma'),
+                   (5, 'file', 'p:/proj/shots/c.ma'),
+                   (4, '<deleted>', 'p:/proj/shots/b.ma'),
+                   (5, 'file', 'p:/proj/shots/d.ma')])
+        self.assertEqual(self.model.names, ['c.ma', 'd.ma'])
+        self.assertEqual(self.updater.stats()['applied'], 2)
+
+
+    def test_rename_into_another_directory(self):
+        self.feed([(4, '<deleted>', 'p:/proj/shots/a.ma'),
+                   (5, 'file', 'p:/proj/other/a.ma')])
+        self.assertEqual(self.model.names, ['b.ma'])
+
+
+    def test_renamed_folder_is_not_a_row(self):
+        self.feed([(4, '<deleted>', 'p:/proj/shots/b.ma'),
+                   (5, 'folder', 'p:/proj/shots/b_folder')])
+        self.assertEqual(self.model.names, ['a.ma'])
+
+
+    def test_created_and_deleted(self):
+        self.feed([(1, 'file', 'p:\\proj\\shots\\c.ma'),
+                   (2, '<deleted>', 'p:/proj/shots/a.ma')])
+        self.assertEqual(self.model.names, ['b.ma', 'c.ma'])
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shot_inventory
+
+
+ANIMATION = 'p:/proj/ANIMATION/Finals/'
+LAYOUT = 'p:/proj/LAYOUT/'
+
+
+class Shot_Inventory_Record_Test(unittest.TestCase):
+
+    def round_trip(self, inventory):
+        return shot_inventory.Shot_Inventory.from_record(inventory.shot_roots, inventory.to_record())
+
+
+    def test_round_trip_keeps_the_matrix(self):
+        inventory = shot_inventory.Shot_Inventory([ANIMATION, LAYOUT], {ANIMATION: {1: set([1, 2, 3]), 2: set([1, 2])},
+                                                                        LAYOUT:    {1: set([1, 3]), 2: set([1, 2])}})
+        rebuilt = self.round_trip(inventory)
+        self.assertEqual(rebuilt.matrix, inventory.matrix)
+        self.assertEqual(rebuilt.incomplete_shots(), {(1, 2): [LAYOUT]})
+
+
+    def test_round_trip_leaves_out_a_missing_scene(self):
+        # the layout department has no SCENE_2 folder at all
+        inventory = shot_inventory.Shot_Inventory([ANIMATION, LAYOUT], {ANIMATION: {1: set([1]), 2: set([1, 2])},
+                                                                        LAYOUT:    {1: set([1])}})
+        rebuilt = self.round_trip(inventory)
+        self.assertEqual(rebuilt.matrix, inventory.matrix)
+        self.assertNotIn(2, rebuilt.matrix[LAYOUT])
+        self.assertEqual(rebuilt.scene_directories(), [ANIMATION + 'SCENE_1/', ANIMATION + 'SCENE_2/', LAYOUT + 'SCENE_1/'])
+
+
+    def test_round_trip_through_relative_roots(self):
+        inventory = shot_inventory.Shot_Inventory([ANIMATION, LAYOUT], {ANIMATION: {3: set([1, 2])}, LAYOUT: {}})
+        record = inventory.to_record(lambda directory: directory[len('p:/proj/'):])
+        rebuilt = shot_inventory.Shot_Inventory.from_record(inventory.shot_roots, record, lambda directory: 'p:/proj/' + directory)
+        self.assertEqual(rebuilt.matrix, inventory.matrix)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+import os
+import hashlib
+import tempfile
+import threading
+
+from qt_binding import Qt, QImage, QImageReader, QObject, QRunnable, QThreadPool, Signal
+from helper_functions import unix_format
+
+THUMBNAIL_FOLDER_NAME = 'project_file_manager_thumbnails'
+
+
+# ===================================================================
+# ======= the cache, it decodes an image once and keeps it small ====
+# ===================================================================
+
+class Thumbnail_Cache(object):
+    """
+    - makes the thumbnails of the images and keeps them as small png files in a folder, so an image is only decoded once
+    - a thumbnail is found by the path, the modification time and the size of its image, an image written again gets a new one,
+      the thumbnails of the old versions are left in the folder
+    - the image is decoded at the size of the thumbnail where the format allows it, e.g. a jpeg is decoded at 1/2, 1/4 or 1/8
+    - it's called by the threads of a Thumbnail_Loader, QImage and QImageReader are safe to use outside the gui thread
+    """
+    def __init__(self, directory='', size=96):
+        # the temporary folder of the system is used when directory is empty
+        self.directory = unix_format(directory or os.path.join(tempfile.gettempdir(), THUMBNAIL_FOLDER_NAME))
+        self.size = size
+        self.hits = 0
+        self.decoded = 0
+        self.lock = threading.Lock()
+
+
+    def cached_path(self, image_path, modified_time, file_size):
+        '''
+        - returns the path of the thumbnail of the given version of an image, e.g. '<directory>/3f/3fa2...e1_96.png'
+        '''
+        image_path = unix_format(image_path).lower()
+        if isinstance(image_path, unicode):
+            image_path = image_path.encode('utf-8')
+        key = hashlib.sha1('{0}|{1!r}|{2}'.format(image_path, modified_time, file_size)).hexdigest()
+        return '{0}{1}/{2}_{3}.png'.format(self.directory, key[:2], key, self.size)
+
+
+    def thumbnail(self, image_path):
+        '''
+        - returns the thumbnail of the given image as a QImage, or None if it can't be read
+        '''
+        try:
+            stat = os.stat(image_path)
+        except OSError:
+            return None
+        cached_path = self.cached_path(image_path, stat.st_mtime, stat.st_size)
+        if os.path.isfile(cached_path):
+            image = QImage(cached_path)
+            if not image.isNull():
+                with self.lock:
+                    self.hits += 1
+                return image
+
+        reader = QImageReader(image_path)
+        image_size = reader.size()
+        if image_size.isValid() and (image_size.width() > self.size or image_size.height() > self.size):
+            reader.setScaledSize(image_size.scaled(self.size, self.size, Qt.KeepAspectRatio))
+        image = reader.read()
+        if image.isNull():
+            return None
+        with self.lock:
+            self.decoded += 1
+        self.store(image, cached_path)
+        return image
+
+
+    def store(self, image, cached_path):
+        '''
+        - writes a thumbnail under a temporary name first, so a thumbnail being written is never read half done
+        '''
+        temporary_path = '{0}.{1}.png'.format(cached_path[:-4], threading.current_thread().ident)
+        try:
+            if not os.path.isdir(os.path.dirname(cached_path)):
+                os.makedirs(os.path.dirname(cached_path))
+            if image.save(temporary_path, 'PNG'):
+                os.rename(temporary_path, cached_path)
+        except OSError:
+            # another thread stored the same thumbnail meanwhile, or the folder can't be written, the next call decodes again
+            try:
+                os.remove(temporary_path)
+            except OSError:
+                pass
+
+
+    def stats(self):
+        with self.lock:
+            return {'hits': self.hits, 'decoded': self.decoded}
+
+
+
+# =====================================================================
+# ======= the loader, it makes the thumbnails on a pool of threads ===
+# =====================================================================
+
+class Thumbnail_Task(QRunnable):
+    """
+    - makes one thumbnail on a thread of the pool, it's handed back to the gui thread by Thumbnail_Loader.loaded
+    """
+    def __init__(self, loader, image_path):
+        QRunnable.__init__(self)
+        # the task is emitted by loaded after run(), so the pool mustn't delete it, Thumbnail_Loader.tasks keeps it until then
+        self.setAutoDelete(False)
+        self.loader = loader
+        self.image_path = image_path
+
+    def run(self):
+        try:
+            image = self.loader.cache.thumbnail(self.image_path)
+        except Exception:
+            # None is always delivered, so the request is never left pending
+            image = None
+        self.loader.loaded.emit(self, image)
+
+
+
+class Thumbnail_Loader(QObject):
+    """
+    - makes the thumbnails asked by the views on a QThreadPool, so decoding the images never freezes the window
+    - the latest request runs first: a view asks for the thumbnails of the rows it paints, so the rows on screen are made
+      before the rows scrolled past
+    - an image asked again while its thumbnail is being made isn't made twice, every caller gets it
+    - on_image(<image path>, <QImage or None>) is called on the gui thread, QImage can't be shown directly, see
+      file_list_model.File_List_Model.thumbnail_loaded()
+    """
+    # the signal is emitted by the threads of the pool, so it's delivered to the gui thread by the event loop
+    loaded = Signal(object, object)
+
+    def __init__(self, cache, max_threads=2, extensions=('png', 'jpg', 'jpeg', 'tif', 'tiff', 'bmp'), parent=None):
+        QObject.__init__(self, parent)
+        self.cache = cache
+        self.extensions = frozenset(extensions)
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(max_threads)
+        # {<image path>: [<on_image>, ...]}, the images being made, the tasks are kept alive here until they're delivered
+        self.pending = {}
+        self.tasks = set()
+        self.priority = 0
+        self.loaded.connect(self.deliver)
+
+
+    def has_thumbnail(self, file_name):
+        return file_name.rsplit('.', 1)[-1].lower() in self.extensions
+
+
+    def request(self, image_path, on_image):
+        if image_path in self.pending:
+            self.pending[image_path].append(on_image)
+            return
+        self.pending[image_path] = [on_image]
+        task = Thumbnail_Task(self, image_path)
+        self.tasks.add(task)
+        # the priority grows with every request, so the latest one runs first
+        self.priority = min(self.priority + 1, 2 ** 31 - 1)
+        self.thread_pool.start(task, self.priority)
+
+
+    def deliver(self, task, image):
+        self.tasks.discard(task)
+        for on_image in self.pending.pop(task.image_path, []):
+            on_image(task.image_path, image)
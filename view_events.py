@@ -0,0 +1,66 @@
+from qt_binding import QObject, QTimer
+
+
+class Click_Router(QObject):
+    """
+    - connects the clicked signal of every view once, and routes a click to the handler of the current context of the view
+    - a populate call only replaces the context by route(), so the handlers never pile up on the signal
+    - the clicks of a view within debounce_ms are coalesced into one call of its handler, which runs once the clicks stop
+    - the clicks and the dispatched handlers are counted per view, see stats(), one scan per click means dispatched <= clicks
+    """
+    def __init__(self, debounce_ms=150, parent=None):
+        QObject.__init__(self, parent)
+        self.debounce_ms = debounce_ms
+        # {<view name>: [<handler>, <debounce in ms>]}
+        self.contexts = {}
+        # {<view name>: QTimer}, the pending call of a debounced view
+        self.timers = {}
+        # {<view name>: {'clicks': <amount>, 'dispatched': <amount>}}
+        self.counters = {}
+        # the views whose clicked signal is connected, by their names
+        self.views = {}
+
+
+    def route(self, view, view_name, handler, debounce_ms=None):
+        '''
+        - makes handler, a function without arguments, the one that a click on the view calls from now on
+        - debounce_ms overrides the default of the router, 0 calls the handler right at the click
+        '''
+        self.contexts[view_name] = [handler, self.debounce_ms if debounce_ms == None else debounce_ms]
+        if self.views.get(view_name) is not view:
+            self.views[view_name] = view
+            self.counters.setdefault(view_name, {'clicks': 0, 'dispatched': 0})
+            view.clicked.connect(lambda index: self.clicked(view_name))
+
+
+    def clicked(self, view_name):
+        self.counters[view_name]['clicks'] += 1
+        context = self.contexts.get(view_name)
+        if context == None:
+            return
+        if context[1] <= 0:
+            self.dispatch(view_name)
+            return
+
+        timer = self.timers.get(view_name)
+        if timer == None:
+            timer = self.timers[view_name] = QTimer(self)
+            timer.setSingleShot(True)
+            timer.timeout.connect(lambda: self.dispatch(view_name))
+        # a click within the debounce time restarts the timer, so a burst of clicks runs the handler once
+        timer.start(context[1])
+
+
+    def dispatch(self, view_name):
+        context = self.contexts.get(view_name)
+        if context == None:
+            return
+        self.counters[view_name]['dispatched'] += 1
+        context[0]()
+
+
+    def stats(self):
+        '''
+        - returns the counters of every view, they look like: {<view name>: {'clicks': <amount>, 'dispatched': <amount>}}
+        '''
+        return dict((view_name, dict(counters)) for view_name, counters in self.counters.iteritems())